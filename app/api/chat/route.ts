@@ -40,7 +40,7 @@ export async function POST(request: NextRequest) {
 
     // Get current pitch deck from session/state
     // For now, we'll pass it through the request body
-    const { pitchDeckText } = body
+    const { pitchDeckText, deckId } = body
 
     // Check if API URL is configured (only block localhost in production)
     const isProduction = process.env.NODE_ENV === 'production' || process.env.VERCEL === '1'
@@ -84,7 +84,7 @@ Once configured, I'll be able to provide real investor recommendations based on
     try {
       const backendUrl = `${API_URL}/api/chat`
       console.log('Attempting to fetch from backend:', backendUrl)
-      console.log('Request body:', JSON.stringify({ query, pitch_deck_text: pitchDeckText || null }))
+      console.log('Request body:', JSON.stringify({ query, pitch_deck_text: pitchDeckText || null, deck_id: deckId || null }))
       
       const backendResponse = await fetch(backendUrl, {
         method: 'POST',
@@ -94,6 +94,7 @@ Once configured, I'll be able to provide real investor recommendations based on
         body: JSON.stringify({
           query,
           pitch_deck_text: pitchDeckText || null,
+          deck_id: deckId || null,
         }),
         signal: controller.signal,
       })
@@ -0,0 +1,83 @@
+import { NextRequest, NextResponse } from 'next/server'
+
+// Normalize API URL to ensure it has a protocol
+function normalizeApiUrl(url: string | undefined): string {
+  if (!url) return 'http://localhost:8000'
+
+  // Remove trailing slash if present
+  url = url.trim().replace(/\/$/, '')
+
+  // If URL doesn't start with http:// or https://, add https://
+  if (!url.startsWith('http://') && !url.startsWith('https://')) {
+    return `https://${url}`
+  }
+
+  return url
+}
+
+// Proxy Server-Sent Events from the backend without buffering
+export async function POST(request: NextRequest) {
+  try {
+    // Read environment variable at request time (not module load time)
+    const rawApiUrl = process.env.NEXT_PUBLIC_API_URL
+    const API_URL = normalizeApiUrl(rawApiUrl)
+
+    const body = await request.json()
+    const { query, pitchDeckText, deckId } = body
+
+    if (!query || typeof query !== 'string') {
+      return NextResponse.json(
+        { error: 'Query is required' },
+        { status: 400 }
+      )
+    }
+
+    // Without a configured backend the client falls back to /api/chat, which explains the setup
+    const isProduction = process.env.NODE_ENV === 'production' || process.env.VERCEL === '1'
+    const isLocalhost = API_URL.includes('localhost') || API_URL.includes('127.0.0.1')
+    if (isProduction && (!rawApiUrl || isLocalhost)) {
+      return NextResponse.json(
+        { error: 'Backend API URL not configured' },
+        { status: 503 }
+      )
+    }
+
+    const backendResponse = await fetch(`${API_URL}/api/chat/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Accept: 'text/event-stream',
+      },
+      body: JSON.stringify({
+        query,
+        pitch_deck_text: pitchDeckText || null,
+        deck_id: deckId || null,
+      }),
+      signal: request.signal,
+    })
+
+    if (!backendResponse.ok || !backendResponse.body) {
+      const error = await backendResponse.json().catch(() => ({
+        error: `Backend request failed with status ${backendResponse.status}`,
+      }))
+      return NextResponse.json(error, { status: backendResponse.status || 502 })
+    }
+
+    return new Response(backendResponse.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        Connection: 'keep-alive',
+      },
+    })
+  } catch (error) {
+    console.error('Chat stream API error:', error)
+    return NextResponse.json(
+      {
+        error:
+          error instanceof Error ? error.message : 'Internal server error',
+      },
+      { status: 500 }
+    )
+  }
+}
@@ -1,15 +1,16 @@
 """Analyze contact files to understand their structure."""
 import pandas as pd
 import config
+from excel_cache import read_excel_cached
 
 print("=" * 80)
 print("ANALYZING CONTACT FILES")
 print("=" * 80)
 
 # Load all three files
-df_main = pd.read_excel(config.DATA_FILE_PATH)
-df_contacts = pd.read_excel(config.CONTACTS_FILE_PATH)
-df_pitchbook = pd.read_excel(config.PITCHBOOK_CONTACTS_FILE_PATH)
+df_main = read_excel_cached(config.DATA_FILE_PATH)
+df_contacts = read_excel_cached(config.CONTACTS_FILE_PATH)
+df_pitchbook = read_excel_cached(config.PITCHBOOK_CONTACTS_FILE_PATH)
 
 print("\n1. FILE COMPARISON")
 print("-" * 80)
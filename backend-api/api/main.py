@@ -2,14 +2,20 @@
 FastAPI backend wrapper for Deal Fit investor matching system.
 Connects Next.js frontend to Python backend logic.
 """
+import json
 import os
 import sys
+import threading
 from pathlib import Path
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import BackgroundTasks, FastAPI, File, Form, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from starlette.datastructures import Headers
+from typing import List, Optional, Tuple
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 # Add the Deal Fit directory to the path
@@ -55,10 +61,79 @@ print(f"✓ Changed working directory to: {deal_fit_path}")
 
 # Import your existing modules
 from rag_pipeline import InvestorRAGPipeline
-from pdf_loader import extract_text_from_pdf
+from batch_runner import iter_batch, load_decks
+from deck_index import DeckIndex
+from pdf_loader import extract_text_from_pdf_data, extract_texts_from_pdf_data
+from pdf_loader import list_pitch_decks as list_pitch_deck_files
+from results_saver import close_results_writer, get_results_writer
+from session_store import create_session_store
 import config
+import metrics
 
-app = FastAPI(title="Deal Fit API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Write query results still queued before the server exits
+    await run_in_threadpool(close_results_writer)
+
+
+# Room for multipart boundaries and part headers on top of the file contents
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects upload requests whose body is over a per-path limit before it is parsed.
+    
+    A declared Content-Length over the limit is refused straight away; bodies without
+    one (chunked) are counted as they stream in and cut off once they pass it.
+    """
+    
+    def __init__(self, app, limits: dict):
+        """
+        Args:
+            app: The ASGI app to wrap
+            limits: Largest request body in bytes, by request path
+        """
+        self.app = app
+        self.limits = limits
+    
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        
+        detail = f"Upload exceeds the {limit // (1024 * 1024)}MB request limit"
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+app = FastAPI(title="Deal Fit API", version="1.0.0", lifespan=lifespan)
+
+# Oversized uploads are refused before multipart parsing spools them to disk
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/api/upload": config.MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/batch": config.MAX_BATCH_UPLOAD_BYTES,
+    },
+)
 
 # CORS middleware - Allow all origins for now (can be restricted later)
 app.add_middleware(
@@ -71,21 +146,51 @@ app.add_middleware(
 
 # Global RAG pipeline instance (initialized on first request)
 rag_pipeline: Optional[InvestorRAGPipeline] = None
-current_pitch_deck_text: Optional[str] = None
+rag_pipeline_lock = threading.Lock()
+
+# Uploaded pitch decks, keyed by the id returned from /api/upload
+session_store = create_session_store()
 
 def get_rag_pipeline():
-    """Lazy initialization of RAG pipeline."""
+    """Lazy initialization of RAG pipeline (safe to call from worker threads)."""
     global rag_pipeline
     if rag_pipeline is None:
-        print("Initializing RAG pipeline...")
-        rag_pipeline = InvestorRAGPipeline()
-        print("RAG pipeline initialized!")
+        with rag_pipeline_lock:
+            if rag_pipeline is None:
+                print("Initializing RAG pipeline...")
+                rag_pipeline = InvestorRAGPipeline()
+                print("RAG pipeline initialized!")
     return rag_pipeline
 
 
+# Pitch deck index for investor -> deck matching (initialized on first use)
+deck_index: Optional[DeckIndex] = None
+deck_index_lock = threading.Lock()
+
+def get_deck_index():
+    """Lazy initialization of the deck index (safe to call from worker threads)."""
+    global deck_index
+    if deck_index is None:
+        pipeline = get_rag_pipeline()
+        with deck_index_lock:
+            if deck_index is None:
+                deck_index = DeckIndex(pipeline.vector_store, pipeline.deck_digester)
+    return deck_index
+
+
+def index_uploaded_deck(name: str, pitch_deck_text: str):
+    """Add an uploaded deck to the deck index (runs after the upload response is sent)."""
+    try:
+        get_deck_index().add_upload(name, pitch_deck_text)
+    except Exception as e:
+        print(f"Warning: Could not index pitch deck {name}: {str(e)}")
+
+
 class ChatRequest(BaseModel):
     query: str
     pitch_deck_text: Optional[str] = None
+    deck_id: Optional[str] = None  # id returned by /api/upload
+    include_full_deck: bool = False  # send the raw deck instead of its digested profile
 
 
 class ChatResponse(BaseModel):
@@ -100,6 +205,27 @@ class UploadResponse(BaseModel):
     text_content: Optional[str] = None
 
 
+async def resolve_pitch_deck(request: ChatRequest) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Pitch deck for a request: inline text first, then the uploaded deck for deck_id.
+    
+    Returns:
+        (deck text, deck filename), either of which may be None
+        
+    Raises:
+        HTTPException: 404 if deck_id is unknown or its upload has expired
+    """
+    if request.pitch_deck_text:
+        return request.pitch_deck_text, None
+    if request.deck_id:
+        # The SQLite store blocks, so look the deck up off the event loop
+        stored = await run_in_threadpool(session_store.get, request.deck_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Pitch deck not found or expired; upload it again")
+        return stored
+    return None, None
+
+
 @app.get("/")
 async def root():
     return {"message": "Deal Fit API is running", "version": "1.0.0"}
@@ -110,6 +236,20 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Response cache hit rate and Claude latency saved (empty until the pipeline is initialized)."""
+    if rag_pipeline is None:
+        return {"response_cache": None}
+    return {"response_cache": rag_pipeline.response_cache.stats()}
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Per-stage latency histograms and token counters in Prometheus text format."""
+    return Response(metrics.render_metrics(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -121,24 +261,28 @@ async def chat(request: ChatRequest):
     3. Generate AI-powered recommendations
     """
     try:
-        pipeline = get_rag_pipeline()
+        # First call builds the vector store, which blocks - keep it off the event loop
+        pipeline = await run_in_threadpool(get_rag_pipeline)
         
-        # Set pitch deck if provided
-        if request.pitch_deck_text:
-            pipeline.set_pitch_deck(request.pitch_deck_text)
-        elif current_pitch_deck_text:
-            pipeline.set_pitch_deck(current_pitch_deck_text)
-        else:
-            pipeline.set_pitch_deck(None)
+        pitch_deck_text, pitch_deck_name = await resolve_pitch_deck(request)
         
-        # Generate recommendation
-        response_text = pipeline.generate_recommendation(request.query)
+        # Generate recommendation (vector search runs in a worker thread, Claude via the async client)
+        response_text = await pipeline.agenerate_recommendation(
+            request.query,
+            pitch_deck_text=pitch_deck_text,
+            include_full_deck=request.include_full_deck or None
+        )
+        
+        # Saved by a background thread, so the response doesn't wait on disk I/O
+        get_results_writer().submit(request.query, response_text, pitch_deck_name)
         
         return ChatResponse(
             response=response_text,
             query=request.query
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(
@@ -147,50 +291,83 @@ async def chat(request: ChatRequest):
         )
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream investor recommendations as Server-Sent Events.
+    
+    Emits `delta` events ({"text": ...}) as Claude generates the response,
+    then a single `done` event, or an `error` event ({"detail": ...}) on failure.
+    """
+    pipeline = await run_in_threadpool(get_rag_pipeline)
+    pitch_deck_text, pitch_deck_name = await resolve_pitch_deck(request)
+    
+    async def event_stream():
+        try:
+            chunks = []
+            async for text in pipeline.astream_recommendation(request.query, pitch_deck_text=pitch_deck_text,
+                                                              include_full_deck=request.include_full_deck or None):
+                chunks.append(text)
+                yield _sse_event("delta", {"text": text})
+            get_results_writer().submit(request.query, "".join(chunks), pitch_deck_name)
+            yield _sse_event("done", {"query": request.query})
+        except Exception as e:
+            print(f"Error in chat stream endpoint: {str(e)}")
+            yield _sse_event("error", {"detail": f"Error generating recommendation: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _upload_size(file: UploadFile) -> int:
+    if file.size is not None:
+        return file.size
+    return file.file.seek(0, os.SEEK_END)
+
+
 @app.post("/api/upload", response_model=UploadResponse)
-async def upload_pitch_deck(file: UploadFile = File(...)):
+async def upload_pitch_deck(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Upload and process a PDF pitch deck.
     
-    Extracts text from the PDF and stores it for use in chat queries.
+    Extracts text from the PDF and stores it for use in chat queries. Requests over
+    MAX_UPLOAD_BYTES are refused before the upload is read (see UploadSizeLimitMiddleware).
     """
-    file_path = None
     try:
         # Validate file type
         if not file.filename or not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
         
-        # Read file content
-        contents = await file.read()
-        
-        # Use /tmp directory for serverless compatibility (only writable location)
-        file_id = str(uuid.uuid4())
-        file_path = Path("/tmp") / f"{file_id}.pdf"
-        
-        # Write to temp file
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        # Validate size
+        if _upload_size(file) > config.MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"PDF exceeds the {config.MAX_UPLOAD_BYTES // (1024 * 1024)}MB upload limit"
+            )
         
-        # Extract text from PDF
+        # Extract text from the upload buffer (blocking, so off the event loop)
         try:
-            text_content = extract_text_from_pdf(str(file_path))
-            
-            # Store pitch deck text globally (in production, use a session/database)
-            global current_pitch_deck_text
-            current_pitch_deck_text = text_content
-            
+            text_content = await run_in_threadpool(extract_text_from_pdf_data, file.file)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Error extracting text from PDF: {str(e)}"
             )
-        finally:
-            # Clean up temp file
-            if file_path and file_path.exists():
-                try:
-                    file_path.unlink()
-                except Exception:
-                    pass  # Ignore cleanup errors
+        
+        # Store pitch deck text for this upload's session
+        file_id = str(uuid.uuid4())
+        session_store.set(file_id, text_content, file.filename)
+        
+        # Make the deck findable from investors, without holding up the response
+        background_tasks.add_task(index_uploaded_deck, file.filename, text_content)
         
         return UploadResponse(
             id=file_id,
@@ -200,25 +377,107 @@ async def upload_pitch_deck(file: UploadFile = File(...)):
         )
     
     except HTTPException:
-        # Clean up on error
-        if file_path and file_path.exists():
-            try:
-                file_path.unlink()
-            except Exception:
-                pass
         raise
     except Exception as e:
-        # Clean up on error
-        if file_path and file_path.exists():
-            try:
-                file_path.unlink()
-            except Exception:
-                pass
         print(f"Error in upload endpoint: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading file: {str(e)}"
         )
+    finally:
+        await file.close()
+
+
+@app.post("/api/batch")
+async def batch(files: List[UploadFile] = File(default=[]), query: Optional[str] = Form(None),
+                use_pitch_decks_folder: bool = Form(False)):
+    """
+    Rank many pitch decks against the investor base in one run.
+    
+    Takes uploaded PDFs (`files`) and/or every deck in the server's pitch deck folder,
+    and streams Server-Sent Events: a `deck` event ({"deck", "response", "completed",
+    "total"}) as each deck finishes, then a single `done` event ({"completed",
+    "skipped"}), or an `error` event ({"detail": ...}) on failure. Results are saved
+    to the results store like chat queries.
+    """
+    # Count the decks before any of them is read
+    folder_deck_count = len(await run_in_threadpool(list_pitch_deck_files)) if use_pitch_decks_folder else 0
+    if len(files) + folder_deck_count > config.BATCH_MAX_DECKS:
+        raise HTTPException(status_code=400, detail=f"At most {config.BATCH_MAX_DECKS} pitch decks per batch")
+    
+    for file in files:
+        if not file.filename or not file.filename.lower().endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+        if _upload_size(file) > config.MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{file.filename} exceeds the {config.MAX_UPLOAD_BYTES // (1024 * 1024)}MB upload limit"
+            )
+    
+    # Extract every deck up front, in parallel and off the event loop
+    texts = await run_in_threadpool(extract_texts_from_pdf_data, [file.file for file in files])
+    decks = [(file.filename, text) for file, text in zip(files, texts) if text is not None]
+    skipped = [file.filename for file, text in zip(files, texts) if text is None]
+    if use_pitch_decks_folder:
+        decks.extend(await run_in_threadpool(load_decks))
+    
+    if not decks:
+        raise HTTPException(status_code=400, detail="No readable pitch decks provided")
+    
+    pipeline = await run_in_threadpool(get_rag_pipeline)
+    
+    async def event_stream():
+        try:
+            completed = 0
+            async for result in iter_batch(pipeline, decks, query):
+                completed += 1
+                yield _sse_event("deck", {
+                    "deck": result["deck"], "response": result["response"],
+                    "completed": completed, "total": len(decks)
+                })
+            yield _sse_event("done", {"completed": completed, "skipped": skipped})
+        except Exception as e:
+            print(f"Error in batch endpoint: {str(e)}")
+            yield _sse_event("error", {"detail": f"Error running batch: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/investors/{investor_id}/decks")
+async def investor_decks(investor_id: str, limit: int = 10, source: Optional[str] = None):
+    """
+    Pitch decks that best fit an investor, from the `Pitch Decks` folder and past uploads.
+    
+    The investor's stored summary embedding is looked up in the deck index, so
+    this costs one vector query rather than a Claude call per deck.
+    """
+    if source not in (None, "folder", "upload"):
+        raise HTTPException(status_code=400, detail="source must be 'folder' or 'upload'")
+    
+    def match():
+        index = get_deck_index()
+        index.sync_folder()  # only new or modified files are read
+        profile = index.vector_store.get_full_profile(investor_id)
+        decks = index.match_investor(investor_id, n_results=limit, source=source)
+        return profile, decks
+    
+    try:
+        profile, decks = await run_in_threadpool(match)
+    except Exception as e:
+        print(f"Error in investor decks endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error matching pitch decks: {str(e)}")
+    if decks is None:
+        raise HTTPException(status_code=404, detail=f"Investor {investor_id} not found")
+    
+    return {
+        "investor_id": investor_id,
+        "investor_name": profile.get("metadata", {}).get("Account Name") if profile else None,
+        "decks": decks
+    }
 
 
 @app.get("/api/pitch-decks")
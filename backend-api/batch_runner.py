@@ -0,0 +1,145 @@
+"""Batch mode: rank a whole folder of pitch decks against the investor base in one run.
+
+Usage:
+    python batch_runner.py                                  # every PDF in config.PITCH_DECKS_FOLDER
+    python batch_runner.py --folder "Pitch Decks/Week 12" --query "Seed investors in fintech?" --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from contextlib import ExitStack
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import config
+from pdf_loader import extract_texts_from_pdf_data, list_pitch_decks
+from rag_pipeline import InvestorRAGPipeline
+from results_saver import ResultsWriter, close_results_writer, get_results_writer
+
+
+def load_decks(folder_path: str = None) -> List[Tuple[str, str]]:
+    """
+    Extract every pitch deck in a folder, in parallel.
+
+    Args:
+        folder_path: Path to pitch decks folder. If None, uses config default.
+
+    Returns:
+        List of (filename, extracted text) for the decks that could be read
+    """
+    if folder_path is None:
+        folder_path = config.PITCH_DECKS_FOLDER
+
+    filenames = list_pitch_decks(folder_path)
+    # Open files rather than their bytes, so extraction only reads the decks it has in flight
+    with ExitStack() as stack:
+        pdf_files = [stack.enter_context(open(os.path.join(folder_path, filename), 'rb')) for filename in filenames]
+        texts = extract_texts_from_pdf_data(pdf_files)
+
+    decks = []
+    for filename, text in zip(filenames, texts):
+        if text is None:
+            print(f"Skipping {filename}: could not extract text.")
+            continue
+        decks.append((filename, text))
+    return decks
+
+
+async def iter_batch(rag_pipeline: InvestorRAGPipeline, decks: List[Tuple[str, str]], query: Optional[str] = None,
+                     max_results: int = None, concurrency: int = None,
+                     results_writer: Optional[ResultsWriter] = None) -> AsyncIterator[Dict]:
+    """
+    Recommend investors for every deck, queueing each result for saving as it completes.
+
+    Args:
+        rag_pipeline: The RAG pipeline instance
+        decks: (name, extracted text) per pitch deck
+        query: Question asked about every deck (None = config.BATCH_DEFAULT_QUERY)
+        max_results: Maximum number of investors to send to Claude per deck (None = uses config default)
+        concurrency: Maximum Claude calls in flight (None = config.BATCH_CONCURRENCY)
+        results_writer: Where results are saved (None = the process-wide writer)
+
+    Yields:
+        Results in completion order (see InvestorRAGPipeline.abatch_recommend)
+    """
+    if results_writer is None:
+        results_writer = get_results_writer()
+    query = query or config.BATCH_DEFAULT_QUERY
+
+    async for result in rag_pipeline.abatch_recommend(decks, query, max_results=max_results,
+                                                      concurrency=concurrency):
+        results_writer.submit(query, result["response"], result["deck"])
+        yield result
+
+
+async def run_batch(rag_pipeline: InvestorRAGPipeline, decks: List[Tuple[str, str]], query: Optional[str] = None,
+                    max_results: int = None, concurrency: int = None,
+                    results_writer: Optional[ResultsWriter] = None,
+                    on_result: Optional[Callable[[Dict, int, int], None]] = None) -> List[Dict]:
+    """
+    Run iter_batch to completion.
+
+    Args:
+        rag_pipeline: The RAG pipeline instance
+        decks: (name, extracted text) per pitch deck
+        query: Question asked about every deck (None = config.BATCH_DEFAULT_QUERY)
+        max_results: Maximum number of investors to send to Claude per deck (None = uses config default)
+        concurrency: Maximum Claude calls in flight (None = config.BATCH_CONCURRENCY)
+        results_writer: Where results are saved (None = the process-wide writer)
+        on_result: Called with (result, completed count, total) as each deck finishes
+
+    Returns:
+        Results in deck order
+    """
+    results: List[Optional[Dict]] = [None] * len(decks)
+    completed = 0
+    async for result in iter_batch(rag_pipeline, decks, query, max_results, concurrency, results_writer):
+        results[result["index"]] = result
+        completed += 1
+        if on_result is not None:
+            on_result(result, completed, len(decks))
+    return results
+
+
+def print_progress(result: Dict, completed: int, total: int):
+    """Per-deck progress line for the CLI."""
+    print(f"[{completed}/{total}] {result['deck']} ({result['seconds']:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", default=None, help="Folder of PDF pitch decks (default: config.PITCH_DECKS_FOLDER)")
+    parser.add_argument("--query", default=None, help="Question asked about every deck")
+    parser.add_argument("--max-results", type=int, default=None, help="Investors sent to Claude per deck")
+    parser.add_argument("--concurrency", type=int, default=None, help="Claude calls in flight at once")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Investor Recommendation System - Batch Mode")
+    print("=" * 60)
+
+    try:
+        start_time = time.perf_counter()
+        decks = load_decks(args.folder)
+        if not decks:
+            print("No pitch decks found.")
+            return
+        print(f"✓ Extracted {len(decks)} pitch decks in {time.perf_counter() - start_time:.1f}s")
+
+        rag_pipeline = InvestorRAGPipeline()
+        results = asyncio.run(run_batch(rag_pipeline, decks, args.query, max_results=args.max_results,
+                                        concurrency=args.concurrency, on_result=print_progress))
+        print(f"\n✓ Ranked investors for {len(results)} pitch decks in {time.perf_counter() - start_time:.1f}s")
+        print(f"  Results: {config.RESULTS_FILE_PATH} and {config.MARKDOWN_RESULTS_DIR}/")
+
+    except Exception as e:
+        print(f"Fatal error: {str(e)}")
+        sys.exit(1)
+
+    finally:
+        # Write any results still queued before exiting
+        close_results_writer()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark the indexed firm-name matcher against the old linear substring scan.
+
+Usage:
+    python benchmark_firm_matching.py                 # firm names from the contact files
+    python benchmark_firm_matching.py --synthetic 20000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from firm_matcher import FirmNameIndex, FIRM_NAME_SUFFIXES, canonical_firm_name
+
+
+def legacy_match(name: str, firm_names: List[str], firm_names_set: Set[str]) -> Optional[str]:
+    """Previous behaviour: exact key, else first key with a bidirectional substring hit."""
+    if name in firm_names_set:
+        return name
+    for firm_name in firm_names:
+        if name in firm_name or firm_name in name:
+            return firm_name
+    return None
+
+
+def synthetic_firm_names(count: int, rng: random.Random) -> List[str]:
+    """Generate plausible lowercase firm names."""
+    words = ['alpha', 'north', 'river', 'summit', 'blue', 'harbor', 'peak', 'lantern', 'granite',
+             'oak', 'signal', 'vector', 'atlas', 'horizon', 'cedar', 'iron', 'pioneer', 'union',
+             'first', 'bright', 'forge', 'canyon', 'delta', 'echo', 'falcon', 'meridian']
+    suffixes = ['capital', 'ventures', 'partners', 'capital partners', 'fund', 'vc', 'group']
+    names = set()
+    while len(names) < count:
+        parts = rng.sample(words, rng.choice([1, 2, 2, 3]))
+        if rng.random() < 0.3:
+            parts.append(str(rng.randint(1, 999)))
+        names.add(" ".join(parts + [rng.choice(suffixes)]))
+    return sorted(names)
+
+
+def make_queries(firm_names: List[str], count: int, rng: random.Random) -> List[Tuple[str, Optional[str]]]:
+    """Investor-sheet style variants of known firm names plus some unknown firms, with the intended firm."""
+    suffixes = sorted(FIRM_NAME_SUFFIXES)
+    queries = []
+    for _ in range(count):
+        name = rng.choice(firm_names)
+        variant = rng.random()
+        if variant < 0.25:
+            queries.append((name, name))
+        elif variant < 0.45:
+            queries.append((f"{name} {rng.choice(suffixes)}", name))
+        elif variant < 0.6:
+            words = name.split()
+            queries.append((" ".join(words[:-1]) if len(words) > 1 else name, name))
+        elif variant < 0.75:
+            queries.append((f"the {name}, llc", name))
+        elif variant < 0.9:
+            i = rng.randrange(len(name))
+            queries.append((name[:i] + name[i + 1:], name))
+        else:
+            queries.append((f"unlisted firm {rng.randint(1, 10 ** 6)}", None))
+    return queries
+
+
+def is_correct(match: Optional[str], expected: Optional[str]) -> bool:
+    """A match is correct if it is the intended firm or a name that only differs from it by suffixes."""
+    if match is None or expected is None:
+        return match == expected
+    return canonical_firm_name(match) == canonical_firm_name(expected)
+
+
+def run(firm_names: List[str], n_queries: int, seed: int = 0) -> Dict[str, float]:
+    """Time both matchers over the same queries and report agreement and accuracy."""
+    rng = random.Random(seed)
+    labelled = make_queries(firm_names, n_queries, rng)
+    queries = [query for query, _ in labelled]
+    expected = [firm for _, firm in labelled]
+    firm_names_set = set(firm_names)
+
+    start = time.perf_counter()
+    index = FirmNameIndex(firm_names)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.match(q) for q in queries]
+    indexed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_match(q, firm_names, firm_names_set) for q in queries]
+    legacy_s = time.perf_counter() - start
+
+    return {
+        "firms": len(firm_names),
+        "queries": len(queries),
+        "index_build_ms": build_s * 1000,
+        "indexed_ms_per_query": indexed_s * 1000 / len(queries),
+        "legacy_ms_per_query": legacy_s * 1000 / len(queries),
+        "speedup": legacy_s / indexed_s if indexed_s else float('inf'),
+        "indexed_matched": sum(m is not None for m in indexed),
+        "legacy_matched": sum(m is not None for m in legacy),
+        "agreement": sum(a == b for a, b in zip(indexed, legacy)) / len(queries),
+        "indexed_accuracy": sum(is_correct(m, e) for m, e in zip(indexed, expected)) / len(queries),
+        "legacy_accuracy": sum(is_correct(m, e) for m, e in zip(legacy, expected)) / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic firm names instead of the contact files")
+    parser.add_argument("--queries", type=int, default=2000, help="Number of lookups to time")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        firm_names = synthetic_firm_names(args.synthetic, random.Random(1))
+    else:
+        from data_loader import load_contact_data
+        firm_names = list(load_contact_data().keys())
+        if not firm_names:
+            print("No contact files found; falling back to 5000 synthetic firm names.")
+            firm_names = synthetic_firm_names(5000, random.Random(1))
+
+    results = run(firm_names, args.queries)
+    print("=" * 60)
+    print("FIRM NAME MATCHING BENCHMARK")
+    print("=" * 60)
+    for key, value in results.items():
+        print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
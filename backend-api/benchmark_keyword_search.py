@@ -0,0 +1,123 @@
+"""Benchmark the indexed keyword search against the full-scan search_investors.
+
+Usage:
+    python benchmark_keyword_search.py                      # 725, 10k and 100k synthetic profiles
+    python benchmark_keyword_search.py --sizes 725 5000 --queries 50
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+from typing import Dict, List
+
+from data_loader import search_investors
+from keyword_index import KeywordIndex
+
+FOCUS_AREAS = ['Fintech', 'Healthcare', 'AI/ML', 'Climate', 'Consumer', 'Enterprise SaaS', 'Edtech',
+               'Biotech', 'Marketplaces', 'Cybersecurity', 'Proptech', 'Web3', 'Mobility', 'Food & Ag']
+INVESTOR_TYPES = ['Venture Capital', 'Angel', 'Corporate VC', 'Family Office', 'Private Equity', 'Accelerator']
+FUND_TYPES = ['Early Stage', 'Multi-Stage', 'Growth', 'Seed Fund', 'Evergreen']
+STAGES = ['Pre-Seed', 'Seed', 'Series A', 'Series B', 'Growth']
+CHECK_SIZES = ['$100K-$500K', '$250K-$1M', '$500K-$2M', '$1M-$5M', '$5M-$20M', '$10M+']
+GEOGRAPHIES = ['US', 'New York', 'San Francisco', 'Europe', 'London', 'Global', 'LATAM', 'Asia']
+NAME_WORDS = ['alpha', 'north', 'river', 'summit', 'blue', 'harbor', 'peak', 'lantern', 'granite',
+              'oak', 'signal', 'vector', 'atlas', 'horizon', 'cedar', 'iron', 'pioneer', 'union']
+NAME_SUFFIXES = ['Capital', 'Ventures', 'Partners', 'Fund', 'VC', 'Group']
+THESIS_WORDS = ['founders', 'software', 'infrastructure', 'platform', 'data', 'payments', 'lending',
+                'diagnostics', 'robotics', 'supply', 'chain', 'energy', 'carbon', 'developer', 'tools',
+                'vertical', 'network', 'marketplace', 'b2b', 'consumer', 'health', 'insurance']
+
+
+def synthetic_profiles(count: int, rng: random.Random) -> List[Dict[str, any]]:
+    """Profiles shaped like create_investor_profiles output."""
+    profiles = []
+    for i in range(count):
+        name = f"{' '.join(rng.sample(NAME_WORDS, 2)).title()} {rng.choice(NAME_SUFFIXES)} {i}"
+        metadata = {
+            "Account Name": name,
+            "Investor Focus Area": ", ".join(rng.sample(FOCUS_AREAS, rng.randint(1, 3))),
+            "Investor Type": rng.choice(INVESTOR_TYPES),
+            "Fund Type": rng.choice(FUND_TYPES),
+            "Stage": ", ".join(rng.sample(STAGES, rng.randint(1, 2))),
+            "Check Size": rng.choice(CHECK_SIZES),
+            "Geographic Focus": rng.choice(GEOGRAPHIES),
+            "Investment Thesis": " ".join(rng.choice(THESIS_WORDS) for _ in range(rng.randint(10, 40))),
+        }
+        text = "\n".join(f"{key}: {value}" for key, value in metadata.items())
+        text += (f"\n=== CONTACT INFORMATION (from Contact Files) ===\nContact Person 1:\n"
+                 f"  Name: Partner {i}\n  Email: partner{i}@{name.split()[0].lower()}.com")
+        profiles.append({"id": str(i), "text": text, "metadata": metadata})
+    return profiles
+
+
+def make_queries(profiles: List[Dict[str, any]], count: int, rng: random.Random) -> List[str]:
+    """Mix of focus/stage phrases, firm names and thesis keywords."""
+    queries = []
+    for _ in range(count):
+        variant = rng.random()
+        if variant < 0.4:
+            queries.append(f"{rng.choice(FOCUS_AREAS)} {rng.choice(STAGES)} investors")
+        elif variant < 0.6:
+            queries.append(rng.choice(profiles)["metadata"]["Account Name"])
+        elif variant < 0.8:
+            queries.append(" ".join(rng.sample(THESIS_WORDS, 3)))
+        else:
+            queries.append(f"{rng.choice(INVESTOR_TYPES)} in {rng.choice(GEOGRAPHIES)} writing {rng.choice(CHECK_SIZES)}")
+    return queries
+
+
+def run(size: int, n_queries: int, legacy_queries: int, seed: int = 0) -> Dict[str, float]:
+    """Time index build and queries for one corpus size and check results against the full scan."""
+    rng = random.Random(seed)
+    profiles = synthetic_profiles(size, rng)
+    queries = make_queries(profiles, n_queries, rng)
+
+    start = time.perf_counter()
+    index = KeywordIndex(profiles)
+    build_s = time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        indexed = [[p["id"] for p in index.search(q)] for q in queries]
+        indexed_s = time.perf_counter() - start
+
+    # The full scan is slow at large sizes, so only a prefix of the queries is timed
+    legacy_subset = queries[:legacy_queries]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        legacy = [[p["id"] for p in search_investors(profiles, q)] for q in legacy_subset]
+        legacy_s = time.perf_counter() - start
+
+    indexed_ms = indexed_s * 1000 / len(queries)
+    legacy_ms = legacy_s * 1000 / len(legacy_subset)
+    return {
+        "profiles": size,
+        "queries": len(queries),
+        "index_build_ms": build_s * 1000,
+        "indexed_ms_per_query": indexed_ms,
+        "legacy_ms_per_query": legacy_ms,
+        "speedup": legacy_ms / indexed_ms if indexed_ms else float('inf'),
+        "identical_results": sum(a == b for a, b in zip(indexed, legacy)) / len(legacy_subset),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[725, 10000, 100000], help="Corpus sizes to benchmark")
+    parser.add_argument("--queries", type=int, default=200, help="Number of indexed queries to time")
+    parser.add_argument("--legacy-queries", type=int, default=20, help="Number of full-scan queries to time")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("KEYWORD SEARCH BENCHMARK")
+    print("=" * 60)
+    for size in args.sizes:
+        results = run(size, args.queries, min(args.legacy_queries, args.queries))
+        for key, value in results.items():
+            print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""End-to-end performance benchmark on synthetic investor workbooks.
+
+Generates Airtable / Contacts (DFD) / Pitchbook Contacts workbooks at each scale,
+points the loaders at them and times data loading, the vector store build, search,
+context building, a full recommendation (with a stubbed Anthropic client) and
+result saving. Results are written as JSON so runs can be compared across commits.
+
+Usage:
+    python benchmark_suite.py                                  # 725 and 5000 investors
+    python benchmark_suite.py --scales 725 10000 --output bench.json
+    python benchmark_suite.py --compare before.json after.json
+"""
+import os
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark-stub")  # the pipeline requires a key; no request is ever sent
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import config
+from benchmark_keyword_search import FOCUS_AREAS, GEOGRAPHIES, NAME_WORDS, synthetic_profiles
+
+FIRST_NAMES = ['Julie', 'Jeffrey', 'Maria', 'Sam', 'Priya', 'Tom', 'Aisha', 'Daniel', 'Lena', 'Omar']
+LAST_NAMES = ['Wolf', 'Katz', 'Garcia', 'Chen', 'Patel', 'Nguyen', 'Okafor', 'Smith', 'Berg', 'Haddad']
+TITLES = ['Partner', 'Principal', 'Managing Director', 'Associate', 'Venture Partner']
+
+QUERIES = [
+    "Fintech seed investors in New York",
+    "$500k seed checks for a climate startup",
+    "Series A healthcare funds in Europe",
+    "angel investors for consumer marketplaces",
+    "growth stage enterprise SaaS investors writing $10M+ checks",
+    "AI infrastructure investors",
+    "family offices investing in proptech",
+    "corporate VCs in mobility",
+]
+
+
+class _StubUsage:
+    input_tokens = 0
+    output_tokens = 0
+    cache_read_input_tokens = 0
+    cache_creation_input_tokens = 0
+
+
+class _StubBlock:
+    type = "text"
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _StubMessage:
+    def __init__(self, text: str):
+        self.content = [_StubBlock(text)]
+        self.usage = _StubUsage()
+
+
+class _StubMessages:
+    def create(self, **kwargs):
+        return _StubMessage("Benchmark response.")
+
+
+class StubAnthropic:
+    """Stands in for the Anthropic client so only local work is timed."""
+
+    def __init__(self):
+        self.messages = _StubMessages()
+
+
+def write_workbooks(directory: str, investors: int, contacts_per_firm: int, rng: random.Random) -> Dict[str, str]:
+    """
+    Write the three input workbooks.
+
+    Returns:
+        Dictionary with 'data', 'contacts' and 'pitchbook' file paths
+    """
+    airtable_rows = []
+    for profile in synthetic_profiles(investors, rng):
+        row = dict(profile["metadata"])
+        firm = row["Account Name"]
+        row["Portfolio Companies"] = ", ".join(f"{rng.choice(NAME_WORDS).title()}{rng.randint(1, 999)}" for _ in range(3))
+        if rng.random() < 0.3:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            row["Investor Notes"] = (f"Met {first} {last} at demo day, {first.lower()}@{firm.split()[0].lower()}.vc "
+                                     f"{rng.choice(TITLES)} focused on {rng.choice(FOCUS_AREAS)}")
+        airtable_rows.append(row)
+
+    firms = [row["Account Name"] for row in airtable_rows]
+    contact_rows, pitchbook_rows = [], []
+    for i, firm in enumerate(firms):
+        # Contact sheets spell some firm names differently, exercising the fuzzy matcher
+        contact_firm = f"{firm}, LLC" if i % 5 == 0 else firm
+        for j in range(contacts_per_firm):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f"{first.lower()}.{last.lower()}{j}@{firm.split()[0].lower()}{i}.vc"
+            if j % 2 == 0:
+                contact_rows.append({
+                    "First Name": first, "Last Name": last, "Email": email, "Website": email.split("@")[1],
+                    "Title": rng.choice(TITLES), "Company": contact_firm, "City": rng.choice(GEOGRAPHIES),
+                    "Country": "United States", "Campaign Status": "In Progress",
+                })
+            else:
+                pitchbook_rows.append({
+                    "Person ID": f"{i}-{j}P", "People": f"{first} {last}", "First Name": first, "Last Name": last,
+                    "Firm Name": contact_firm, "Positions": rng.choice(TITLES),
+                    "Biography": f"{first} {last} invests in {rng.choice(FOCUS_AREAS)} at {firm}.",
+                    "Email": email, "City": "Berlin", "Location": "Berlin, Germany",
+                    "Country/Territory/Region": "Germany", "Primary Position": rng.choice(TITLES),
+                    "Primary Company": contact_firm,
+                })
+
+    paths = {
+        "data": os.path.join(directory, "Investor DATA - Airtable (DFD) .xlsx"),
+        "contacts": os.path.join(directory, "Investor DATA - Contacts (DFD).xlsx"),
+        "pitchbook": os.path.join(directory, "Investor DATA - Pitchbook Contacts.xlsx"),
+    }
+    pd.DataFrame(airtable_rows).to_excel(paths["data"], index=False)
+    pd.DataFrame(contact_rows).to_excel(paths["contacts"], index=False)
+    pd.DataFrame(pitchbook_rows).to_excel(paths["pitchbook"], index=False)
+    return paths
+
+
+def _summarize(samples_s: List[float]) -> Dict[str, float]:
+    """Millisecond statistics over repeated timings."""
+    samples_ms = sorted(s * 1000 for s in samples_s)
+    return {
+        "runs": len(samples_ms),
+        "mean_ms": statistics.fmean(samples_ms),
+        "p50_ms": samples_ms[len(samples_ms) // 2],
+        "p95_ms": samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))],
+        "max_ms": samples_ms[-1],
+    }
+
+
+def _time(fn: Callable, *args, **kwargs):
+    """Run fn quietly and return (result, elapsed seconds)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+
+def _time_each(fn: Callable, items: List) -> Dict[str, float]:
+    return _summarize([_time(fn, item)[1] for item in items])
+
+
+def run_scale(investors: int, contacts_per_firm: int, n_queries: int, n_saves: int,
+              seed: int = 0, skip_vector_store: bool = False) -> Dict:
+    """Benchmark every stage at one scale inside a scratch directory."""
+    from data_loader import get_investor_data
+    from results_saver import save_query_result
+
+    rng = random.Random(seed)
+    workdir = tempfile.mkdtemp(prefix="investor-bench-")
+    saved_config = {name: getattr(config, name) for name in (
+        "DATA_FILE_PATH", "CONTACTS_FILE_PATH", "PITCHBOOK_CONTACTS_FILE_PATH", "EXCEL_CACHE_DIR",
+        "RESULTS_FILE_PATH", "MARKDOWN_RESULTS_DIR", "DECK_PROFILE_CACHE_DIR", "EMBEDDING_CACHE_PATH",
+        "PDF_TEXT_CACHE_DIR", "ONNX_MODEL_DIR")}
+    result = {"investors": investors, "contacts_per_firm": contacts_per_firm, "stages": {}}
+    stages = result["stages"]
+    try:
+        _, elapsed = _time(write_workbooks, workdir, investors, contacts_per_firm, rng)
+        result["workbook_generation_s"] = elapsed
+
+        paths = {
+            "DATA_FILE_PATH": os.path.join(workdir, "Investor DATA - Airtable (DFD) .xlsx"),
+            "CONTACTS_FILE_PATH": os.path.join(workdir, "Investor DATA - Contacts (DFD).xlsx"),
+            "PITCHBOOK_CONTACTS_FILE_PATH": os.path.join(workdir, "Investor DATA - Pitchbook Contacts.xlsx"),
+            "EXCEL_CACHE_DIR": os.path.join(workdir, "cache", "excel"),
+            "RESULTS_FILE_PATH": os.path.join(workdir, "results", "query_results.jsonl"),
+            "MARKDOWN_RESULTS_DIR": os.path.join(workdir, "results", "markdown"),
+            "DECK_PROFILE_CACHE_DIR": os.path.join(workdir, "cache", "deck_profiles"),
+            # Every run starts cold: no embeddings or deck text from earlier runs or the app's own cache
+            "EMBEDDING_CACHE_PATH": os.path.join(workdir, "cache", "embeddings.sqlite3"),
+            "PDF_TEXT_CACHE_DIR": os.path.join(workdir, "cache", "pdf_text"),
+            # The model itself is shared (downloading it is not part of any timed stage)
+            "ONNX_MODEL_DIR": os.path.abspath(config.ONNX_MODEL_DIR) if config.ONNX_MODEL_DIR else None,
+        }
+        for name, value in paths.items():
+            setattr(config, name, value)
+
+        profiles, elapsed = _time(get_investor_data)
+        stages["get_investor_data_cold_s"] = elapsed
+        _, elapsed = _time(get_investor_data)
+        stages["get_investor_data_warm_s"] = elapsed
+        result["profiles"] = len(profiles)
+
+        queries = [QUERIES[i % len(QUERIES)] for i in range(n_queries)]
+
+        if not skip_vector_store:
+            from vector_store import InvestorVectorStore
+            from rag_pipeline import InvestorRAGPipeline
+
+            vector_store, elapsed = _time(InvestorVectorStore, persist_directory=os.path.join(workdir, "vector_db"))
+            stages["vector_store_build_s"] = elapsed
+            _, elapsed = _time(vector_store.keyword_index)
+            stages["keyword_index_build_s"] = elapsed
+
+            stages["search_vector"] = _time_each(lambda q: vector_store.search(q, n_results=10), queries)
+            stages["search_keyword"] = _time_each(lambda q: vector_store.keyword_search(q, n_results=10), queries)
+            stages["search_hybrid"] = _time_each(lambda q: vector_store.hybrid_search(q, n_results=10), queries)
+
+            pipeline, _ = _time(InvestorRAGPipeline, vector_store)
+            pipeline.anthropic_client = StubAnthropic()
+            pipeline.deck_digester.anthropic_client = pipeline.anthropic_client
+            retrieved = [vector_store.hybrid_search(q, n_results=config.MAX_INVESTORS_TO_CLAUDE) for q in queries]
+            stages["create_concise_context"] = _time_each(pipeline._create_concise_context, retrieved)
+
+            def recommend(query):
+                pipeline.response_cache.clear()  # time the full path, not cache hits
+                return pipeline.generate_recommendation(query)
+            stages["generate_recommendation_stubbed"] = _time_each(recommend, queries)
+
+        response = "## Recommended investors\n" + "\n".join(f"{i}. Firm {i} - strong fit" for i in range(10))
+        stages["save_query_result"] = _time_each(
+            lambda i: save_query_result(queries[i % len(queries)], response, None), list(range(n_saves))
+        )
+    finally:
+        for name, value in saved_config.items():
+            setattr(config, name, value)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(results: Dict) -> Dict[str, float]:
+    """Comparable metrics keyed by 'investors/stage' (mean_ms for repeated stages, seconds otherwise)."""
+    metrics = {}
+    for scale in results["scales"]:
+        for stage, value in scale["stages"].items():
+            if isinstance(value, dict):
+                metrics[f"{scale['investors']}/{stage} (mean ms)"] = value["mean_ms"]
+            elif isinstance(value, (int, float)):
+                metrics[f"{scale['investors']}/{stage}"] = value
+    return metrics
+
+
+def compare(before_file: str, after_file: str):
+    """Print per-stage ratios between two result files."""
+    with open(before_file, 'r', encoding='utf-8') as f:
+        before = _flatten(json.load(f))
+    with open(after_file, 'r', encoding='utf-8') as f:
+        after = _flatten(json.load(f))
+    print(f"{'metric':60} {'before':>12} {'after':>12} {'after/before':>13}")
+    for key in sorted(set(before) & set(after)):
+        ratio = after[key] / before[key] if before[key] else float('inf')
+        print(f"{key:60} {before[key]:12.3f} {after[key]:12.3f} {ratio:13.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[725, 5000], help="Numbers of investors to generate")
+    parser.add_argument("--contacts-per-firm", type=int, default=2, help="Contacts generated per firm")
+    parser.add_argument("--queries", type=int, default=20, help="Queries timed per search stage")
+    parser.add_argument("--saves", type=int, default=50, help="Results saved in the save_query_result stage")
+    parser.add_argument("--skip-vector-store", action="store_true",
+                        help="Skip stages that need the embedding model (vector store, search, pipeline)")
+    parser.add_argument("--output", help="Write JSON results to this file (default: print them)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": [],
+    }
+    for investors in args.scales:
+        print(f"Benchmarking {investors} investors...")
+        results["scales"].append(run_scale(investors, args.contacts_per_firm, args.queries, args.saves,
+                                           skip_vector_store=args.skip_vector_store))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✓ Results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
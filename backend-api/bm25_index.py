@@ -0,0 +1,149 @@
+"""In-memory BM25 keyword index over investor profiles, and rank fusion with vector search.
+Exact firm and portfolio-company names are matched far better by keywords than by
+embeddings; the index is built once and scored through posting lists, so a query
+only touches the profiles that contain its terms.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "me", "my", "of", "on", "or", "that", "the", "their", "this", "to", "we", "what", "which",
+    "who", "with", "our", "us", "i", "find", "show", "give", "list", "looking",
+})
+
+# Repeat tokens of these profile fields so a hit there outweighs a passing mention in the text
+FIELD_WEIGHTS = {
+    "Account Name": 3,
+    "Investor Focus Area": 2,
+    "Investor Type": 1,
+    "Fund Type": 1,
+    "Portfolio Companies": 1,
+}
+
+
+def tokenize(text: str, pattern: re.Pattern = TOKEN_PATTERN, stopwords: FrozenSet[str] = STOPWORDS) -> List[str]:
+    """
+    Lowercased tokens of text.
+
+    Args:
+        text: Text to tokenize
+        pattern: What a token is (default: alphanumeric runs)
+        stopwords: Tokens to drop (default: STOPWORDS)
+    """
+    return [token for token in pattern.findall(text.lower()) if token not in stopwords]
+
+
+def build_postings(term_counts: Iterable[Mapping[str, int]]) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Inverted index from per-document term counts.
+
+    Args:
+        term_counts: Term frequencies of each document, in document order
+
+    Returns:
+        (document index, term frequency) postings per term, in document order
+    """
+    postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    for doc_index, counts in enumerate(term_counts):
+        for token, tf in counts.items():
+            postings[token].append((doc_index, tf))
+    return postings
+
+
+class BM25Index:
+    """Okapi BM25 over investor profiles with precomputed per-posting weights."""
+
+    def __init__(self, profiles: Iterable[Mapping], k1: float = 1.5, b: float = 0.75):
+        """
+        Build the index.
+
+        Args:
+            profiles: Investor profiles ({'id', 'text', 'metadata'} mappings)
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        term_counts: List[Counter] = []
+        for profile in profiles:
+            self.ids.append(profile['id'])
+            term_counts.append(self._term_counts(profile))
+
+        doc_lengths = [sum(counts.values()) for counts in term_counts]
+        avg_length = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 0.0
+
+        raw_postings = build_postings(term_counts)
+
+        # Score contribution of each (term, document) pair, so queries only sum
+        doc_count = len(self.ids)
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for token, postings in raw_postings.items():
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            weighted = []
+            for doc_index, tf in postings:
+                norm = 1 - b + b * (doc_lengths[doc_index] / avg_length if avg_length else 0.0)
+                weighted.append((doc_index, idf * tf * (k1 + 1) / (tf + k1 * norm)))
+            self.postings[token] = weighted
+
+    @staticmethod
+    def _term_counts(profile: Mapping) -> Counter:
+        counts = Counter(tokenize(profile['text']))
+        metadata = profile['metadata']
+        for field, weight in FIELD_WEIGHTS.items():
+            value = metadata.get(field)
+            if value:
+                for token in tokenize(str(value)):
+                    counts[token] += weight
+        return counts
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: str, n_results: int = 10,
+               allowed_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Rank profiles for a query.
+
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            allowed_ids: Restrict results to these investor ids (None = all)
+
+        Returns:
+            List of (investor id, score), best first; profiles sharing no term are omitted
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            for doc_index, weight in self.postings.get(token, ()):
+                scores[doc_index] += weight
+
+        candidates = scores.items()
+        if allowed_ids is not None:
+            candidates = [(doc_index, score) for doc_index, score in candidates if self.ids[doc_index] in allowed_ids]
+        top = heapq.nlargest(n_results, candidates, key=lambda item: item[1])
+        return [(self.ids[doc_index], score) for doc_index, score in top]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists with reciprocal rank fusion (score = sum of 1 / (k + rank)).
+
+    Args:
+        rankings: Ranked lists of ids, best first
+        k: Damping constant; larger values flatten the advantage of top ranks
+
+    Returns:
+        List of (id, fused score), best first
+    """
+    fused: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            fused[item_id] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
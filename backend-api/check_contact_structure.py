@@ -1,6 +1,7 @@
 """Check the actual structure of contact files."""
 import pandas as pd
 import config
+from excel_cache import read_excel_cached
 
 print("=" * 80)
 print("CHECKING CONTACT FILES STRUCTURE")
@@ -10,7 +11,7 @@ print("=" * 80)
 print("\n1. CONTACTS FILE (Investor DATA - Contacts (DFD).xlsx)")
 print("-" * 80)
 try:
-    df1 = pd.read_excel(config.CONTACTS_FILE_PATH)
+    df1 = read_excel_cached(config.CONTACTS_FILE_PATH)
     print(f"Shape: {df1.shape[0]} rows x {df1.shape[1]} columns")
     print(f"\nColumns: {list(df1.columns)}")
     
@@ -37,7 +38,7 @@ except Exception as e:
 print("\n\n2. PITCHBOOK CONTACTS FILE (Investor DATA - Pitchbook Contacts.xlsx)")
 print("-" * 80)
 try:
-    df2 = pd.read_excel(config.PITCHBOOK_CONTACTS_FILE_PATH)
+    df2 = read_excel_cached(config.PITCHBOOK_CONTACTS_FILE_PATH)
     print(f"Shape: {df2.shape[0]} rows x {df2.shape[1]} columns")
     print(f"\nColumns: {list(df2.columns)}")
     
@@ -64,7 +65,7 @@ except Exception as e:
 print("\n\n3. MAIN INVESTOR FILE (for comparison)")
 print("-" * 80)
 try:
-    df_main = pd.read_excel(config.DATA_FILE_PATH)
+    df_main = read_excel_cached(config.DATA_FILE_PATH)
     print(f"Shape: {df_main.shape[0]} rows x {df_main.shape[1]} columns")
     print(f"Columns: {list(df_main.columns)}")
 except Exception as e:
@@ -6,26 +6,96 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # API Keys
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")  # Required by the recommendation pipeline (checked when it is created)
 
 # Model Configuration
 ANTHROPIC_MODEL = "claude-sonnet-4-5-20250929"  # or claude-3-opus-20240229, claude-3-sonnet-20240229
+PROMPT_CACHING_ENABLED = True  # Mark the system prompt and pitch deck as an Anthropic prompt cache breakpoint
+PROMPT_CACHE_MIN_TOKENS = 1024  # Anthropic does not cache shorter prefixes (2048 for Haiku models); shorter ones are not marked
+PROMPT_CHARS_PER_TOKEN = 4  # Rough English characters per token, for estimating prefix length
 
 # Data Configuration
 DATA_FILE_PATH = "DATA/Investor DATA - Airtable (DFD) .xlsx"
 CONTACTS_FILE_PATH = "DATA/Investor DATA - Contacts (DFD).xlsx"
 PITCHBOOK_CONTACTS_FILE_PATH = "DATA/Investor DATA - Pitchbook Contacts.xlsx"
 PITCH_DECKS_FOLDER = "Pitch Decks"
+PDF_TEXT_CACHE_DIR = "cache/pdf_text"  # Extracted deck text, keyed by SHA-256 of the PDF bytes
+PDF_TEXT_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Size limit of PDF_TEXT_CACHE_DIR; least recently used entries are evicted (None = unbounded)
+PDF_PARALLEL_MIN_PAGES = 20  # Decks with at least this many pages are extracted in a process pool
+PDF_EXTRACT_WORKERS = min(4, os.cpu_count() or 1)  # Processes used for parallel page extraction
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # Largest pitch deck /api/upload or /api/batch accepts
+MAX_BATCH_UPLOAD_BYTES = 200 * 1024 * 1024  # Largest /api/batch request body (all uploaded decks together)
+EXCEL_CACHE_DIR = "cache/excel"  # Parsed spreadsheets, reused until the .xlsx file changes
+
+# Embedding Configuration
+EMBEDDING_BACKEND = "onnx"  # "onnx" (MiniLM on ONNX Runtime), "sentence-transformers" (needs sentence-transformers) or "hashed" (no model)
+SENTENCE_TRANSFORMER_MODEL = "all-MiniLM-L6-v2"  # Model used by the sentence-transformers backend
+HASHED_EMBEDDING_DIMENSIONS = 1024  # Vector size of the hashed backend
+EMBEDDING_BATCH_SIZE = 64  # Texts per sentence-transformers forward pass
+EMBEDDING_CACHE_PATH = "cache/embeddings.sqlite3"  # Vectors keyed by model and text hash (None = no cache)
+ONNX_MODEL_DIR = "cache/onnx_models"  # Where the ONNX model is downloaded (None = Chroma's cache in the home directory)
 
 # Search Configuration
 MAX_INVESTORS_TO_SHOW = 725  # Search entire database for better recommendations
 MAX_INVESTORS_TO_CLAUDE = 10  # Maximum investors to send to Claude (reduced for efficiency with vector search)
+METADATA_FILTERING_ENABLED = True  # Apply stage/geography/type/check size constraints from the query inside the vector search
+CHECK_SIZE_TOLERANCE = 2.0  # A requested check size matches investors whose range is within this factor of it
+RETRIEVAL_MODE = "hybrid"  # "hybrid" (vector + BM25 keywords), "vector" or "keyword"
+HYBRID_CANDIDATE_MULTIPLIER = 3  # Each retriever contributes this many times the requested results before fusion
+ANN_MAX_RESULTS = 100  # Most nearest neighbours requested from Chroma per query vector (collections smaller than this are returned whole)
+RRF_K = 60  # Reciprocal rank fusion damping constant
+DECK_AWARE_RETRIEVAL = True  # Rank investors on the query and the pitch deck's chunks, not the query alone
+DECK_RETRIEVAL_WEIGHT = 0.5  # Share of an investor's score from its best-matching deck chunk (the rest from the query)
+DECK_CANDIDATE_MULTIPLIER = 3  # Candidates scored for deck-aware retrieval, as a multiple of the requested results (shared by the query and all deck chunks)
+DECK_CHUNK_CHARS = 1500  # Maximum length of a deck chunk (consecutive short pages are merged)
+DECK_MAX_CHUNKS = 30  # Deck chunks embedded per deck (later pages are ignored)
+DECK_CHUNK_CACHE_SIZE = 64  # Decks whose chunk embeddings are kept in memory
+RERANK_ENABLED = True  # Retrieve a wide candidate set and rerank it before sending MAX_INVESTORS_TO_CLAUDE to Claude
+RERANK_CANDIDATES = 30  # Investors retrieved for reranking (kept small so the search stays an index lookup)
+RERANKER = "linear"  # "linear" (fit features only) or "cross-encoder" (adds a cross-encoder relevance score; needs sentence-transformers)
+RERANK_CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"  # Small CPU-friendly cross-encoder
+RERANK_BATCH_SIZE = 32  # Query/profile pairs per cross-encoder batch
+RERANK_WORKERS = min(4, os.cpu_count() or 1)  # Threads scoring cross-encoder batches concurrently
+RERANK_WEIGHTS = {  # Linear scorer weights per feature (see reranker.FEATURES)
+    "retrieval": 1.0,  # Rank from the vector/keyword search (1 = first, near 0 = last)
+    "relevance": 1.0,  # Cross-encoder relevance (0 when RERANKER = "linear")
+    "stage": 0.5,  # Stage match (1), unknown (0.5) or mismatch (0)
+    "geography": 0.4,  # Region or global match (1), unknown (0.5) or mismatch (0)
+    "investor_type": 0.3,  # Investor type match (1), unknown (0.5) or mismatch (0)
+    "check_size": 0.4,  # Check size range fits the requested check or round (1), unknown/near (0.5) or not (0)
+    "focus": 0.6,  # Share of query words found in the investor's focus area, industry focus and thesis
+}
+
+# Response Cache Configuration (Claude recommendations for repeated queries)
+RESPONSE_CACHE_MAX_ENTRIES = 256  # LRU eviction beyond this many responses
+RESPONSE_CACHE_TTL_SECONDS = 3600  # Re-ask Claude after an hour
+RESPONSE_CACHE_SIMILARITY_THRESHOLD = 0.95  # Cosine similarity for paraphrased queries (None = exact matches only)
+
+# Session Configuration (pitch decks uploaded through the API)
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory")  # "memory" or "sqlite" (shared across workers)
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "86400"))  # Forget decks unused for a day
+SESSION_MAX_ENTRIES = 500  # In-memory store: maximum decks kept (LRU eviction)
+SESSION_DB_PATH = "sessions/sessions.sqlite3"  # SQLite store location
+
+# Pitch Deck Configuration
+SEND_FULL_PITCH_DECK = False  # Send the raw deck text to Claude instead of its digested profile
+DECK_PROFILE_CACHE_DIR = "cache/deck_profiles"  # Digested deck profiles, keyed by deck content hash
+DECK_PROFILE_MEMORY_SIZE = 128  # Digested profiles also kept in memory (least recently used evicted first)
+DECK_DIGEST_MAX_TOKENS = 800  # Maximum length of a digested profile
+DECK_DIGEST_MAX_INPUT_CHARS = 200000  # Deck text beyond this is not sent for digestion
+DECK_INDEX_DOCUMENT_CHARS = 2000  # Deck text embedded for investor -> deck matching when no digested profile is cached
+
+# Batch Configuration
+BATCH_DEFAULT_QUERY = "Which investors are the best fit for this pitch deck?"  # Asked about every deck unless a query is given
+BATCH_CONCURRENCY = 5  # Claude calls in flight at once during a batch run
+BATCH_MAX_DECKS = 100  # Most pitch decks accepted by one /api/batch request
+BATCH_SEARCH_DECK_CHARS = 2000  # Deck text used as the search text when a deck could not be digested
 
 # Results Configuration
-RESULTS_FILE_PATH = "results/query_results.json"  # Path to save query results (JSON)
+RESULTS_FILE_PATH = "results/query_results.jsonl"  # Append-only query results log (JSON Lines); a legacy .json array beside it is migrated on first use
+RESULTS_ROTATE_MAX_BYTES = 10 * 1024 * 1024  # Start a new log segment once the active log reaches this size
+RESULTS_ROTATE_DAILY = True  # Start a new log segment on the first result of each day
+RESULTS_WRITER_BATCH_SIZE = 50  # Results the background writer saves per batch
+RESULTS_WRITER_FLUSH_INTERVAL = 0.5  # Seconds the background writer waits for a batch to fill
 MARKDOWN_RESULTS_DIR = "results/markdown"  # Directory to save individual markdown files
 
-# Validation
-if not ANTHROPIC_API_KEY:
-    raise ValueError("ANTHROPIC_API_KEY not found in environment variables. Please set it in .env file.")
-
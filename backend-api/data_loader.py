@@ -1,8 +1,11 @@
 """Load and process investor data from Excel file."""
+import numpy as np
 import pandas as pd
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import config
+from excel_cache import read_excel_cached
+from firm_matcher import FirmNameIndex
 
 
 def load_investor_data(file_path: str = None) -> pd.DataFrame:
@@ -19,7 +22,7 @@ def load_investor_data(file_path: str = None) -> pd.DataFrame:
         file_path = config.DATA_FILE_PATH
     
     try:
-        df = pd.read_excel(file_path)
+        df = read_excel_cached(file_path)
         return df
     except FileNotFoundError:
         raise FileNotFoundError(f"Excel file not found at {file_path}")
@@ -27,6 +30,128 @@ def load_investor_data(file_path: str = None) -> pd.DataFrame:
         raise Exception(f"Error reading Excel file: {str(e)}")
 
 
+def _find_firm_column(df: pd.DataFrame):
+    """
+    Identify the firm name column of a spreadsheet.
+    
+    Prioritizes "Account Name" or a plain "Name" column, then columns mentioning
+    firm/company/organization, and finally falls back to the first column.
+    """
+    for col in df.columns:
+        col_lower = str(col).lower()
+        if 'account name' in col_lower or (col_lower == 'name' and 'note' not in col_lower):
+            return col
+    
+    for col in df.columns:
+        col_lower = str(col).lower()
+        if any(term in col_lower for term in ['firm', 'company', 'organization']):
+            return col
+    
+    if len(df.columns) > 0:
+        return df.columns[0]
+    return None
+
+
+def _find_notes_column(df: pd.DataFrame):
+    """Identify the notes column of a spreadsheet (first column mentioning 'note')."""
+    for col in df.columns:
+        if 'note' in str(col).lower():
+            return col
+    return None
+
+
+def _present_mask(df: pd.DataFrame, strip_empty: bool = False) -> np.ndarray:
+    """
+    Boolean matrix of cells holding a value.
+    
+    Args:
+        df: DataFrame to inspect
+        strip_empty: Also treat cells whose string form is blank as missing
+        
+    Returns:
+        2D NumPy array aligned with df (rows x columns)
+    """
+    mask = df.notna().to_numpy(copy=True)  # to_numpy() may return a read-only view (copy-on-write)
+    if strip_empty:
+        for j, col in enumerate(df.columns):
+            mask[:, j] &= (df[col].map(str).str.strip() != '').to_numpy()
+    return mask
+
+
+def _row_dicts(df: pd.DataFrame, mask: np.ndarray) -> List[Dict]:
+    """Build one {column: value} dict per row from the cells selected by mask."""
+    columns = list(df.columns)
+    values = df.to_numpy(dtype=object)
+    return [
+        {columns[j]: row_values[j] for j in np.flatnonzero(row_mask)}
+        for row_values, row_mask in zip(values, mask)
+    ]
+
+
+def _clean_str_column(df: pd.DataFrame, col) -> pd.Series:
+    """Stripped string form of a column, with missing cells (or a missing column) as ''."""
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    series = df[col]
+    return series.map(str).str.strip().where(series.notna(), '').astype(object)
+
+
+def _resolve_firm_names(df: pd.DataFrame, firm_col) -> pd.Series:
+    """
+    Firm name per row: the "Company" column when filled, otherwise the firm column.
+    Rows without a usable firm name are None.
+    """
+    firm_names = pd.Series(None, index=df.index, dtype=object)
+    if firm_col is not None:
+        firm_names = firm_names.where(df[firm_col].isna(), df[firm_col].map(str).str.strip())
+    if 'Company' in df.columns:
+        company = df['Company']
+        firm_names = firm_names.where(company.isna(), company.map(str).str.strip())
+    
+    invalid = firm_names.isna() | firm_names.fillna('').str.lower().isin(['nan', 'none', ''])
+    return firm_names.where(~invalid, None).astype(object)
+
+
+def _structured_contacts(df: pd.DataFrame, source_file: str) -> List[Optional[Dict]]:
+    """
+    Build contact dicts from a file with First Name / Last Name / Email columns.
+    
+    Returns:
+        One entry per row: the contact dict, or None if the row has neither name nor email
+    """
+    names = (_clean_str_column(df, 'First Name') + ' ' + _clean_str_column(df, 'Last Name')).str.strip()
+    emails = _clean_str_column(df, 'Email')
+    emails = emails.where(emails.str.contains('@', regex=False), '')
+    titles = _clean_str_column(df, 'Title')
+    has_title = df['Title'].notna().to_numpy() if 'Title' in df.columns else np.zeros(len(df), dtype=bool)
+    
+    extra_cols = [col for col in df.columns if col not in ['First Name', 'Last Name', 'Email', 'Title', 'Company']]
+    extra_df = df[extra_cols]
+    extras = _row_dicts(extra_df, _present_mask(extra_df, strip_empty=True))
+    
+    contacts = []
+    for name, email, title, title_present, extra in zip(
+            names.to_numpy(), emails.to_numpy(), titles.to_numpy(), has_title, extras):
+        # Only keep rows with at least an email or name
+        if not (name or email):
+            contacts.append(None)
+            continue
+        contact = {
+            'source': 'contact_files',
+            'source_file': source_file
+        }
+        if name:
+            contact['name'] = name
+        if email:
+            contact['email'] = email
+        if title_present:
+            contact['background'] = title
+        # Add all other fields for context
+        contact.update(extra)
+        contacts.append(contact)
+    return contacts
+
+
 def load_contact_data(contacts_file: str = None, pitchbook_contacts_file: str = None) -> Dict[str, List[Dict]]:
     """
     Load contact data from Excel files and organize by firm name.
@@ -52,118 +177,53 @@ def load_contact_data(contacts_file: str = None, pitchbook_contacts_file: str =
     
     for file_path in contact_files:
         try:
-            df = pd.read_excel(file_path)
+            df = read_excel_cached(file_path)
             
-            # Try to identify firm name column (common variations)
-            # Prioritize "Account Name" or columns with "name" that aren't "Investor Notes"
-            firm_col = None
-            for col in df.columns:
-                col_lower = str(col).lower()
-                if 'account name' in col_lower or (col_lower == 'name' and 'note' not in col_lower):
-                    firm_col = col
-                    break
+            firm_col = _find_firm_column(df)
+            if firm_col is None or df.empty:
+                continue
             
-            # If not found, try other variations
-            if firm_col is None:
-                for col in df.columns:
-                    col_lower = str(col).lower()
-                    if any(term in col_lower for term in ['firm', 'company', 'organization']):
-                        firm_col = col
-                        break
+            source_file = 'Contacts (DFD)' if 'Contacts (DFD)' in file_path else 'Pitchbook Contacts'
             
-            # If still not found, try first column
-            if firm_col is None and len(df.columns) > 0:
-                firm_col = df.columns[0]
-            
-            if firm_col is None:
-                continue
+            # Normalize firm names for matching (lowercase, remove extra spaces)
+            firm_names = _resolve_firm_names(df, firm_col)
+            valid = firm_names.notna().to_numpy()
+            df = df[valid]
+            normalized_names = firm_names[valid].str.lower().str.strip().to_numpy()
             
             # Check if this file has structured contact person data (First Name, Last Name, Email columns)
             has_structured_contacts = any(col in df.columns for col in ['First Name', 'Email', 'Last Name'])
             
-            # Group contacts by firm name
-            for idx, row in df.iterrows():
-                # Determine firm name - could be in "Company" column or firm_col
-                firm_name = None
-                if 'Company' in df.columns and pd.notna(row.get('Company')):
-                    firm_name = str(row['Company']).strip()
-                elif firm_col and pd.notna(row[firm_col]):
-                    firm_name = str(row[firm_col]).strip()
-                
-                if not firm_name or firm_name.lower() in ['nan', 'none', '']:
-                    continue
-                
-                # Normalize firm name for matching (lowercase, remove extra spaces)
-                firm_name_normalized = firm_name.lower().strip()
-                
-                if firm_name_normalized not in contacts_by_firm:
-                    contacts_by_firm[firm_name_normalized] = []
+            if has_structured_contacts:
+                row_contacts = _structured_contacts(df, source_file)
+                for firm_name_normalized, contact in zip(normalized_names, row_contacts):
+                    firm_contacts = contacts_by_firm.setdefault(firm_name_normalized, [])
+                    if contact is not None:
+                        firm_contacts.append(contact)
+                continue
+            
+            # Old format - extract from Notes field, keeping the full row when nothing is extracted
+            notes_col = _find_notes_column(df)
+            notes = df[notes_col].to_numpy(dtype=object) if notes_col is not None else [None] * len(df)
+            has_notes = df[notes_col].notna().to_numpy() if notes_col is not None else np.zeros(len(df), dtype=bool)
+            full_rows = _row_dicts(df, _present_mask(df, strip_empty=True))
+            
+            for firm_name_normalized, note, note_present, full_contact in zip(normalized_names, notes, has_notes, full_rows):
+                firm_contacts = contacts_by_firm.setdefault(firm_name_normalized, [])
                 
-                # If file has structured contact person data (First Name, Email, etc.)
-                if has_structured_contacts:
-                    # Create structured contact from row
-                    contact = {
-                        'source': 'contact_files',
-                        'source_file': 'Contacts (DFD)' if 'Contacts (DFD)' in file_path else 'Pitchbook Contacts'
-                    }
-                    
-                    # Extract name
-                    first_name = str(row.get('First Name', '')).strip() if pd.notna(row.get('First Name')) else ''
-                    last_name = str(row.get('Last Name', '')).strip() if pd.notna(row.get('Last Name')) else ''
-                    if first_name or last_name:
-                        contact['name'] = f"{first_name} {last_name}".strip()
-                    
-                    # Extract email
-                    if 'Email' in df.columns and pd.notna(row.get('Email')):
-                        email = str(row['Email']).strip()
-                        if email and '@' in email:
-                            contact['email'] = email
-                    
-                    # Extract title/role
-                    if 'Title' in df.columns and pd.notna(row.get('Title')):
-                        contact['background'] = str(row['Title']).strip()
-                    
-                    # Only add if we have at least an email or name
-                    if contact.get('email') or contact.get('name'):
-                        # Add all other fields for context
-                        for col in df.columns:
-                            if col not in ['First Name', 'Last Name', 'Email', 'Title', 'Company']:
-                                value = row[col]
-                                if pd.notna(value) and str(value).strip():
-                                    contact[col] = value
-                        contacts_by_firm[firm_name_normalized].append(contact)
+                extracted_contacts = extract_contact_info_from_notes(note) if note_present else []
+                for contact in extracted_contacts:
+                    # Mark source as contact file
+                    contact['source'] = 'contact_files'
+                    contact['source_file'] = source_file
+                    contact['source_notes'] = str(note)
+                    firm_contacts.append(contact)
                 
-                else:
-                    # Old format - extract from Notes field
-                    notes_col = None
-                    for col in df.columns:
-                        if 'note' in col.lower():
-                            notes_col = col
-                            break
-                    
-                    extracted_contacts = []
-                    if notes_col and pd.notna(row[notes_col]):
-                        extracted_contacts = extract_contact_info_from_notes(row[notes_col])
-                        
-                        # Add each extracted contact
-                        for contact in extracted_contacts:
-                            # Mark source as contact file
-                            contact['source'] = 'contact_files'
-                            contact['source_file'] = 'Contacts (DFD)' if 'Contacts (DFD)' in file_path else 'Pitchbook Contacts'
-                            contact['source_notes'] = str(row[notes_col])
-                            contacts_by_firm[firm_name_normalized].append(contact)
-                    
-                    # Fallback: keep full row data if no structured contacts extracted
-                    if not extracted_contacts:
-                        full_contact = {}
-                        for col in df.columns:
-                            value = row[col]
-                            if pd.notna(value) and str(value).strip():
-                                full_contact[col] = value
-                        if full_contact:
-                            full_contact['source'] = 'contact_files'
-                            full_contact['source_file'] = 'Contacts (DFD)' if 'Contacts (DFD)' in file_path else 'Pitchbook Contacts'
-                            contacts_by_firm[firm_name_normalized].append(full_contact)
+                # Fallback: keep full row data if no structured contacts extracted
+                if not extracted_contacts and full_contact:
+                    full_contact['source'] = 'contact_files'
+                    full_contact['source_file'] = source_file
+                    firm_contacts.append(full_contact)
         
         except FileNotFoundError:
             # Continue if file doesn't exist
@@ -275,6 +335,30 @@ def extract_contact_info_from_notes(notes_text: str) -> List[Dict[str, str]]:
     return contacts
 
 
+def _field_text(df: pd.DataFrame, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the "col: value" text block of every row, one column at a time.
+    
+    Args:
+        df: DataFrame with investor data
+        mask: Boolean matrix of cells to include (rows x columns)
+        
+    Returns:
+        Tuple of (object array of newline-joined text per row, bool array of rows with any field)
+    """
+    text = np.full(len(df), '', dtype=object)
+    started = np.zeros(len(df), dtype=bool)
+    for j, col in enumerate(df.columns):
+        present = mask[:, j]
+        if not present.any():
+            continue
+        lines = (f"{col}: " + df[col].map(str)).to_numpy(dtype=object)
+        separators = np.where(started, '\n', '').astype(object)
+        text = np.where(present, text + separators + lines, text)
+        started |= present
+    return text, started
+
+
 def create_investor_profiles(df: pd.DataFrame, contacts_by_firm: Optional[Dict[str, List[Dict]]] = None) -> List[Dict[str, any]]:
     """
     Convert DataFrame rows to investor profile dictionaries with text representation.
@@ -289,66 +373,41 @@ def create_investor_profiles(df: pd.DataFrame, contacts_by_firm: Optional[Dict[s
     """
     profiles = []
     
-    # Try to identify firm name column in investor data
-    # Prioritize "Account Name" or columns with "name" that aren't "Investor Notes"
-    firm_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if 'account name' in col_lower or (col_lower == 'name' and 'note' not in col_lower):
-            firm_col = col
-            break
-    
-    # If not found, try other variations
-    if firm_col is None:
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if any(term in col_lower for term in ['firm', 'company', 'organization']):
-                firm_col = col
-                break
+    # Resolve the firm name and notes columns once for the whole sheet
+    firm_col = _find_firm_column(df)
+    notes_col = _find_notes_column(df)
     
-    # If still not found, try first column
-    if firm_col is None and len(df.columns) > 0:
-        firm_col = df.columns[0]
+    # Index contact firm names once instead of scanning them for every investor
+    firm_index = FirmNameIndex(contacts_by_firm.keys()) if contacts_by_firm else None
     
-    for idx, row in df.iterrows():
-        # Convert all non-null values to text representation
-        profile_parts = []
-        metadata = {}
-        
-        for col in df.columns:
-            value = row[col]
-            if pd.notna(value):
-                # Store original value in metadata
-                metadata[col] = value
-                # Add to text profile
-                profile_parts.append(f"{col}: {value}")
+    # Store original non-null values in metadata and build the text profile column-wise
+    present = _present_mask(df)
+    metadatas = _row_dicts(df, present)
+    field_texts, has_fields = _field_text(df, present)
+    
+    firm_names = df[firm_col].to_numpy(dtype=object) if firm_col is not None else np.full(len(df), None, dtype=object)
+    has_firm_name = df[firm_col].notna().to_numpy() if firm_col is not None else np.zeros(len(df), dtype=bool)
+    notes = df[notes_col].to_numpy(dtype=object) if notes_col is not None else np.full(len(df), None, dtype=object)
+    has_notes = df[notes_col].notna().to_numpy() if notes_col is not None else np.zeros(len(df), dtype=bool)
+    
+    for i, idx in enumerate(df.index):
+        profile_parts = [field_texts[i]] if has_fields[i] else []
+        metadata = metadatas[i]
         
         # Try to match and add contact information from contact files
         contacts = []
         if contacts_by_firm and firm_col:
-            firm_name = row[firm_col] if pd.notna(row[firm_col]) else None
+            firm_name = firm_names[i] if has_firm_name[i] else None
             if firm_name:
-                firm_name_normalized = normalize_firm_name(str(firm_name))
-                # Try exact match first
-                if firm_name_normalized in contacts_by_firm:
-                    contacts = contacts_by_firm[firm_name_normalized]
-                else:
-                    # Try partial matching (in case of slight variations)
-                    for contact_firm_name in contacts_by_firm.keys():
-                        if firm_name_normalized in contact_firm_name or contact_firm_name in firm_name_normalized:
-                            contacts = contacts_by_firm[contact_firm_name]
-                            break
+                # Exact match first, then the best fuzzy match (handles slight variations)
+                contact_firm_name = firm_index.match(normalize_firm_name(str(firm_name)))
+                if contact_firm_name is not None:
+                    contacts = contacts_by_firm[contact_firm_name]
         
         # Also extract contacts from the main investor file's Notes field
         # This ensures we get contacts even if contact files don't have them
-        notes_col = None
-        for col in df.columns:
-            if 'note' in col.lower():
-                notes_col = col
-                break
-        
-        if notes_col and pd.notna(row[notes_col]):
-            main_file_contacts = extract_contact_info_from_notes(row[notes_col])
+        if notes_col and has_notes[i]:
+            main_file_contacts = extract_contact_info_from_notes(notes[i])
             # Merge with contacts from contact files (avoid duplicates)
             existing_emails = {c.get('email', '').lower() for c in contacts if 'email' in c}
             for contact in main_file_contacts:
@@ -0,0 +1,119 @@
+"""Page/section chunks of a pitch deck, embedded once per deck.
+Retrieval scores investors against the query and every deck chunk, so what the
+deck says (sector, stage, traction) shapes which investors reach Claude.
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
+import config
+from deck_digest import hash_deck_text
+
+# Page markers written by pdf_loader ("--- Page 3 ---")
+PAGE_MARKER = re.compile(r"^--- Page \d+ ---$", re.MULTILINE)
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most max_chars, preferring paragraph then line breaks."""
+    pieces = []
+    while len(text) > max_chars:
+        cut = text.rfind("\n\n", 0, max_chars)
+        if cut <= 0:
+            cut = text.rfind("\n", 0, max_chars)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(text[:cut].strip())
+        text = text[cut:].strip()
+    if text:
+        pieces.append(text)
+    return [piece for piece in pieces if piece]
+
+
+def split_deck_text(pitch_deck_text: str, max_chars: int = None, max_chunks: int = None) -> List[str]:
+    """
+    Split a deck into section-sized chunks.
+
+    Extracted PDFs are split on their page markers, and short consecutive pages
+    (title, team photo, ...) are merged; pasted text is split on paragraphs.
+
+    Args:
+        pitch_deck_text: Deck text
+        max_chars: Maximum chunk length (None = config.DECK_CHUNK_CHARS)
+        max_chunks: Maximum number of chunks; later pages are dropped (None = config.DECK_MAX_CHUNKS)
+
+    Returns:
+        List of chunk texts
+    """
+    if max_chars is None:
+        max_chars = config.DECK_CHUNK_CHARS
+    if max_chunks is None:
+        max_chunks = config.DECK_MAX_CHUNKS
+
+    sections = [section.strip() for section in PAGE_MARKER.split(pitch_deck_text)]
+    if len(sections) == 1:
+        sections = [section.strip() for section in pitch_deck_text.split("\n\n")]
+
+    chunks: List[str] = []
+    current = ""
+    for section in sections:
+        if not section:
+            continue
+        if current and len(current) + len(section) + 1 <= max_chars:
+            current = f"{current}\n{section}"
+            continue
+        if current:
+            chunks.append(current)
+        pieces = _split_long(section, max_chars)
+        chunks.extend(pieces[:-1])
+        current = pieces[-1]
+    if current:
+        chunks.append(current)
+    return chunks[:max_chunks]
+
+
+class DeckChunkEmbedder:
+    """Embeds a deck's chunks, caching the vectors per deck content hash."""
+
+    def __init__(self, embed_texts: Callable[[List[str]], List[List[float]]], max_decks: int = None):
+        """
+        Initialize the embedder.
+
+        Args:
+            embed_texts: Embeds a batch of texts (e.g. the vector store's embedding function)
+            max_decks: Decks whose chunk embeddings are kept in memory (None = config.DECK_CHUNK_CACHE_SIZE)
+        """
+        self.embed_texts = embed_texts
+        self.max_decks = max_decks or config.DECK_CHUNK_CACHE_SIZE
+        self._embeddings: "OrderedDict[str, List[List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, pitch_deck_text: Optional[str]) -> Optional[List[List[float]]]:
+        """
+        Chunk embeddings for a deck, computed once per deck.
+
+        Args:
+            pitch_deck_text: Deck text (None or empty = no deck)
+
+        Returns:
+            One embedding per chunk, or None if there is no deck text
+        """
+        if not pitch_deck_text or not pitch_deck_text.strip():
+            return None
+        deck_hash = hash_deck_text(pitch_deck_text)
+        with self._lock:
+            if deck_hash in self._embeddings:
+                self._embeddings.move_to_end(deck_hash)
+                return self._embeddings[deck_hash]
+
+        chunks = split_deck_text(pitch_deck_text)
+        if not chunks:
+            return None
+        embeddings = [[float(x) for x in embedding] for embedding in self.embed_texts(chunks)]
+
+        with self._lock:
+            self._embeddings[deck_hash] = embeddings
+            while len(self._embeddings) > self.max_decks:
+                self._embeddings.popitem(last=False)
+        return embeddings
@@ -0,0 +1,170 @@
+"""One-time digestion of pitch decks into a compact investor-matching profile.
+The full deck text can be tens of thousands of tokens; the profile is a few hundred
+and is reused for every query about the same deck.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+import config
+
+DIGEST_SYSTEM_PROMPT = """You extract the facts investors screen on from startup pitch decks.
+Be concise and factual. Use only information stated in the deck; write "Not stated" when a field is missing."""
+
+DIGEST_INSTRUCTIONS = """Summarize the pitch deck below into exactly these lines:
+Company: <name>
+Sector: <industry / sub-sector>
+Business Model: <who pays for what>
+Stage: <pre-seed, seed, Series A, ...>
+Raise Size: <amount being raised and instrument, if stated>
+Geography: <headquarters and target markets>
+Traction: <revenue, growth, users, customers, partnerships>
+Team: <founders and notable experience>
+Use of Funds: <how the raise will be spent>
+Summary: <two sentences on the problem, solution and why now>
+
+Pitch Deck Content:
+"""
+
+
+def hash_deck_text(pitch_deck_text: str) -> str:
+    """Content hash identifying a pitch deck."""
+    return hashlib.sha256(pitch_deck_text.encode('utf-8')).hexdigest()
+
+
+class DeckDigester:
+    """Produces and caches (in memory and on disk) a compact profile per pitch deck."""
+
+    def __init__(self, anthropic_client, async_anthropic_client, cache_dir: str = None, max_profiles: int = None):
+        """
+        Initialize the digester.
+
+        Args:
+            anthropic_client: Synchronous Anthropic client
+            async_anthropic_client: Async Anthropic client
+            cache_dir: Directory for digested profiles (defaults to config)
+            max_profiles: Profiles kept in memory, least recently used evicted first (defaults to config)
+        """
+        self.anthropic_client = anthropic_client
+        self.async_anthropic_client = async_anthropic_client
+        self.cache_dir = cache_dir or config.DECK_PROFILE_CACHE_DIR
+        self.max_profiles = max_profiles if max_profiles is not None else config.DECK_PROFILE_MEMORY_SIZE
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _request(self, pitch_deck_text: str) -> Dict:
+        """Messages API arguments for digesting a deck."""
+        return {
+            "model": config.ANTHROPIC_MODEL,
+            "max_tokens": config.DECK_DIGEST_MAX_TOKENS,
+            "system": DIGEST_SYSTEM_PROMPT,
+            "messages": [
+                {"role": "user", "content": DIGEST_INSTRUCTIONS + pitch_deck_text[:config.DECK_DIGEST_MAX_INPUT_CHARS]}
+            ],
+        }
+
+    def _cache_path(self, deck_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{deck_hash}.json")
+
+    def _remembered(self, deck_hash: str) -> Optional[str]:
+        """Profile held in memory, if any."""
+        with self._lock:
+            profile = self._profiles.get(deck_hash)
+            if profile is not None:
+                self._profiles.move_to_end(deck_hash)
+            return profile
+
+    def _remember(self, deck_hash: str, profile: str):
+        """Hold a profile in memory, evicting the least recently used beyond max_profiles."""
+        with self._lock:
+            self._profiles[deck_hash] = profile
+            self._profiles.move_to_end(deck_hash)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def _load(self, deck_hash: str) -> Optional[str]:
+        """Read a profile from the disk cache (and remember it)."""
+        cache_path = self._cache_path(deck_hash)
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                profile = json.load(f)["profile"]
+        except (json.JSONDecodeError, KeyError, IOError):
+            return None
+        self._remember(deck_hash, profile)
+        return profile
+
+    def get_cached(self, pitch_deck_text: str) -> Optional[str]:
+        """Return the profile for a deck if it has already been digested."""
+        deck_hash = hash_deck_text(pitch_deck_text)
+        profile = self._remembered(deck_hash)
+        return profile if profile is not None else self._load(deck_hash)
+
+    def _store(self, deck_hash: str, profile: str):
+        """Remember a profile in memory and persist it to disk."""
+        self._remember(deck_hash, profile)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        "deck_hash": deck_hash,
+                        "created_at": datetime.now().isoformat(),
+                        "profile": profile
+                    }, f, ensure_ascii=False)
+                os.replace(tmp_path, self._cache_path(deck_hash))
+            finally:
+                # Only still there if the write or the rename failed
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except IOError as e:
+            print(f"Warning: Could not save pitch deck profile: {str(e)}")
+
+    @staticmethod
+    def _extract_text(message) -> str:
+        return "".join(block.text for block in message.content if block.type == "text").strip()
+
+    def digest(self, pitch_deck_text: str) -> str:
+        """
+        Get the compact profile for a deck, calling Claude only the first time.
+
+        Args:
+            pitch_deck_text: Full extracted deck text
+
+        Returns:
+            Profile text
+
+        Raises:
+            Exception: If the Claude call fails
+        """
+        profile = self.get_cached(pitch_deck_text)
+        if profile is not None:
+            return profile
+
+        print("Digesting pitch deck into a compact profile (one-time per deck)...")
+        message = self.anthropic_client.messages.create(**self._request(pitch_deck_text))
+        profile = self._extract_text(message)
+        self._store(hash_deck_text(pitch_deck_text), profile)
+        return profile
+
+    async def adigest(self, pitch_deck_text: str) -> str:
+        """Async version of digest using the async Anthropic client (disk cache I/O runs in a worker thread)."""
+        deck_hash = hash_deck_text(pitch_deck_text)
+        profile = self._remembered(deck_hash)
+        if profile is None:
+            profile = await asyncio.to_thread(self._load, deck_hash)
+        if profile is not None:
+            return profile
+
+        print("Digesting pitch deck into a compact profile (one-time per deck)...")
+        message = await self.async_anthropic_client.messages.create(**self._request(pitch_deck_text))
+        profile = self._extract_text(message)
+        await asyncio.to_thread(self._store, deck_hash, profile)
+        return profile
@@ -0,0 +1,195 @@
+"""Reverse matching: pitch deck embeddings searched with an investor's profile.
+Decks live in a second Chroma collection next to the investors, embedded with the
+same model, so "which decks fit this investor?" is one index lookup using the
+investor's stored summary embedding rather than a Claude call per deck.
+"""
+import os
+import sys
+import threading
+from typing import Dict, List, Optional
+import config
+from deck_digest import DeckDigester, hash_deck_text
+from embeddings import open_collection
+from pdf_loader import extract_texts_from_pdf_data, list_pitch_decks
+from vector_store import InvestorVectorStore
+
+FOLDER_SOURCE = "folder"
+UPLOAD_SOURCE = "upload"
+
+
+class DeckIndex:
+    """Pitch deck collection searched by investor."""
+
+    def __init__(self, vector_store: InvestorVectorStore, deck_digester: Optional[DeckDigester] = None):
+        """
+        Open (or create) the deck collection in the vector store's database.
+
+        Args:
+            vector_store: Investor vector store; its client and embedding function are shared
+            deck_digester: Used to embed a deck's digested profile when one is already cached
+        """
+        self.vector_store = vector_store
+        self.deck_digester = deck_digester
+        self.collection = open_collection(vector_store.client, "pitch_decks", vector_store.embedding_function)
+        self._lock = threading.Lock()
+
+    def _document(self, pitch_deck_text: str) -> str:
+        """Text embedded for a deck: its digested profile if cached (no Claude call), else its opening."""
+        if self.deck_digester is not None:
+            profile = self.deck_digester.get_cached(pitch_deck_text)
+            if profile:
+                return profile
+        return pitch_deck_text[:config.DECK_INDEX_DOCUMENT_CHARS]
+
+    def add_upload(self, name: str, pitch_deck_text: str) -> str:
+        """
+        Index an uploaded deck (re-uploads of the same deck are stored once).
+
+        Args:
+            name: Uploaded filename
+            pitch_deck_text: Extracted deck text
+
+        Returns:
+            Deck id in the index
+        """
+        deck_id = f"{UPLOAD_SOURCE}:{hash_deck_text(pitch_deck_text)}"
+        with self._lock:
+            document = self._document(pitch_deck_text)
+            self.collection.upsert(
+                ids=[deck_id],
+                documents=[document],
+                embeddings=self.vector_store.embedding_function([document]),
+                metadatas=[{"name": name, "source": UPLOAD_SOURCE}]
+            )
+        return deck_id
+
+    def sync_folder(self, folder_path: str = None) -> Dict[str, int]:
+        """
+        Bring the folder decks in the index in line with the pitch decks folder.
+
+        Files whose size and modification time are unchanged are skipped without
+        being read; new and changed files are extracted in parallel and embedded,
+        and decks whose file is gone are removed.
+
+        Args:
+            folder_path: Path to pitch decks folder. If None, uses config default.
+
+        Returns:
+            Counts of added, updated, removed and unchanged decks
+        """
+        if folder_path is None:
+            folder_path = config.PITCH_DECKS_FOLDER
+
+        with self._lock:
+            existing = self.collection.get(where={"source": FOLDER_SOURCE}, include=["metadatas"])
+            indexed = {deck_id: metadata for deck_id, metadata in zip(existing['ids'], existing['metadatas'])}
+
+            changed = []
+            current_ids = set()
+            for filename in list_pitch_decks(folder_path):
+                deck_id = f"{FOLDER_SOURCE}:{filename}"
+                current_ids.add(deck_id)
+                stat = os.stat(os.path.join(folder_path, filename))
+                metadata = indexed.get(deck_id)
+                unchanged = metadata and (metadata.get("size"), metadata.get("mtime_ns")) == (stat.st_size,
+                                                                                             stat.st_mtime_ns)
+                if unchanged:
+                    continue
+                changed.append((deck_id, filename, stat))
+
+            if changed:
+                pdf_datas = []
+                for _, filename, _ in changed:
+                    with open(os.path.join(folder_path, filename), 'rb') as f:
+                        pdf_datas.append(f.read())
+                texts = extract_texts_from_pdf_data(pdf_datas)
+
+                ids, documents, metadatas = [], [], []
+                for (deck_id, filename, stat), text in zip(changed, texts):
+                    if text is None:
+                        print(f"Skipping {filename}: could not extract text.")
+                        continue
+                    ids.append(deck_id)
+                    documents.append(self._document(text))
+                    metadatas.append({"name": filename, "source": FOLDER_SOURCE,
+                                      "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+                if ids:
+                    self.collection.upsert(ids=ids, documents=documents, metadatas=metadatas,
+                                           embeddings=self.vector_store.embedding_function(documents))
+
+            removed = [deck_id for deck_id in indexed if deck_id not in current_ids]
+            if removed:
+                self.collection.delete(ids=removed)
+
+        stats = {
+            "added": sum(1 for deck_id, _, _ in changed if deck_id not in indexed),
+            "updated": sum(1 for deck_id, _, _ in changed if deck_id in indexed),
+            "removed": len(removed),
+            "unchanged": len(current_ids) - len(changed),
+        }
+        if changed or removed:
+            print(f"✓ Deck index synced: {stats['added']} added, {stats['updated']} updated, "
+                  f"{stats['removed']} removed, {stats['unchanged']} unchanged.")
+        return stats
+
+    def _investor_embedding(self, investor_id: str) -> Optional[List[float]]:
+        """The investor's stored summary embedding (re-embedded only if Chroma lacks it)."""
+        result = self.vector_store.collection.get(ids=[investor_id], include=["embeddings", "documents"])
+        if not result['ids']:
+            return None
+        embeddings = result.get('embeddings')
+        if embeddings is not None and len(embeddings) and embeddings[0] is not None:
+            return [float(x) for x in embeddings[0]]
+        return self.vector_store.embed_query(result['documents'][0])
+
+    def match_investor(self, investor_id: str, n_results: int = 10, source: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Find the pitch decks that best fit an investor.
+
+        Args:
+            investor_id: Investor id (as returned by search / get_full_profile)
+            n_results: Number of decks to return
+            source: Only "folder" or "upload" decks (None = both)
+
+        Returns:
+            Decks ranked by fit, each with id, name, source and a similarity score,
+            or None if the investor is unknown
+        """
+        embedding = self._investor_embedding(investor_id)
+        if embedding is None:
+            return None
+
+        total_count = self.collection.count()
+        if total_count == 0:
+            return []
+        query_args = {
+            "query_embeddings": [embedding],
+            "n_results": min(n_results, total_count),
+            "include": ["metadatas", "distances"],
+        }
+        if source:
+            query_args["where"] = {"source": source}
+        results = self.collection.query(**query_args)
+
+        decks = []
+        for deck_id, metadata, distance in zip(results['ids'][0], results['metadatas'][0], results['distances'][0]):
+            decks.append({
+                "id": deck_id,
+                "name": metadata.get("name"),
+                "source": metadata.get("source"),
+                "score": round(1 - distance, 4),  # cosine similarity
+            })
+        return decks
+
+
+if __name__ == "__main__":
+    # Index the pitch decks folder, then optionally list the best-fit decks for an investor id
+    store = InvestorVectorStore()
+    index = DeckIndex(store)
+    index.sync_folder()
+    if len(sys.argv) > 1:
+        matches = index.match_investor(sys.argv[1])
+        if matches is None:
+            print(f"Unknown investor id: {sys.argv[1]}")
+        for rank, deck in enumerate(matches or [], 1):
+            print(f"  {rank}. {deck['name']} ({deck['source']}, score {deck['score']})")
@@ -1,6 +1,7 @@
 """Diagnostic script to check column names in Excel files."""
 import pandas as pd
 import config
+from excel_cache import read_excel_cached
 
 print("=" * 60)
 print("DIAGNOSING EXCEL FILE COLUMNS")
@@ -12,7 +13,7 @@ print("1. MAIN INVESTOR FILE:")
 print(f"   File: {config.DATA_FILE_PATH}")
 print("-" * 60)
 try:
-    df = pd.read_excel(config.DATA_FILE_PATH)
+    df = read_excel_cached(config.DATA_FILE_PATH)
     print(f"   Columns ({len(df.columns)}):")
     for i, col in enumerate(df.columns, 1):
         print(f"   {i}. {col}")
@@ -30,7 +31,7 @@ print("2. CONTACTS FILE:")
 print(f"   File: {config.CONTACTS_FILE_PATH}")
 print("-" * 60)
 try:
-    df = pd.read_excel(config.CONTACTS_FILE_PATH)
+    df = read_excel_cached(config.CONTACTS_FILE_PATH)
     print(f"   Columns ({len(df.columns)}):")
     for i, col in enumerate(df.columns, 1):
         print(f"   {i}. {col}")
@@ -48,7 +49,7 @@ print("3. PITCHBOOK CONTACTS FILE:")
 print(f"   File: {config.PITCHBOOK_CONTACTS_FILE_PATH}")
 print("-" * 60)
 try:
-    df = pd.read_excel(config.PITCHBOOK_CONTACTS_FILE_PATH)
+    df = read_excel_cached(config.PITCHBOOK_CONTACTS_FILE_PATH)
     print(f"   Columns ({len(df.columns)}):")
     for i, col in enumerate(df.columns, 1):
         print(f"   {i}. {col}")
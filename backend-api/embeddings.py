@@ -0,0 +1,325 @@
+"""Embedding backends, a persistent embedding cache and model-tagged Chroma collections.
+Texts are embedded by a configurable backend (ONNX MiniLM, sentence-transformers or
+hashed term vectors) through a SQLite cache keyed by model and text hash, so rebuilds
+and repeated queries skip the model. Each collection records the model that embedded
+it and is re-embedded when the configured model changes.
+
+Usage:
+    python embeddings.py    # download the configured model ahead of time (e.g. in a Docker build)
+"""
+import hashlib
+import math
+from abc import ABC, abstractmethod
+import os
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import config
+from bm25_index import tokenize
+
+# Model recorded for collections built before the model was tracked (Chroma's default embeddings)
+LEGACY_MODEL_ID = "onnx:all-MiniLM-L6-v2"
+
+# Texts looked up per SQLite query (stays under SQLite's bound parameter limit)
+CACHE_LOOKUP_BATCH = 500
+
+# Name suffix of the collection a re-embed is built in before it replaces the original
+REEMBED_SUFFIX = "__reembed"
+
+
+class EmbeddingBackend(ABC):
+    """A model that turns texts into vectors."""
+
+    # Identifies the model and version; vectors from different ids are not comparable
+    model_id: str = ""
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a float32 array of shape (len(texts), dimensions)."""
+
+    def warm(self):
+        """Load (and download, if needed) the model now rather than on the first call."""
+        self.embed(["warm up"])
+
+
+class OnnxMiniLMBackend(EmbeddingBackend):
+    """all-MiniLM-L6-v2 on ONNX Runtime (Chroma's default model, no PyTorch needed)."""
+
+    model_id = LEGACY_MODEL_ID
+
+    def __init__(self, model_dir: Optional[str] = None):
+        """
+        Args:
+            model_dir: Where the model is downloaded and kept (None = config.ONNX_MODEL_DIR,
+                falling back to Chroma's cache in the home directory)
+        """
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+        self.model = ONNXMiniLM_L6_V2()
+        model_dir = model_dir or config.ONNX_MODEL_DIR
+        if model_dir:
+            # A directory inside the app survives in the image, unlike the home cache of a cold container
+            self.model.DOWNLOAD_PATH = os.path.join(model_dir, ONNXMiniLM_L6_V2.MODEL_NAME)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model(texts), dtype=np.float32)
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Any sentence-transformers model (requires `pip install sentence-transformers`)."""
+
+    def __init__(self, model_name: Optional[str] = None):
+        """
+        Args:
+            model_name: Hugging Face model id (None = config.SENTENCE_TRANSFORMER_MODEL)
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        from sentence_transformers import SentenceTransformer
+        model_name = model_name or config.SENTENCE_TRANSFORMER_MODEL
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.model_id = f"sentence-transformers:{model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, batch_size=config.EMBEDDING_BATCH_SIZE,
+                                            normalize_embeddings=True), dtype=np.float32)
+
+
+class HashedTermBackend(EmbeddingBackend):
+    """
+    Hashed term vectors: no model to download, for tiny deployments.
+
+    Words and word pairs are hashed into a fixed number of signed buckets with
+    sublinear term frequency weights. There is no corpus-wide IDF, so a text's
+    vector never depends on what else is indexed.
+    """
+
+    VERSION = 1
+
+    def __init__(self, dimensions: Optional[int] = None):
+        """
+        Args:
+            dimensions: Vector size (None = config.HASHED_EMBEDDING_DIMENSIONS)
+        """
+        self.dimensions = dimensions or config.HASHED_EMBEDDING_DIMENSIONS
+        self.model_id = f"hashed:{self.dimensions}:v{self.VERSION}"
+
+    def _bucket(self, term: str):
+        digest = zlib.crc32(term.encode("utf-8"))
+        return digest % self.dimensions, 1.0 if digest & 0x80000000 else -1.0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            terms = Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+            for term, count in terms.items():
+                bucket, sign = self._bucket(term)
+                vectors[row, bucket] += sign * (1.0 + math.log(count))
+            norm = np.linalg.norm(vectors[row])
+            if norm > 0:
+                vectors[row] /= norm
+        return vectors
+
+
+EMBEDDING_BACKENDS = {
+    "onnx": OnnxMiniLMBackend,
+    "sentence-transformers": SentenceTransformerBackend,
+    "hashed": HashedTermBackend,
+}
+
+
+def create_backend(name: Optional[str] = None) -> EmbeddingBackend:
+    """
+    Instantiate an embedding backend.
+
+    Args:
+        name: "onnx", "sentence-transformers" or "hashed" (None = config.EMBEDDING_BACKEND)
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    name = name or config.EMBEDDING_BACKEND
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{name}', expected one of {tuple(EMBEDDING_BACKENDS)}")
+    return EMBEDDING_BACKENDS[name]()
+
+
+class EmbeddingCache:
+    """SQLite table of vectors keyed by model id and SHA-256 of the text."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model_id TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model_id, text_hash))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model_id: str, text_hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors by text hash (hashes that are not cached are left out)."""
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(text_hashes), CACHE_LOOKUP_BATCH):
+                batch = text_hashes[i:i + CACHE_LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model_id = ? AND text_hash IN ({placeholders})",
+                    [model_id, *batch]
+                )
+                for text_hash, vector in rows:
+                    found[text_hash] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, model_id: str, vectors: Dict[str, np.ndarray]):
+        """Store vectors by text hash."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model_id, text_hash, vector) VALUES (?, ?, ?)",
+                [(model_id, text_hash, np.asarray(vector, dtype=np.float32).tobytes())
+                 for text_hash, vector in vectors.items()]
+            )
+
+
+class CachedEmbeddingFunction:
+    """
+    Embeds texts with a backend, reusing cached vectors.
+
+    Called like a Chroma embedding function: a list of texts in, a list of
+    vectors out. Duplicate texts in a call are embedded once, and only texts
+    missing from the cache reach the model.
+    """
+
+    def __init__(self, backend: Optional[EmbeddingBackend] = None, cache: Optional[EmbeddingCache] = None):
+        """
+        Args:
+            backend: Embedding backend (None = create_backend())
+            cache: Vector cache (None = config.EMBEDDING_CACHE_PATH, or no cache if that is None)
+        """
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        if cache is None and config.EMBEDDING_CACHE_PATH:
+            cache = EmbeddingCache(config.EMBEDDING_CACHE_PATH)
+        self.cache = cache
+        self.model_id = backend.model_id if backend is not None else self._configured_model_id()
+
+    @staticmethod
+    def _configured_model_id() -> str:
+        """Model id of the configured backend, known without loading the model."""
+        if config.EMBEDDING_BACKEND == "sentence-transformers":
+            return f"sentence-transformers:{config.SENTENCE_TRANSFORMER_MODEL}"
+        if config.EMBEDDING_BACKEND == "hashed":
+            return HashedTermBackend().model_id
+        return OnnxMiniLMBackend.model_id
+
+    @property
+    def backend(self) -> EmbeddingBackend:
+        """The backend, created on the first cache miss so fully cached runs never load the model."""
+        with self._backend_lock:
+            if self._backend is None:
+                self._backend = create_backend()
+            return self._backend
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        texts = list(input)
+        if not texts:
+            return []
+        if self.cache is None:
+            return list(self.backend.embed(texts))
+
+        hashes = [EmbeddingCache.hash_text(text) for text in texts]
+        vectors = self.cache.get_many(self.model_id, list(dict.fromkeys(hashes)))
+        missing = {text_hash: text for text_hash, text in zip(hashes, texts) if text_hash not in vectors}
+        if missing:
+            embedded = self.backend.embed(list(missing.values()))
+            new_vectors = dict(zip(missing, embedded))
+            self.cache.put_many(self.model_id, new_vectors)
+            vectors.update(new_vectors)
+        return [vectors[text_hash] for text_hash in hashes]
+
+
+def open_collection(client, name: str, embedding_function: CachedEmbeddingFunction, batch_size: int = 100):
+    """
+    Get or create a cosine collection whose vectors come from embedding_function.
+
+    The collection's metadata records the model id (collections built before it
+    was recorded count as LEGACY_MODEL_ID). Chroma never embeds on its
+    own (callers pass embeddings), so a collection built by another model is
+    detected here and its stored documents are re-embedded with the current one.
+    The new vectors go into a temporary collection that replaces the old one only
+    once it is complete, so a failed re-embed leaves the old collection in place.
+
+    Args:
+        client: Chroma client
+        name: Collection name
+        embedding_function: The function callers embed documents and queries with
+        batch_size: Records re-embedded per upsert
+
+    Returns:
+        The Chroma collection
+    """
+    model_id = embedding_function.model_id
+    collection = client.get_or_create_collection(
+        name=name,
+        metadata={"hnsw:space": "cosine", "embedding_model": model_id},
+        embedding_function=None
+    )
+    # Untagged collections are left untagged: modify() replaces the whole metadata and
+    # Chroma refuses hnsw:* keys there, so tagging one would drop its hnsw:space
+    stored_model_id = (collection.metadata or {}).get("embedding_model", LEGACY_MODEL_ID)
+    if stored_model_id == model_id:
+        return collection
+
+    existing = collection.get(include=["documents", "metadatas"])
+    print(f"Embedding model changed ({stored_model_id} -> {model_id}); "
+          f"re-embedding {len(existing['ids'])} records in '{name}'...")
+    # The vector size may differ between models, so a new collection is built rather than updated
+    temp_name = f"{name}{REEMBED_SUFFIX}"
+    if temp_name in {c.name for c in client.list_collections()}:
+        client.delete_collection(temp_name)  # left over from an interrupted re-embed
+    rebuilt = client.create_collection(
+        name=temp_name,
+        metadata={"hnsw:space": "cosine", "embedding_model": model_id},
+        embedding_function=None
+    )
+    for i in range(0, len(existing['ids']), batch_size):
+        documents = existing['documents'][i:i + batch_size]
+        rebuilt.upsert(
+            ids=existing['ids'][i:i + batch_size],
+            documents=documents,
+            metadatas=existing['metadatas'][i:i + batch_size],
+            embeddings=embedding_function(documents)
+        )
+    
+    # Swap the complete collection in
+    client.delete_collection(name)
+    rebuilt.modify(name=name)
+    return client.get_collection(name=name, embedding_function=None)
+
+
+if __name__ == "__main__":
+    # Download and load the configured model so the first request does not have to
+    backend = create_backend()
+    backend.warm()
+    print(f"✓ Embedding model ready: {backend.model_id}")
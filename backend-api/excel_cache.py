@@ -0,0 +1,112 @@
+"""On-disk cache of parsed Excel spreadsheets.
+Parsing .xlsx files with openpyxl dominates cold starts, so parsed DataFrames are
+pickled and reused until the source file's path, modification time or size changes.
+"""
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import Optional
+import pandas as pd
+import config
+
+
+def _path_key(file_path: str) -> str:
+    """Stable key for a spreadsheet path."""
+    return hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:16]
+
+
+def _cache_file(file_path: str, cache_dir: str) -> str:
+    """
+    Cache file for the current version of a spreadsheet.
+
+    Raises:
+        FileNotFoundError: If the spreadsheet does not exist
+    """
+    stat = os.stat(file_path)
+    version = hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{_path_key(file_path)}-{version}.pkl")
+
+
+def read_excel_cached(file_path: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read an Excel file, reusing the cached parsed DataFrame when the file is unchanged.
+
+    Args:
+        file_path: Path to the Excel file
+        cache_dir: Directory for cached frames (defaults to config)
+
+    Returns:
+        DataFrame with the first sheet of the file
+
+    Raises:
+        FileNotFoundError: If the Excel file does not exist
+    """
+    if cache_dir is None:
+        cache_dir = config.EXCEL_CACHE_DIR
+
+    cache_file = _cache_file(file_path, cache_dir)
+    if os.path.exists(cache_file):
+        try:
+            return pd.read_pickle(cache_file)
+        except Exception:
+            # Corrupt or incompatible cache entry - re-parse the spreadsheet below
+            pass
+
+    df = pd.read_excel(file_path)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Drop entries for older versions of this file
+        for stale_file in glob.glob(os.path.join(cache_dir, f"{_path_key(file_path)}-*.pkl")):
+            if stale_file != cache_file:
+                os.remove(stale_file)
+        # Write atomically so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, cache_file)
+        finally:
+            # Only still there if pickling or the rename failed
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Warning: Could not cache parsed spreadsheet {file_path}: {str(e)}")
+
+    return df
+
+
+def invalidate_excel_cache(file_path: Optional[str] = None, cache_dir: Optional[str] = None) -> int:
+    """
+    Remove cached frames.
+
+    Args:
+        file_path: Only remove entries for this spreadsheet (None = remove all)
+        cache_dir: Directory for cached frames (defaults to config)
+
+    Returns:
+        Number of cache files removed
+    """
+    if cache_dir is None:
+        cache_dir = config.EXCEL_CACHE_DIR
+
+    pattern = f"{_path_key(file_path)}-*.pkl" if file_path else "*.pkl"
+    removed = 0
+    for cache_file in glob.glob(os.path.join(cache_dir, pattern)):
+        try:
+            os.remove(cache_file)
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "invalidate":
+        count = invalidate_excel_cache(sys.argv[2] if len(sys.argv) > 2 else None)
+        print(f"✓ Removed {count} cached spreadsheet(s).")
+    else:
+        print("Usage: python excel_cache.py invalidate [path/to/file.xlsx]")
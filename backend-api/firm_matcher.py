@@ -0,0 +1,255 @@
+"""Indexed firm-name matching between the investor sheet and the contact files.
+Replaces the linear substring scan over every contact firm with an inverted index.
+Candidates are blocked before scoring (exact word-set lookups, length-sorted word
+postings and prefix-filtered trigram postings), so a lookup only scores the few
+names that can match rather than every name sharing a common word or trigram.
+"""
+import bisect
+import math
+import re
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Generic words that firms append to their name ("Acme Capital Partners, LLC")
+FIRM_NAME_SUFFIXES = {
+    'capital', 'partners', 'partner', 'ventures', 'venture', 'fund', 'funds',
+    'management', 'group', 'holdings', 'investments', 'investment', 'advisors',
+    'advisers', 'associates', 'equity', 'vc', 'llc', 'lp', 'llp', 'inc', 'ltd',
+    'limited', 'co', 'corp', 'corporation', 'company', 'gmbh', 'sa', 'ag', 'plc',
+}
+
+# Queries with up to this many words find the names made of their words by word-set lookups
+MAX_SUBSET_TOKENS = 8
+
+# Whole-word containment counts as a match only when the shorter name keeps this many non-generic words
+MIN_CONTAINED_TOKENS = 2
+
+
+def canonical_firm_name(name: str) -> str:
+    """
+    Normalize a firm name for fuzzy matching.
+
+    Lowercases, replaces '&' with 'and', drops punctuation and strips trailing
+    generic suffixes like "Capital", "Partners" or "LLC" (keeping at least one word).
+
+    Args:
+        name: Firm name to normalize
+
+    Returns:
+        Canonical firm name (may be empty)
+    """
+    if not name:
+        return ""
+    text = str(name).lower().replace('&', ' and ')
+    tokens = re.sub(r"[^\w\s]", " ", text).split()
+    if tokens and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in FIRM_NAME_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Character trigrams of a padded string."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: Set[str], b: Set[str]) -> float:
+    """Dice similarity of two trigram sets."""
+    return 2.0 * len(a & b) / (len(a) + len(b)) if a or b else 1.0
+
+
+class FirmNameIndex:
+    """Word and trigram inverted index over firm names, returning the best fuzzy match."""
+
+    def __init__(self, firm_names: Iterable[str] = (), min_similarity: float = 0.6):
+        """
+        Build the index.
+
+        Args:
+            firm_names: Firm names (e.g. the normalized keys of contacts_by_firm)
+            min_similarity: Minimum trigram Dice similarity for a fuzzy match. Whole-word
+                containment of one name in the other is accepted when the shorter
+                name has at least MIN_CONTAINED_TOKENS distinctive words; otherwise
+                the words the names do not share must also be this similar
+                ("founders factory" is not "founders fund")
+        """
+        self.min_similarity = min_similarity
+        self._names: List[str] = []
+        self._words: List[List[str]] = []
+        self._tokens: List[Set[str]] = []
+        self._trigrams: List[Set[str]] = []
+        self._exact: Dict[str, int] = {}
+        self._by_canonical: Dict[str, int] = {}
+        self._by_token_set: Dict[FrozenSet[str], List[int]] = defaultdict(list)
+        # Word postings sorted by (trigram count, id), so the shortest names containing a word come first
+        self._token_postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._trigram_postings: Dict[str, List[int]] = defaultdict(list)
+
+        for name in firm_names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str):
+        """Add a firm name to the index (duplicates are ignored)."""
+        if not name or name in self._exact:
+            return
+        name_id = len(self._names)
+        canonical = canonical_firm_name(name)
+        words = canonical.split()
+        tokens = set(words)
+        trigrams = _trigrams(canonical) if canonical else set()
+
+        self._names.append(name)
+        self._words.append(words)
+        self._tokens.append(tokens)
+        self._trigrams.append(trigrams)
+        self._exact[name] = name_id
+        if canonical:
+            self._by_canonical.setdefault(canonical, name_id)
+            self._by_token_set[frozenset(tokens)].append(name_id)
+        for token in tokens:
+            bisect.insort(self._token_postings[token], (len(trigrams), name_id))
+        for trigram in trigrams:
+            self._trigram_postings[trigram].append(name_id)
+
+    def match(self, name: str) -> Optional[str]:
+        """
+        Find the indexed firm name that best matches a name.
+
+        Tries an exact match, then an exact canonical match, then names whose
+        words contain or are contained in the query's, and finally (for typos)
+        names sharing enough character trigrams.
+
+        Args:
+            name: Firm name to look up
+
+        Returns:
+            The matching indexed firm name, or None if nothing is similar enough
+        """
+        if not name:
+            return None
+        if name in self._exact:
+            return name
+
+        canonical = canonical_firm_name(name)
+        if not canonical:
+            return None
+        if canonical in self._by_canonical:
+            return self._names[self._by_canonical[canonical]]
+
+        query_words = canonical.split()
+        query_tokens = set(query_words)
+        query_trigrams = _trigrams(canonical)
+
+        # Whole-word containment outranks any plain character overlap
+        best_id, best_score = self._best_candidate(
+            self._contained_names(query_tokens), query_words, query_tokens, query_trigrams)
+        best_id, best_score = self._best_containing(query_words, query_tokens, query_trigrams, best_id, best_score)
+        if best_id is None:
+            # Typo fallback: names with enough character trigrams in common
+            best_id, _ = self._best_candidate(
+                self._trigram_candidates(query_trigrams), query_words, query_tokens, query_trigrams)
+        return self._names[best_id] if best_id is not None else None
+
+    def _contained_names(self, query_tokens: Set[str]) -> List[int]:
+        """Names made only of words of the query ("acme" for "acme growth")."""
+        if len(query_tokens) > MAX_SUBSET_TOKENS:
+            return [name_id for name_id in self._posted_ids(query_tokens) if self._tokens[name_id] <= query_tokens]
+        ordered = sorted(query_tokens)
+        candidates = []
+        for size in range(1, len(ordered) + 1):
+            for subset in combinations(ordered, size):
+                candidates.extend(self._by_token_set.get(frozenset(subset), ()))
+        return candidates
+
+    def _posted_ids(self, tokens: Set[str]) -> Set[int]:
+        return {name_id for token in tokens for _, name_id in self._token_postings.get(token, ())}
+
+    def _best_containing(self, query_words: List[str], query_tokens: Set[str], query_trigrams: Set[str],
+                         best_id: Optional[int], best_score: float) -> Tuple[Optional[int], float]:
+        """
+        Improve on best_id with names containing every word of the query ("acme growth" for "acme").
+
+        Walks the postings of the query's rarest word from the shortest name up and
+        stops once no longer name could score higher.
+        """
+        postings = [self._token_postings.get(token) for token in query_tokens]
+        if not all(postings):
+            return best_id, best_score
+        query_size = len(query_trigrams)
+        for size, name_id in min(postings, key=len):
+            # Dice similarity is at most 2 * |query| / (|query| + |name|) once the name is the longer one
+            if size >= query_size and 1.0 + 2.0 * query_size / (query_size + size) < best_score:
+                break
+            if query_tokens <= self._tokens[name_id]:
+                best_id, best_score = self._better(
+                    name_id, query_words, query_tokens, query_trigrams, best_id, best_score)
+        return best_id, best_score
+
+    def _trigram_candidates(self, query_trigrams: Set[str]) -> Set[int]:
+        """
+        Names that can reach min_similarity, found through the query's rarest trigrams.
+
+        A name within the length bounds of the threshold must share at least
+        min_overlap trigrams with the query, so it shares one of any
+        len(query) - min_overlap + 1 of them (prefix filtering). A name that
+        shares too few of those prefix trigrams to reach the overlap its own
+        length needs is dropped before scoring.
+        """
+        similarity = self.min_similarity
+        query_size = len(query_trigrams)
+        if similarity > 0:
+            min_size = query_size * similarity / (2 - similarity)
+            max_size = query_size * (2 - similarity) / similarity
+            min_overlap = max(1, math.ceil(min_size - 1e-9))
+        else:
+            min_size, max_size, min_overlap = 0, float('inf'), 1
+        ordered = sorted(query_trigrams, key=lambda trigram: len(self._trigram_postings.get(trigram, ())))
+        prefix_size = max(0, query_size - min_overlap + 1)
+        hits: Dict[int, int] = defaultdict(int)
+        for trigram in ordered[:prefix_size]:
+            for name_id in self._trigram_postings.get(trigram, ()):
+                hits[name_id] += 1
+        # At most query_size - prefix_size more shared trigrams can come from outside the prefix
+        unseen = query_size - prefix_size
+        candidates = set()
+        for name_id, count in hits.items():
+            size = len(self._trigrams[name_id])
+            if min_size <= size <= max_size and count + unseen >= similarity * (query_size + size) / 2 - 1e-9:
+                candidates.add(name_id)
+        return candidates
+
+    def _better(self, name_id: int, query_words: List[str], query_tokens: Set[str], query_trigrams: Set[str],
+                best_id: Optional[int], best_score: float) -> Tuple[Optional[int], float]:
+        """The better of name_id and the current best (higher similarity, lowest id on ties)."""
+        trigrams = self._trigrams[name_id]
+        dice = _dice(query_trigrams, trigrams)
+        tokens = self._tokens[name_id]
+        smaller = tokens if len(tokens) <= len(query_tokens) else query_tokens
+        contained = (query_tokens <= tokens or tokens <= query_tokens) and \
+            len(smaller - FIRM_NAME_SUFFIXES) >= MIN_CONTAINED_TOKENS
+        if not contained:
+            if dice < self.min_similarity:
+                return best_id, best_score
+            # The words only one side has must be alike too ("round" vs nothing is a different firm)
+            query_rest = "".join(word for word in query_words if word not in tokens)
+            name_rest = "".join(word for word in self._words[name_id] if word not in query_tokens)
+            if (query_rest or name_rest) and _dice(_trigrams(query_rest), _trigrams(name_rest)) < self.min_similarity:
+                return best_id, best_score
+        score = dice + (1.0 if contained else 0.0)
+        if best_id is None or score > best_score or (score == best_score and name_id < best_id):
+            return name_id, score
+        return best_id, best_score
+
+    def _best_candidate(self, candidates: Iterable[int], query_words: List[str], query_tokens: Set[str],
+                        query_trigrams: Set[str]) -> Tuple[Optional[int], float]:
+        """Pick the acceptable candidate with the highest similarity (lowest id on ties)."""
+        best_id, best_score = None, 0.0
+        for name_id in candidates:
+            best_id, best_score = self._better(name_id, query_words, query_tokens, query_trigrams, best_id, best_score)
+        return best_id, best_score
@@ -0,0 +1,408 @@
+"""Normalized filter fields for investors and constraint parsing for queries.
+Profiles get boolean stage/geography/type flags and numeric check size bounds at
+ingestion; queries (and pitch decks) are parsed into the same vocabulary and turned
+into a Chroma `where` clause, so hard constraints are applied inside the index.
+"""
+import operator
+import re
+from typing import Dict, List, Optional, Tuple
+import config
+
+# Bump when the fields below change so existing databases get their metadata refreshed
+FILTER_VERSION = 1
+
+# Check size bound used for open-ended ranges ("$10M+") and unknown sizes
+UNBOUNDED_CHECK_USD = 1e12
+
+STAGE_PATTERNS = {
+    "pre_seed": [r"\bpre[\s-]?seed\b"],
+    "seed": [r"\bseed\b"],
+    "series_a": [r"\bseries\s*a\b"],
+    "series_b": [r"\bseries\s*b\b"],
+    "growth": [r"\bseries\s*[c-h]\b", r"\bgrowth\b", r"\blate[\s-]?stage\b", r"\bexpansion\b", r"\bpre[\s-]?ipo\b"],
+}
+# In free text "growth" and "expansion" usually describe the business, not the round
+STRICT_GROWTH_PATTERNS = [r"\bseries\s*[c-h]\b", r"\bgrowth[\s-]?(stage|equity|rounds?)\b",
+                          r"\blate[\s-]?stage\b", r"\bpre[\s-]?ipo\b"]
+# Broad stage terms that cover several stages
+STAGE_ALIASES = {
+    r"\bearly[\s-]?stage\b": ["pre_seed", "seed", "series_a"],
+    r"\bmulti[\s-]?stage\b": list(STAGE_PATTERNS),
+    r"\bstage[\s-]?agnostic\b": list(STAGE_PATTERNS),
+}
+
+GEOGRAPHY_PATTERNS = {
+    "us": [r"\bunited states\b", r"\bnorth america\b", r"\bnew york\b", r"\bnyc\b", r"\bsan francisco\b",
+           r"\bbay area\b", r"\bsilicon valley\b", r"\bboston\b", r"\bcalifornia\b", r"\btexas\b",
+           r"\bchicago\b", r"\blos angeles\b", r"\bseattle\b", r"\baustin\b", r"\bmiami\b"],
+    "canada": [r"\bcanada\b", r"\btoronto\b", r"\bvancouver\b", r"\bmontreal\b"],
+    "europe": [r"\beurope\b", r"\beuropean\b", r"\bu\.?k\.?\b", r"\bunited kingdom\b", r"\blondon\b",
+               r"\bgermany\b", r"\bberlin\b", r"\bfrance\b", r"\bparis\b", r"\bnordics?\b", r"\bemea\b"],
+    "asia": [r"\basia\b", r"\bapac\b", r"\bindia\b", r"\bchina\b", r"\bsingapore\b", r"\bjapan\b",
+             r"\bsoutheast asia\b", r"\bkorea\b"],
+    "latam": [r"\blatin america\b", r"\blatam\b", r"\bbrazil\b", r"\bmexico\b"],
+    "middle_east": [r"\bmiddle east\b", r"\bmena\b", r"\bisrael\b", r"\buae\b", r"\bdubai\b"],
+    "africa": [r"\bafrica\b", r"\bnigeria\b", r"\bkenya\b"],
+}
+# Upper-case abbreviations that would collide with ordinary words ("us") if matched case-insensitively
+GEOGRAPHY_CASE_SENSITIVE_PATTERNS = {
+    "us": [r"\bU\.?S\.?A?\b"],
+}
+GLOBAL_GEOGRAPHY_PATTERN = r"\b(global|globally|worldwide|international|anywhere)\b"
+
+INVESTOR_TYPE_PATTERNS = {
+    "vc": [r"\bvc\b", r"\bvcs\b", r"\bventure\b"],
+    "angel": [r"\bangels?\b"],
+    "corporate": [r"\bcorporate\b", r"\bcvc\b", r"\bstrategic\b"],
+    "family_office": [r"\bfamily offices?\b"],
+    "private_equity": [r"\bprivate equity\b", r"\bpe firms?\b", r"\bbuyout\b"],
+    "accelerator": [r"\baccelerators?\b", r"\bincubators?\b"],
+}
+
+# The lookbehind skips digits joined to letters ("B2B", "Series B2", "US$") and decimal tails
+AMOUNT_PATTERN = re.compile(
+    r"(?<![\w.])(\$)?\s*(\d+(?:,\d{3})*(?:\.\d+)?)\s*(k|m|mm|b|bn|thousand|million|billion)?\b(\+)?",
+    re.IGNORECASE
+)
+AMOUNT_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+}
+RAISE_CONTEXT_PATTERN = re.compile(r"\b(rais(e|es|ed|ing)|rounds?|funding|seeking)\b", re.IGNORECASE)
+CHECK_CONTEXT_PATTERN = re.compile(r"\b(checks?|cheques?|tickets?|writ(e|es|ing)|invest(s|ing)?|deploy(s|ing)?)\b",
+                                   re.IGNORECASE)
+# An amount only counts as a check or raise size when that wording is within this many words of it
+AMOUNT_CONTEXT_WORDS = 4
+
+
+def _matching_keys(text: str, patterns: Dict[str, List[str]], flags: int = re.IGNORECASE) -> List[str]:
+    return [key for key, key_patterns in patterns.items()
+            if any(re.search(pattern, text, flags) for pattern in key_patterns)]
+
+
+def parse_stages(text: str, strict: bool = False) -> List[str]:
+    """
+    Canonical stages mentioned in text (pre_seed, seed, series_a, series_b, growth).
+
+    Args:
+        text: Profile field, query or deck text
+        strict: Require stage wording for growth ("growth stage", "Series C"), for free text
+    """
+    if not text:
+        return []
+    # "pre-seed" also contains "seed"; only count seed when it appears on its own
+    without_pre_seed = re.sub(STAGE_PATTERNS["pre_seed"][0], " ", text, flags=re.IGNORECASE)
+    stages = set()
+    for stage, patterns in STAGE_PATTERNS.items():
+        searched = without_pre_seed if stage == "seed" else text
+        if strict and stage == "growth":
+            patterns = STRICT_GROWTH_PATTERNS
+        if any(re.search(pattern, searched, re.IGNORECASE) for pattern in patterns):
+            stages.add(stage)
+    for pattern, alias_stages in STAGE_ALIASES.items():
+        if re.search(pattern, text, re.IGNORECASE):
+            stages.update(alias_stages)
+    return [stage for stage in STAGE_PATTERNS if stage in stages]
+
+
+def parse_geographies(text: str) -> Tuple[List[str], bool]:
+    """
+    Regions mentioned in text.
+
+    Returns:
+        Tuple of (regions, whether the text says global/worldwide)
+    """
+    if not text:
+        return [], False
+    regions = set(_matching_keys(text, GEOGRAPHY_PATTERNS))
+    regions.update(_matching_keys(text, GEOGRAPHY_CASE_SENSITIVE_PATTERNS, flags=0))
+    is_global = bool(re.search(GLOBAL_GEOGRAPHY_PATTERN, text, re.IGNORECASE))
+    return [region for region in GEOGRAPHY_PATTERNS if region in regions], is_global
+
+
+def parse_investor_types(text: str) -> List[str]:
+    """Canonical investor types mentioned in text."""
+    if not text:
+        return []
+    return _matching_keys(text, INVESTOR_TYPE_PATTERNS)
+
+
+def _parse_amount_match(match: re.Match) -> Optional[Tuple[float, bool]]:
+    """(amount in USD, open-ended) for an AMOUNT_PATTERN match, or None for a bare number."""
+    dollar, number, suffix, plus = match.groups()
+    if not dollar and not suffix:
+        return None
+    value = float(number.replace(",", ""))
+    if suffix:
+        value *= AMOUNT_MULTIPLIERS[suffix.lower()]
+    return value, bool(plus)
+
+
+def parse_amounts(text: str) -> List[Tuple[float, bool]]:
+    """
+    Dollar amounts in text.
+
+    Only numbers with a currency sign or a magnitude suffix count ("$500k", "2M",
+    "$1,000,000"), so years and counts are ignored.
+
+    Returns:
+        List of (amount in USD, whether it is open-ended like "$10M+")
+    """
+    if not text:
+        return []
+    amounts = []
+    for match in AMOUNT_PATTERN.finditer(text):
+        amount = _parse_amount_match(match)
+        if amount is not None:
+            amounts.append(amount)
+    return amounts
+
+
+def parse_check_range(check_size=None, minimum=None, maximum=None) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Check size bounds in USD from the profile's Check Size / Minimum / Maximum Investment fields.
+
+    Returns:
+        Tuple of (minimum, maximum); None where the data says nothing
+    """
+    low = high = None
+    amounts = parse_amounts(str(check_size)) if check_size is not None else []
+    if amounts:
+        values = [value for value, _ in amounts]
+        low = min(values)
+        high = UNBOUNDED_CHECK_USD if any(open_ended for _, open_ended in amounts) else max(values)
+
+    for raw, is_minimum in ((minimum, True), (maximum, False)):
+        if raw is None:
+            continue
+        if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+            values = [float(raw)] if raw == raw else []  # skip NaN
+        else:
+            values = [value for value, _ in parse_amounts(str(raw))]
+        if values:
+            if is_minimum:
+                low = min(values)
+            else:
+                high = max(values)
+    return low, high
+
+
+def profile_filter_fields(metadata: Dict) -> Dict:
+    """
+    Normalized, Chroma-filterable fields for an investor profile.
+
+    Every flag is always present (True/False) so that upserts overwrite stale
+    values; the *_unknown flags keep investors with missing data eligible when
+    a query filters on that dimension.
+    """
+    fields = {"filter_version": FILTER_VERSION}
+
+    stages = parse_stages(str(metadata.get("Stage") or ""))
+    for stage in STAGE_PATTERNS:
+        fields[f"stage_{stage}"] = stage in stages
+    fields["stage_unknown"] = not stages
+
+    regions, is_global = parse_geographies(str(metadata.get("Geographic Focus") or ""))
+    for region in GEOGRAPHY_PATTERNS:
+        fields[f"geo_{region}"] = region in regions
+    fields["geo_global"] = is_global
+    fields["geo_unknown"] = not regions and not is_global
+
+    investor_types = parse_investor_types(
+        " ".join(str(metadata.get(field) or "") for field in ("Investor Type", "Fund Type"))
+    )
+    for investor_type in INVESTOR_TYPE_PATTERNS:
+        fields[f"type_{investor_type}"] = investor_type in investor_types
+    fields["type_unknown"] = not investor_types
+
+    low, high = parse_check_range(
+        metadata.get("Check Size"), metadata.get("Minimum Investment"), metadata.get("Maximum Investment")
+    )
+    fields["check_min_usd"] = float(low) if low is not None else 0.0
+    fields["check_max_usd"] = float(high) if high is not None else UNBOUNDED_CHECK_USD
+    return fields
+
+
+class QueryConstraints:
+    """Hard constraints extracted from a query and pitch deck."""
+
+    __slots__ = ("stages", "regions", "investor_types", "check_size_usd", "raise_size_usd")
+
+    def __init__(self, stages: List[str] = None, regions: List[str] = None, investor_types: List[str] = None,
+                 check_size_usd: Optional[float] = None, raise_size_usd: Optional[float] = None):
+        self.stages = stages or []
+        self.regions = regions or []
+        self.investor_types = investor_types or []
+        self.check_size_usd = check_size_usd
+        self.raise_size_usd = raise_size_usd
+
+    def is_empty(self) -> bool:
+        return not (self.stages or self.regions or self.investor_types
+                    or self.check_size_usd is not None or self.raise_size_usd is not None)
+
+    def __repr__(self) -> str:
+        return (f"QueryConstraints(stages={self.stages}, regions={self.regions}, "
+                f"investor_types={self.investor_types}, check_size_usd={self.check_size_usd}, "
+                f"raise_size_usd={self.raise_size_usd})")
+
+
+def _amount_context(text: str, match: re.Match) -> Optional[str]:
+    """
+    "check" or "raise" when check or raise wording sits next to an amount, else None.
+
+    Amounts without such wording ("10M ARR", "$5B market") are not constraints.
+    Check wording wins when both appear.
+    """
+    before = text[:match.start()].split()[-AMOUNT_CONTEXT_WORDS:]
+    after = text[match.end():].split()[:AMOUNT_CONTEXT_WORDS]
+    window = " ".join(before + after)
+    if CHECK_CONTEXT_PATTERN.search(window):
+        return "check"
+    if RAISE_CONTEXT_PATTERN.search(window):
+        return "raise"
+    return None
+
+
+def parse_sized_amounts(text: str) -> List[Tuple[float, str]]:
+    """
+    Dollar amounts in text that sit next to check or raise wording.
+
+    Returns:
+        List of (amount in USD, "check" or "raise")
+    """
+    if not text:
+        return []
+    amounts = []
+    for match in AMOUNT_PATTERN.finditer(text):
+        amount = _parse_amount_match(match)
+        if amount is None:
+            continue
+        context = _amount_context(text, match)
+        if context:
+            amounts.append((amount[0], context))
+    return amounts
+
+
+def _deck_raise_size(pitch_deck_text: str) -> Optional[float]:
+    """Amount the deck says it is raising, if stated next to raise/round wording."""
+    for amount, context in parse_sized_amounts(pitch_deck_text):
+        if context == "raise":
+            return amount
+    return None
+
+
+def parse_query_constraints(query: str, pitch_deck_text: Optional[str] = None) -> QueryConstraints:
+    """
+    Extract stage, geography, investor type and check/raise size constraints.
+
+    The query wins; the pitch deck only fills in the stage (when it names exactly
+    one) and the raise size, since decks also mention markets, competitors and
+    future rounds that are not constraints.
+
+    Args:
+        query: User query
+        pitch_deck_text: Pitch deck text or digested profile (optional)
+
+    Returns:
+        QueryConstraints
+    """
+    regions, _ = parse_geographies(query)
+    constraints = QueryConstraints(
+        stages=parse_stages(query, strict=True),
+        regions=regions,
+        investor_types=parse_investor_types(query),
+    )
+
+    amounts = parse_sized_amounts(query)
+    if amounts:
+        amount, context = amounts[0]
+        if context == "raise":
+            constraints.raise_size_usd = amount
+        else:
+            constraints.check_size_usd = amount
+
+    if pitch_deck_text:
+        if not constraints.stages:
+            deck_stages = parse_stages(pitch_deck_text, strict=True)
+            if len(deck_stages) == 1:
+                constraints.stages = deck_stages
+        if constraints.check_size_usd is None and constraints.raise_size_usd is None:
+            constraints.raise_size_usd = _deck_raise_size(pitch_deck_text)
+
+    return constraints
+
+
+def build_where_filter(constraints: QueryConstraints) -> Optional[Dict]:
+    """
+    Chroma `where` clause for constraints (None when there is nothing to filter on).
+
+    Investors whose data does not cover a dimension (*_unknown) are kept.
+    """
+    clauses = []
+    if constraints.stages:
+        clauses.append({"$or": [{f"stage_{stage}": True} for stage in constraints.stages]
+                        + [{"stage_unknown": True}]})
+    if constraints.regions:
+        clauses.append({"$or": [{f"geo_{region}": True} for region in constraints.regions]
+                        + [{"geo_global": True}, {"geo_unknown": True}]})
+    if constraints.investor_types:
+        clauses.append({"$or": [{f"type_{investor_type}": True} for investor_type in constraints.investor_types]
+                        + [{"type_unknown": True}]})
+    if constraints.check_size_usd is not None:
+        tolerance = config.CHECK_SIZE_TOLERANCE
+        clauses.append({"check_min_usd": {"$lte": constraints.check_size_usd * tolerance}})
+        clauses.append({"check_max_usd": {"$gte": constraints.check_size_usd / tolerance}})
+    if constraints.raise_size_usd is not None:
+        # An investor whose minimum check exceeds the whole round is not a fit
+        clauses.append({"check_min_usd": {"$lte": constraints.raise_size_usd}})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+# Chroma comparison operators, for evaluating where clauses in memory (a missing field never matches)
+WHERE_OPERATORS = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+}
+
+
+def matches_where(metadata: Dict, where: Optional[Dict]) -> bool:
+    """
+    Whether metadata passes a Chroma `where` clause, evaluated in memory.
+
+    Lets many filters (e.g. one per deck in a batch) be applied to shared search
+    results instead of sending one Chroma query per filter.
+
+    Args:
+        metadata: A record's metadata
+        where: Clause as built by build_where_filter (None = matches everything)
+    """
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        else:
+            value = metadata.get(key)
+            if value is None:
+                return False
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            if not all(WHERE_OPERATORS[op](value, operand) for op, operand in condition.items()):
+                return False
+    return True
@@ -0,0 +1,208 @@
+"""Posting-list index for the keyword scorer behind SimpleInvestorSearch.
+Scores exactly like data_loader.search_investors, but the profiles are lowercased and
+tokenized once, so a query only visits the profiles whose text contains its words.
+"""
+import heapq
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import config
+from bm25_index import build_postings, tokenize
+
+# Points per query word found in these metadata fields (same weights as search_investors)
+FIELD_WEIGHTS = {
+    "Account Name": 20,
+    "Investor Focus Area": 25,
+    "Investor Type": 20,
+    "Fund Type": 15,
+}
+PHRASE_SCORE = 200
+ALL_WORDS_SCORE = 150
+WORD_OCCURRENCE_SCORE = 15
+ACCOUNT_NAME_PHRASE_SCORE = 50
+
+# search_investors counts substrings of the raw text, so tokens are whitespace-delimited and stopwords kept
+WHITESPACE_TOKEN_PATTERN = re.compile(r"\S+")
+# Longest n-grams in the vocabulary map; longer words are looked up by intersecting their n-grams
+NGRAM_SIZE = 3
+
+
+class _SubstringPostings:
+    """
+    Whitespace-token postings over one text field of every profile.
+
+    A query word never contains whitespace, so each of its occurrences in a text
+    lies inside a single whitespace-delimited token: summing over the vocabulary
+    tokens that contain the word gives exactly `text.count(word)`. The tokens
+    containing a word are found through an n-gram map of the vocabulary, so a
+    lookup only touches tokens sharing the word's rarest n-grams.
+    """
+
+    def __init__(self, texts: Iterable[Optional[str]]):
+        self.postings = build_postings(
+            Counter(tokenize(text, WHITESPACE_TOKEN_PATTERN, frozenset())) if text is not None else {}
+            for text in texts
+        )
+        self.vocabulary = list(self.postings)
+        # 1- to NGRAM_SIZE-grams of every vocabulary token -> indexes of the tokens containing them
+        grams: Dict[str, Set[int]] = defaultdict(set)
+        for token_index, token in enumerate(self.vocabulary):
+            for n in range(1, NGRAM_SIZE + 1):
+                for start in range(len(token) - n + 1):
+                    grams[token[start:start + n]].add(token_index)
+        self.grams: Dict[str, FrozenSet[int]] = {gram: frozenset(ids) for gram, ids in grams.items()}
+        # Common query words recur across queries; their (read-only) results are reused
+        self.tokens_containing = lru_cache(maxsize=4096)(self._tokens_containing)
+        self.counts = lru_cache(maxsize=256)(self._counts)
+        self.docs_containing = lru_cache(maxsize=256)(self._docs_containing)
+
+    def _tokens_containing(self, word: str) -> Tuple[str, ...]:
+        """Vocabulary tokens containing word, in vocabulary order."""
+        if len(word) <= NGRAM_SIZE:
+            return tuple(self.vocabulary[i] for i in sorted(self.grams.get(word, ())))
+        # A token containing the word contains all of its n-grams; intersect from the rarest
+        word_grams = {word[start:start + NGRAM_SIZE] for start in range(len(word) - NGRAM_SIZE + 1)}
+        gram_tokens = sorted((self.grams.get(gram, frozenset()) for gram in word_grams), key=len)
+        candidates = set(gram_tokens[0]).intersection(*gram_tokens[1:])
+        return tuple(self.vocabulary[i] for i in sorted(candidates) if word in self.vocabulary[i])
+
+    def _counts(self, word: str) -> Dict[int, int]:
+        """Occurrences of word (as a substring) per document containing it."""
+        counts: Dict[int, int] = defaultdict(int)
+        for token in self.tokens_containing(word):
+            occurrences = token.count(word)
+            for doc_index, tf in self.postings[token]:
+                counts[doc_index] += tf * occurrences
+        return dict(counts)
+
+    def _docs_containing(self, word: str) -> FrozenSet[int]:
+        """Documents containing word as a substring."""
+        docs = set()
+        for token in self.tokens_containing(word):
+            docs.update(doc_index for doc_index, _ in self.postings[token])
+        return frozenset(docs)
+
+    def phrase_candidates(self, phrase: str) -> Set[int]:
+        """Documents containing every whitespace-separated part of phrase (a superset of phrase matches)."""
+        candidates: Optional[Set[int]] = None
+        for part in set(phrase.split()):
+            docs = self.docs_containing(part)
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return set()
+        return candidates or set()
+
+
+class KeywordIndex:
+    """Index over investor profiles answering search_investors-style keyword queries."""
+
+    def __init__(self, profiles: List[Dict[str, any]]):
+        """
+        Lowercase and index every profile's text and weighted metadata fields.
+
+        Args:
+            profiles: List of investor profile dictionaries
+        """
+        self.profiles = profiles
+        self._texts = [profile["text"].lower() for profile in profiles]
+        self._text_postings = _SubstringPostings(self._texts)
+
+        # Lowercased field values (None where the profile lacks the field)
+        self._field_values: Dict[str, List[Optional[str]]] = {}
+        self._field_postings: Dict[str, _SubstringPostings] = {}
+        for field in FIELD_WEIGHTS:
+            values = [
+                str(profile.get("metadata", {})[field]).lower() if field in profile.get("metadata", {}) else None
+                for profile in profiles
+            ]
+            self._field_values[field] = values
+            self._field_postings[field] = _SubstringPostings(values)
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def _phrase_matches(self, phrase: str, values: List[Optional[str]], postings: _SubstringPostings) -> List[int]:
+        if not phrase:
+            return [doc_index for doc_index, value in enumerate(values) if value is not None]
+        return [doc_index for doc_index in postings.phrase_candidates(phrase) if phrase in values[doc_index]]
+
+    def score(self, query: str) -> Dict[int, int]:
+        """
+        Keyword score per profile index, for profiles scoring above zero.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            Dictionary of profile index to score
+        """
+        query_lower = query.lower().strip()
+        query_words = [w.strip() for w in query_lower.split() if len(w.strip()) > 2]
+        scores: Dict[int, int] = defaultdict(int)
+
+        # 1. Exact phrase match
+        for doc_index in self._phrase_matches(query_lower, self._texts, self._text_postings):
+            scores[doc_index] += PHRASE_SCORE
+
+        # 2./3. All query words present, and occurrences of each word
+        word_counts = {word: self._text_postings.counts(word) for word in set(query_words)}
+        if query_words:
+            # Intersect starting from the rarest word
+            word_docs = sorted((counts.keys() for counts in word_counts.values()), key=len)
+            docs_with_all = set(word_docs[0])
+            for docs in word_docs[1:]:
+                docs_with_all.intersection_update(docs)
+            for doc_index in docs_with_all:
+                scores[doc_index] += ALL_WORDS_SCORE
+        for word in query_words:
+            for doc_index, count in word_counts[word].items():
+                scores[doc_index] += count * WORD_OCCURRENCE_SCORE
+
+        # 4. Weighted metadata fields
+        for doc_index in self._phrase_matches(query_lower, self._field_values["Account Name"],
+                                              self._field_postings["Account Name"]):
+            scores[doc_index] += ACCOUNT_NAME_PHRASE_SCORE
+        for field, weight in FIELD_WEIGHTS.items():
+            field_docs = {word: self._field_postings[field].docs_containing(word) for word in set(query_words)}
+            for word in query_words:
+                for doc_index in field_docs[word]:
+                    scores[doc_index] += weight
+
+        return scores
+
+    def search(self, query: str, max_results: int = None) -> List[Dict[str, any]]:
+        """
+        Top matching profiles, ranked and tie-broken exactly like search_investors.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return (None = uses config default)
+
+        Returns:
+            List of top matching investor profiles
+        """
+        if max_results is None:
+            max_results = config.MAX_INVESTORS_TO_CLAUDE
+
+        print(f"Searching ALL {len(self.profiles)} investors in database...")
+        scores = self.score(query)
+
+        # Highest score first, original order among ties; zero-score profiles fill any remaining slots
+        ranked = heapq.nsmallest(max(max_results, 5), scores.items(), key=lambda item: (-item[1], item[0]))
+        top_indices = [doc_index for doc_index, _ in ranked[:max_results]]
+        top_scores = [score for _, score in ranked[:5]]
+        if len(top_indices) < max_results or len(top_scores) < 5:
+            zero_indices = (doc_index for doc_index in range(len(self.profiles)) if doc_index not in scores)
+            for doc_index in zero_indices:
+                if len(top_indices) >= max_results and len(top_scores) >= 5:
+                    break
+                if len(top_indices) < max_results:
+                    top_indices.append(doc_index)
+                if len(top_scores) < 5:
+                    top_scores.append(0)
+
+        top_matches = [self.profiles[doc_index] for doc_index in top_indices]
+        print(f"Found {len(scores)} investors with keyword matches.")
+        print(f"Returning top {len(top_matches)} most relevant investors (top scores: {top_scores})")
+        return top_matches
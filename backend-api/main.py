@@ -2,7 +2,7 @@
 import sys
 from rag_pipeline import InvestorRAGPipeline
 from pdf_loader import list_pitch_decks, load_pitch_deck
-from results_saver import save_query_result
+from results_saver import close_results_writer, get_results_writer
 
 
 def select_pitch_deck(rag_pipeline: InvestorRAGPipeline):
@@ -74,6 +74,9 @@ def main():
         # Initialize recommendation pipeline (loads data automatically)
         rag_pipeline = InvestorRAGPipeline()
         
+        # Results are saved in the background so the next prompt isn't held up by disk I/O
+        results_writer = get_results_writer()
+        
         # Select pitch deck before starting queries
         current_pitch_deck = select_pitch_deck(rag_pipeline)
         
@@ -107,8 +110,8 @@ def main():
                 
                 # Save query result
                 try:
-                    json_file, markdown_file = save_query_result(query, response, current_pitch_deck)
-                    print(f"✓ Query result saved to JSON and markdown files.")
+                    markdown_file = results_writer.submit(query, response, current_pitch_deck)
+                    print(f"✓ Query result queued for saving to JSON and markdown files.")
                     print(f"  Markdown: {markdown_file}\n")
                 except Exception as save_error:
                     print(f"Warning: Could not save result: {str(save_error)}\n")
@@ -128,6 +131,10 @@ def main():
     except Exception as e:
         print(f"Fatal error: {str(e)}")
         sys.exit(1)
+    
+    finally:
+        # Write any results still queued before exiting
+        close_results_writer()
 
 
 if __name__ == "__main__":
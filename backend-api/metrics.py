@@ -0,0 +1,133 @@
+"""Process-wide latency histograms and token counters in Prometheus text format.
+Each stage of a recommendation (embedding, ANN query, prompt assembly, the Claude
+call, result persistence, ...) is timed into one labelled histogram, so /metrics
+shows where request latency goes.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one label dimension."""
+
+    def __init__(self, name: str, help_text: str, label_name: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[str, Tuple[List[int], List[float]]] = {}  # label -> (bucket counts, [sum, count])
+        self._lock = threading.Lock()
+
+    def observe(self, label: str, value: float):
+        """Record one observation."""
+        with self._lock:
+            counts, totals = self._series.setdefault(label, ([0] * len(self.buckets), [0.0, 0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label in sorted(self._series):
+                counts, (total, count) = self._series[label]
+                label_pair = f'{self.label_name}="{_escape_label(label)}"'
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{label_pair},le="{_format_value(bound)}"}} {bucket_count}')
+                lines.append(f"{self.name}_sum{{{label_pair}}} {total!r}")
+                lines.append(f"{self.name}_count{{{label_pair}}} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with one label dimension."""
+
+    def __init__(self, name: str, help_text: str, label_name: str):
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label: str, amount: float = 1):
+        """Increase the counter for a label."""
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label in sorted(self._values):
+                lines.append(f'{self.name}{{{self.label_name}="{_escape_label(label)}"}} {_format_value(self._values[label])}')
+        return lines
+
+
+STAGE_DURATION = Histogram(
+    "dealfit_stage_duration_seconds",
+    "Time spent in each recommendation stage.",
+    "stage"
+)
+LLM_TOKENS = Counter(
+    "dealfit_llm_tokens_total",
+    "Anthropic tokens used, by type (input, output, cache_read, cache_creation).",
+    "type"
+)
+RECOMMENDATIONS = Counter(
+    "dealfit_recommendations_total",
+    "Recommendations served, by outcome (claude, cache_hit, no_investors, error).",
+    "outcome"
+)
+_METRICS = (STAGE_DURATION, LLM_TOKENS, RECOMMENDATIONS)
+
+
+def observe_stage(stage: str, seconds: float):
+    """Record the duration of a stage that was timed by the caller."""
+    STAGE_DURATION.observe(stage, seconds)
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """Time the enclosed block into the stage duration histogram (also when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.observe(stage, time.perf_counter() - start)
+
+
+def record_token_usage(usage):
+    """Add the token counts of an Anthropic response's usage to the counters."""
+    if usage is None:
+        return
+    LLM_TOKENS.inc("input", getattr(usage, "input_tokens", None) or 0)
+    LLM_TOKENS.inc("output", getattr(usage, "output_tokens", None) or 0)
+    LLM_TOKENS.inc("cache_read", getattr(usage, "cache_read_input_tokens", None) or 0)
+    LLM_TOKENS.inc("cache_creation", getattr(usage, "cache_creation_input_tokens", None) or 0)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -1,9 +1,28 @@
 """Load and extract text from PDF pitch decks."""
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import PyPDF2
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple, Union
 import config
 
+# Raw PDF contents: in-memory bytes or a seekable binary file (e.g. an upload's buffer)
+PdfData = Union[bytes, bytearray, memoryview, BinaryIO]
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+# Bytes in the text cache directory (None until first measured)
+_text_cache_bytes: Optional[int] = None
+_text_cache_lock = threading.Lock()
+
 
 def list_pitch_decks(folder_path: str = None) -> List[str]:
     """
@@ -25,6 +44,299 @@ def list_pitch_decks(folder_path: str = None) -> List[str]:
     return sorted(pdf_files)
 
 
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> List[Tuple[int, str]]:
+    """
+    Extract the text of pages [start, stop) of a PDF.
+    
+    Runs in pool worker processes, so it takes the raw bytes and parses them itself.
+    
+    Args:
+        pdf_bytes: Raw PDF file contents
+        start: First page index
+        stop: Page index to stop before
+        
+    Returns:
+        List of (page index, text) for pages with text
+    """
+    return _extract_reader_pages(PyPDF2.PdfReader(io.BytesIO(pdf_bytes)), start, stop)
+
+
+def _extract_reader_pages(pdf_reader: PyPDF2.PdfReader, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Text of pages [start, stop) of an open PDF, skipping unreadable and empty pages."""
+    pages = []
+    for page_num in range(start, stop):
+        try:
+            page_text = pdf_reader.pages[page_num].extract_text()
+            if page_text.strip():
+                pages.append((page_num, page_text))
+        except Exception as e:
+            # Skip pages that can't be read
+            continue
+    return pages
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Shared process pool for page extraction, started on first use.
+    
+    Workers are started with forkserver (spawn where that is unavailable) rather than
+    fork, so they never inherit the server's threads, locks or open clients.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _process_pool = ProcessPoolExecutor(max_workers=config.PDF_EXTRACT_WORKERS,
+                                                mp_context=multiprocessing.get_context(start_method))
+        return _process_pool
+
+
+def _reset_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+
+
+def _pdf_reader(pdf_data: PdfData) -> PyPDF2.PdfReader:
+    if isinstance(pdf_data, (bytes, bytearray, memoryview)):
+        return PyPDF2.PdfReader(io.BytesIO(pdf_data))
+    pdf_data.seek(0)
+    return PyPDF2.PdfReader(pdf_data)
+
+
+def _as_bytes(pdf_data: PdfData) -> bytes:
+    """The contents as bytes, for shipping to worker processes."""
+    if isinstance(pdf_data, bytes):
+        return pdf_data
+    if isinstance(pdf_data, (bytearray, memoryview)):
+        return bytes(pdf_data)
+    pdf_data.seek(0)
+    return pdf_data.read()
+
+
+def _hash_pdf(pdf_data: PdfData) -> str:
+    """SHA-256 of the PDF contents, reading files in chunks rather than copying them."""
+    if isinstance(pdf_data, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(pdf_data).hexdigest()
+    digest = hashlib.sha256()
+    pdf_data.seek(0)
+    for chunk in iter(lambda: pdf_data.read(1024 * 1024), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _extract_pages(pdf_data: PdfData) -> List[Tuple[int, str]]:
+    """Extract all pages, fanning large PDFs out over the process pool."""
+    pdf_reader = _pdf_reader(pdf_data)
+    page_count = len(pdf_reader.pages)
+    workers = min(config.PDF_EXTRACT_WORKERS, page_count)
+    if page_count < config.PDF_PARALLEL_MIN_PAGES or workers < 2:
+        return _extract_reader_pages(pdf_reader, 0, page_count)
+    
+    # One contiguous page range per worker: each worker re-parses the PDF once
+    pdf_bytes = _as_bytes(pdf_data)
+    chunk_size = -(-page_count // workers)
+    ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+    try:
+        pool = _get_process_pool()
+        futures = [pool.submit(_extract_page_range, pdf_bytes, start, stop) for start, stop in ranges]
+        return [page for future in futures for page in future.result()]
+    except (BrokenProcessPool, OSError) as e:
+        # No usable worker processes (e.g. a sandbox without fork); extract in-process
+        print(f"Warning: Parallel PDF extraction unavailable ({str(e)}); extracting serially.")
+        _reset_process_pool()
+        return _extract_reader_pages(pdf_reader, 0, page_count)
+
+
+def _join_pages(pages: List[Tuple[int, str]]) -> str:
+    return "\n\n".join(f"--- Page {page_num + 1} ---\n{page_text}" for page_num, page_text in pages)
+
+
+def _text_cache_path(pdf_hash: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or config.PDF_TEXT_CACHE_DIR, f"{pdf_hash}.json")
+
+
+def _load_cached_text(pdf_hash: str) -> Optional[str]:
+    """Previously extracted text for a PDF, if cached."""
+    cache_path = _text_cache_path(pdf_hash)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            text = json.load(f)["text"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, IOError):
+        return None
+    try:
+        # Mark the entry as recently used so eviction removes it last
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return text
+
+
+def _cached_text_entries() -> List[Tuple[float, int, str]]:
+    """(last used, size, path) of every file in the text cache."""
+    entries = []
+    try:
+        with os.scandir(config.PDF_TEXT_CACHE_DIR) as scan:
+            for entry in scan:
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def _evict_cached_texts(added_bytes: int):
+    """
+    Keep the text cache under PDF_TEXT_CACHE_MAX_BYTES.
+    
+    A running total is kept per process; once it passes the limit the directory is
+    rescanned (other processes may share it) and the least recently used entries
+    are deleted until the cache is back under 90% of the limit.
+    """
+    global _text_cache_bytes
+    limit = config.PDF_TEXT_CACHE_MAX_BYTES
+    if not limit:
+        return
+    with _text_cache_lock:
+        if _text_cache_bytes is None:
+            _text_cache_bytes = sum(size for _, size, _ in _cached_text_entries())
+        else:
+            _text_cache_bytes += added_bytes
+        if _text_cache_bytes <= limit:
+            return
+        
+        entries = sorted(_cached_text_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= limit * 0.9:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        _text_cache_bytes = total
+
+
+def _store_cached_text(pdf_hash: str, text: str):
+    """Persist extracted text atomically, keyed by the PDF's content hash."""
+    try:
+        os.makedirs(config.PDF_TEXT_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=config.PDF_TEXT_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"pdf_sha256": pdf_hash, "text": text}, f, ensure_ascii=False)
+                size = f.tell()
+            os.replace(tmp_path, _text_cache_path(pdf_hash))
+        finally:
+            # Only still there if the write or the rename failed
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except IOError as e:
+        print(f"Warning: Could not cache extracted PDF text: {str(e)}")
+        return
+    _evict_cached_texts(size)
+
+
+def extract_text_from_pdf_data(pdf_data: PdfData) -> str:
+    """
+    Extract text content from PDF contents held in memory or an open file.
+    
+    Text is cached on disk by the SHA-256 of the contents, so the same deck is only
+    ever parsed once, whatever its filename or however often it is uploaded.
+    
+    Args:
+        pdf_data: PDF bytes, or a seekable binary file positioned anywhere
+        
+    Returns:
+        Extracted text content
+        
+    Raises:
+        Exception: If the PDF cannot be parsed
+    """
+    pdf_hash = _hash_pdf(pdf_data)
+    text = _load_cached_text(pdf_hash)
+    if text is not None:
+        return text
+    
+    pages = _extract_pages(pdf_data)
+    text = _join_pages(pages)
+    _store_cached_text(pdf_hash, text)
+    return text
+
+
+def _extract_all_pages(pdf_bytes: bytes) -> List[Tuple[int, str]]:
+    """Extract every page of a PDF (runs in pool worker processes)."""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    return _extract_reader_pages(pdf_reader, 0, len(pdf_reader.pages))
+
+
+def _extract_all_pages_in_process(pdf_data: PdfData) -> List[Tuple[int, str]]:
+    """Extract every page in this process, reading files in place rather than copying them."""
+    pdf_reader = _pdf_reader(pdf_data)
+    return _extract_reader_pages(pdf_reader, 0, len(pdf_reader.pages))
+
+
+def extract_texts_from_pdf_data(pdf_datas: List[PdfData]) -> List[Optional[str]]:
+    """
+    Extract text from many PDFs, one deck per pool worker process.
+    
+    Cached decks are returned without parsing. The rest are read and submitted one
+    at a time with at most 2 * PDF_EXTRACT_WORKERS decks in flight, so only those
+    decks' bytes are held in memory at once (serially when only one worker is configured).
+    
+    Args:
+        pdf_datas: PDF contents, as accepted by extract_text_from_pdf_data
+        
+    Returns:
+        Extracted text per PDF, in order (None where the PDF could not be read)
+    """
+    texts: List[Optional[str]] = [None] * len(pdf_datas)
+    parallel = len(pdf_datas) > 1 and config.PDF_EXTRACT_WORKERS > 1
+    in_flight = deque()  # (index, pdf hash, future or None to extract in-process)
+    
+    def finish(i, pdf_hash, future):
+        try:
+            try:
+                pages = future.result() if future is not None else _extract_all_pages_in_process(pdf_datas[i])
+            except BrokenProcessPool:
+                _reset_process_pool()
+                pages = _extract_all_pages_in_process(pdf_datas[i])
+        except Exception as e:
+            print(f"Warning: Could not read PDF {i + 1}: {str(e)}")
+            return
+        texts[i] = _join_pages(pages)
+        _store_cached_text(pdf_hash, texts[i])
+    
+    for i, pdf_data in enumerate(pdf_datas):
+        pdf_hash = _hash_pdf(pdf_data)
+        texts[i] = _load_cached_text(pdf_hash)
+        if texts[i] is not None:
+            continue
+        
+        future = None
+        if parallel:
+            try:
+                future = _get_process_pool().submit(_extract_all_pages, _as_bytes(pdf_data))
+            except (BrokenProcessPool, OSError) as e:
+                print(f"Warning: Parallel PDF extraction unavailable ({str(e)}); extracting serially.")
+                _reset_process_pool()
+                parallel = False
+        in_flight.append((i, pdf_hash, future))
+        while in_flight and (in_flight[0][2] is None or len(in_flight) >= 2 * config.PDF_EXTRACT_WORKERS):
+            finish(*in_flight.popleft())
+    
+    while in_flight:
+        finish(*in_flight.popleft())
+    return texts
+
+
 def extract_text_from_pdf(pdf_path: str) -> str:
     """
     Extract text content from a PDF file.
@@ -37,19 +349,7 @@ def extract_text_from_pdf(pdf_path: str) -> str:
     """
     try:
         with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text_parts = []
-            
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text.strip():
-                        text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                except Exception as e:
-                    # Skip pages that can't be read
-                    continue
-            
-            return "\n\n".join(text_parts)
+            return extract_text_from_pdf_data(file)
     
     except FileNotFoundError:
         raise FileNotFoundError(f"PDF file not found at {pdf_path}")
@@ -0,0 +1,144 @@
+"""Compact on-disk store of full investor profiles, keyed by investor id.
+The vector store keeps only embeddings and a few filterable scalar fields in Chroma;
+search results are joined against this table for the full profile text and metadata.
+"""
+import json
+import os
+import sqlite3
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class InvestorRecord(Mapping):
+    """
+    Read-only investor profile that decodes its metadata JSON on first access.
+
+    Behaves like the {'id', 'text', 'metadata'} dicts returned by data_loader,
+    so callers do not need to know whether a profile came from the store.
+    """
+
+    __slots__ = ("id", "text", "_json_data", "_metadata")
+    _KEYS = ("id", "text", "metadata")
+
+    def __init__(self, investor_id: str, text: str, json_data: str):
+        self.id = investor_id
+        self.text = text
+        self._json_data = json_data
+        self._metadata: Optional[Dict] = None
+
+    @property
+    def metadata(self) -> Dict:
+        if self._metadata is None:
+            self._metadata = json.loads(self._json_data)
+        return self._metadata
+
+    def __getitem__(self, key: str):
+        if key == "id":
+            return self.id
+        if key == "text":
+            return self.text
+        if key == "metadata":
+            return self.metadata
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"InvestorRecord(id={self.id!r})"
+
+    def to_dict(self) -> Dict:
+        """Plain dict copy of the profile."""
+        return {"id": self.id, "text": self.text, "metadata": self.metadata}
+
+
+class ProfileStore:
+    """SQLite table of investor profiles (text + metadata JSON) with content hashes."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                "investor_id TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                "json_data TEXT NOT NULL, content_hash TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def count(self) -> int:
+        """Number of stored profiles."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def hashes(self) -> Dict[str, str]:
+        """Content hash of every stored profile, by investor id."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT investor_id, content_hash FROM profiles"))
+
+    def upsert_many(self, rows: Iterable[Tuple[str, str, str, str]]):
+        """
+        Insert or replace profiles.
+
+        Args:
+            rows: (investor_id, text, json_data, content_hash) tuples
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO profiles (investor_id, text, json_data, content_hash) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def delete_many(self, investor_ids: List[str]):
+        """Remove profiles by id."""
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM profiles WHERE investor_id = ?", [(i,) for i in investor_ids])
+
+    def get_many(self, investor_ids: List[str]) -> Dict[str, InvestorRecord]:
+        """
+        Fetch profiles by id.
+
+        Args:
+            investor_ids: Investor ids to fetch
+
+        Returns:
+            Records by investor id (unknown ids are omitted)
+        """
+        if not investor_ids:
+            return {}
+        records = {}
+        batch_size = 500  # stay under SQLite's bound-parameter limit
+        with self._connect() as conn:
+            for i in range(0, len(investor_ids), batch_size):
+                batch = investor_ids[i:i + batch_size]
+                placeholders = ",".join("?" * len(batch))
+                for investor_id, text, json_data in conn.execute(
+                    f"SELECT investor_id, text, json_data FROM profiles WHERE investor_id IN ({placeholders})",
+                    batch
+                ):
+                    records[investor_id] = InvestorRecord(investor_id, text, json_data)
+        return records
+
+    def all_records(self) -> List[InvestorRecord]:
+        """Every stored profile."""
+        with self._connect() as conn:
+            return [InvestorRecord(investor_id, text, json_data) for investor_id, text, json_data in
+                    conn.execute("SELECT investor_id, text, json_data FROM profiles ORDER BY investor_id")]
+
+    def get(self, investor_id: str) -> Optional[InvestorRecord]:
+        """Fetch a single profile, or None if unknown."""
+        return self.get_many([investor_id]).get(investor_id)
@@ -1,27 +1,90 @@
 """Efficient recommendation pipeline using vector search + Claude API."""
-from anthropic import Anthropic
-from typing import List, Dict, Optional
+import asyncio
+import time
+from anthropic import Anthropic, AsyncAnthropic
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
 import config
+import metrics
+from deck_chunks import DeckChunkEmbedder
+from deck_digest import DeckDigester
+from investor_filters import build_where_filter, parse_query_constraints
+from reranker import Reranker
+from response_cache import ResponseCache
 from vector_store import InvestorVectorStore  # NEW: Use vector store instead
 
 
+SYSTEM_PROMPT = """You are a helpful assistant that recommends investors based on user queries and pitch deck analysis. 
+Analyze the provided pitch deck (if available) and investor information to provide clear, concise recommendations. 
+When a pitch deck is provided, carefully analyze the business, industry, stage, funding needs, and other relevant details.
+Match investors based on their focus areas, investment criteria, check sizes, and portfolio alignment with the pitch deck.
+Focus on explaining why each investor is a good match based on both the pitch deck content and the user's requirements.
+
+You have access to a comprehensive database of investors. Carefully analyze ALL provided investors to identify the best matches.
+Rank them by relevance and explain the reasoning. Only recommend investors that are truly good matches - quality over quantity.
+
+CRITICAL: For each recommended investor, you MUST include the contact information from the "CONTACT INFORMATION (from Contact Files)" section. 
+This includes:
+- Contact person's Name
+- Email address
+- Background/Role information
+This contact information is extracted from the Investor DATA - Contacts (DFD) and Investor DATA - Pitchbook Contacts files 
+and is essential for the user to reach out to the investors. Always display this contact information prominently for each recommended investor."""
+
+RESPONSE_INSTRUCTIONS = """
+Please provide:
+1. A brief analysis of the pitch deck (if provided) and user's requirements
+2. Recommended investors ranked by relevance
+3. Explanation of why each investor is a good match based on the pitch deck and requirements
+4. Key details about each recommended investor
+5. For EACH recommended investor, you MUST include the contact information from the "CONTACT INFORMATION (from Contact Files)" section:
+   - Contact person's Name
+   - Email address  
+   - Background/Role information
+   Format this contact information clearly and prominently. If contact information is not available for an investor, state that clearly."""
+
+RETRIEVAL_MODES = ("hybrid", "vector", "keyword")
+
+PROMPT_INTRO = "Based on the following query, recommend the most relevant investors from the provided list."
+
+NO_INVESTORS_MESSAGE = "No relevant investors found in the database for your query. Please try different keywords or criteria."
+
+
 class InvestorRAGPipeline:
     """Efficient pipeline using vector search + Claude."""
     
-    def __init__(self, vector_store: InvestorVectorStore = None):
+    def __init__(self, vector_store: InvestorVectorStore = None, retrieval_mode: str = None):
         """
         Initialize the recommendation pipeline.
         
         Args:
             vector_store: Vector store instance (creates new one if None)
+            retrieval_mode: "hybrid", "vector" or "keyword" (None = config.RETRIEVAL_MODE)
         """
+        self.retrieval_mode = retrieval_mode or config.RETRIEVAL_MODE
+        if self.retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{self.retrieval_mode}', expected one of {RETRIEVAL_MODES}")
+        if not config.ANTHROPIC_API_KEY:
+            raise ValueError("ANTHROPIC_API_KEY not found in environment variables. Please set it in .env file.")
         self.anthropic_client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
+        self.async_anthropic_client = AsyncAnthropic(api_key=config.ANTHROPIC_API_KEY)
         self.vector_store = vector_store or InvestorVectorStore()
+        if self.retrieval_mode != "vector":
+            self.vector_store.keyword_index()  # build the BM25 index now rather than on the first query
         self.current_pitch_deck: Optional[str] = None
+        self.deck_digester = DeckDigester(self.anthropic_client, self.async_anthropic_client)
+        self.deck_chunks = DeckChunkEmbedder(self.vector_store.embedding_function)
+        self.reranker = Reranker(self.vector_store._create_concise_summary)
+        self.response_cache = ResponseCache(
+            similarity_threshold=config.RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+            embed_query=self.vector_store.embed_query
+        )
     
     def set_pitch_deck(self, pitch_deck_text: Optional[str]):
         """
-        Set the current pitch deck content to analyze.
+        Set the default pitch deck content to analyze (used by the CLI).
+        
+        Concurrent callers (the API) should pass pitch_deck_text to
+        generate_recommendation instead of mutating this shared state.
         
         Args:
             pitch_deck_text: Text content of the pitch deck, or None to clear
@@ -86,94 +149,448 @@ class InvestorRAGPipeline:
         
         return "\n".join(context_parts)
     
-    def generate_recommendation(self, query: str, max_results: int = None) -> str:
+    @staticmethod
+    def _text_block(text: str, cache: bool = False) -> Dict[str, Any]:
+        """Messages API text block, marked as a prompt cache breakpoint when requested."""
+        block = {"type": "text", "text": text}
+        if cache and config.PROMPT_CACHING_ENABLED:
+            block["cache_control"] = {"type": "ephemeral"}
+        return block
+    
+    def _build_prompts(self, query: str, investors: List[Dict], pitch_deck_text: Optional[str] = None,
+                       deck_profile: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
         """
-        Generate investor recommendation using vector search + Claude.
+        Build the system and user prompt blocks for Claude.
+        
+        The static system prompt and the pitch deck come first, and the end of the
+        deck block is marked as a cache breakpoint, so follow-up queries about the
+        same deck reuse that prefix from Anthropic's prompt cache. Only the query and
+        its investors change per request. Anthropic ignores breakpoints on prefixes
+        under PROMPT_CACHE_MIN_TOKENS, so queries without a deck (whose only stable
+        prefix is the short system prompt) and short deck profiles are not marked.
         
         Args:
             query: User query
-            max_results: Maximum number of investors to send to Claude (None = uses config default)
+            investors: Investors retrieved for the query
+            pitch_deck_text: Pitch deck to analyze (None = no pitch deck)
+            deck_profile: Digested profile of the deck, sent instead of the full text when given
             
         Returns:
-            Recommendation response from Claude
+            Tuple of (system blocks, user content blocks)
+        """
+        system_blocks = [self._text_block(SYSTEM_PROMPT)]
+        
+        # Create concise context (reduces token usage by ~80%)
+        context = self._create_concise_context(investors)
+        
+        # Deck prefix: identical for every query about the same deck
+        user_blocks = []
+        deck_block = None
+        if deck_profile:
+            deck_block = f"{PROMPT_INTRO}\n\nPitch Deck Profile (summarized from the full deck):\n{deck_profile}\n"
+        elif pitch_deck_text:
+            deck_block = f"{PROMPT_INTRO}\n\nPitch Deck Content:\n{pitch_deck_text}\n"
+        if deck_block:
+            prefix_tokens = (len(SYSTEM_PROMPT) + len(deck_block)) / config.PROMPT_CHARS_PER_TOKEN
+            user_blocks.append(self._text_block(deck_block, cache=prefix_tokens >= config.PROMPT_CACHE_MIN_TOKENS))
+        
+        # Per-query part, never cached
+        query_parts = [] if user_blocks else [PROMPT_INTRO]
+        query_parts.append(f"\nUser Query: {query}")
+        query_parts.append(f"\nRelevant Investors:\n{context}")
+        query_parts.append(RESPONSE_INSTRUCTIONS)
+        user_blocks.append(self._text_block("\n".join(query_parts)))
+        
+        return system_blocks, user_blocks
+    
+    def _request(self, system_blocks: List[Dict], user_blocks: List[Dict]) -> Dict[str, Any]:
+        """Messages API arguments for a recommendation."""
+        return {
+            "model": config.ANTHROPIC_MODEL,
+            "max_tokens": 2000,
+            "system": system_blocks,
+            "messages": [
+                {"role": "user", "content": user_blocks}
+            ],
+        }
+    
+    @staticmethod
+    def _log_usage(message):
+        """Print token usage, including prompt cache reads and writes."""
+        usage = getattr(message, "usage", None)
+        if usage is None:
+            return
+        metrics.record_token_usage(usage)
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        print(f"Tokens - input: {usage.input_tokens}, output: {usage.output_tokens}, "
+              f"cache read: {cache_read}, cache write: {cache_write}")
+    
+    @staticmethod
+    def _extract_text(message) -> str:
+        """Concatenate the text blocks of a Claude response."""
+        response_text = ""
+        for content_block in message.content:
+            if content_block.type == "text":
+                response_text += content_block.text
+        return response_text
+    
+    @staticmethod
+    def _where_filter(query: str, pitch_deck_text: Optional[str]) -> Optional[Dict]:
+        """Hard constraints (stage, geography, investor type, check size) to filter on inside the index."""
+        if not config.METADATA_FILTERING_ENABLED:
+            return None
+        constraints = parse_query_constraints(query, pitch_deck_text)
+        where = build_where_filter(constraints)
+        if where:
+            print(f"Filtering on {constraints}")
+        return where
+    
+    @staticmethod
+    def _candidate_count(max_results: int) -> int:
+        """Investors to retrieve for max_results: a wider set when it is reranked afterwards."""
+        if config.RERANK_ENABLED:
+            return max(config.RERANK_CANDIDATES, max_results)
+        return max_results
+    
+    def _rerank(self, query: str, investors: List[Dict], max_results: int,
+                pitch_deck_text: Optional[str] = None) -> List[Dict]:
+        """Keep the best max_results of the retrieved candidates (see reranker.Reranker)."""
+        if not config.RERANK_ENABLED:
+            return investors[:max_results]
+        with metrics.time_stage("rerank"):
+            return self.reranker.rerank(query, investors, max_results, pitch_deck_text)
+    
+    def _retrieve(self, query: str, max_results: int = None,
+                  pitch_deck_text: Optional[str] = None) -> Tuple[List[Dict], Optional[List[float]]]:
+        """
+        Find the most relevant investors for a query.
+        
+        Args:
+            query: User query
+            max_results: Maximum number of investors to return (None = uses config default)
+            pitch_deck_text: Pitch deck, used to fill in stage/raise constraints the query leaves out
+            
+        Returns:
+            Tuple of (investors, query embedding or None when paraphrase caching is off)
         """
         # Use config default if not specified (now reduced to 10)
         if max_results is None:
             max_results = config.MAX_INVESTORS_TO_CLAUDE
         
-        print(f"\nSearching investor database using semantic search...")
+        print(f"\nSearching investor database using {self.retrieval_mode} search...")
         print(f"Query: '{query}'")
         
-        # Vector search finds most relevant investors (semantic matching)
-        investors = self.vector_store.search(query, n_results=max_results)
+        # Embed once and reuse it for the search and the paraphrase cache lookup (keyword search needs neither;
+        # the response cache then matches exact queries only)
+        query_embedding = None
+        if self.response_cache.embed_query is not None and self.retrieval_mode != "keyword":
+            with metrics.time_stage("embedding"):
+                query_embedding = self.response_cache.embed_query(query)
         
-        print(f"Found {len(investors)} most relevant investors. Sending to Claude for analysis...\n")
+        where = self._where_filter(query, pitch_deck_text)
         
-        if not investors:
-            return "No relevant investors found in the database for your query. Please try different keywords or criteria."
+        # The deck's chunks steer the vector search toward investors that fit what the deck describes
+        deck_embeddings = None
+        if config.DECK_AWARE_RETRIEVAL and pitch_deck_text and self.retrieval_mode != "keyword":
+            with metrics.time_stage("deck_chunk_embedding"):
+                deck_embeddings = self.deck_chunks.embed(pitch_deck_text)
         
-        # Create concise context (reduces token usage by ~80%)
-        context = self._create_concise_context(investors)
+        # Vector search finds semantic matches, BM25 exact names and terms; hybrid fuses both
+        candidate_count = self._candidate_count(max_results)
+        if self.retrieval_mode == "keyword":
+            investors = self.vector_store.keyword_search(query, n_results=candidate_count, where=where)
+        elif self.retrieval_mode == "vector":
+            investors = self.vector_store.search(query, n_results=candidate_count, query_embedding=query_embedding,
+                                                 where=where, deck_embeddings=deck_embeddings)
+        else:
+            investors = self.vector_store.hybrid_search(query, n_results=candidate_count,
+                                                        query_embedding=query_embedding,
+                                                        where=where, deck_embeddings=deck_embeddings)
         
-        # Create prompt for Claude
-        system_prompt = """You are a helpful assistant that recommends investors based on user queries and pitch deck analysis. 
-Analyze the provided pitch deck (if available) and investor information to provide clear, concise recommendations. 
-When a pitch deck is provided, carefully analyze the business, industry, stage, funding needs, and other relevant details.
-Match investors based on their focus areas, investment criteria, check sizes, and portfolio alignment with the pitch deck.
-Focus on explaining why each investor is a good match based on both the pitch deck content and the user's requirements.
-
-You have access to a comprehensive database of investors. Carefully analyze ALL provided investors to identify the best matches.
-Rank them by relevance and explain the reasoning. Only recommend investors that are truly good matches - quality over quantity.
-
-CRITICAL: For each recommended investor, you MUST include the contact information from the "CONTACT INFORMATION (from Contact Files)" section. 
-This includes:
-- Contact person's Name
-- Email address
-- Background/Role information
-This contact information is extracted from the Investor DATA - Contacts (DFD) and Investor DATA - Pitchbook Contacts files 
-and is essential for the user to reach out to the investors. Always display this contact information prominently for each recommended investor."""
-
-        # Build user prompt with pitch deck if available
-        user_prompt_parts = ["Based on the following query, recommend the most relevant investors from the provided list."]
+        # Structured fit (stage, geography, check size, focus) picks the few Claude sees
+        investors = self._rerank(query, investors, max_results, pitch_deck_text)
         
-        if self.current_pitch_deck:
-            user_prompt_parts.append(f"\nPitch Deck Content:\n{self.current_pitch_deck}\n")
+        print(f"Found {len(investors)} most relevant investors. Sending to Claude for analysis...\n")
+        return investors, query_embedding
+    
+    def _cache_key(self, query: str, investors: List[Dict], pitch_deck_text: Optional[str], include_full_deck: bool):
+        """Response cache key for a query, its retrieved investors and the deck."""
+        return ResponseCache.make_key(
+            query, pitch_deck_text, [investor['id'] for investor in investors],
+            variant="full-deck" if include_full_deck else ""
+        )
+    
+    def _deck_profile(self, pitch_deck_text: Optional[str], include_full_deck: bool) -> Optional[str]:
+        """Digested deck profile to send instead of the full text (None = send the full text)."""
+        if not pitch_deck_text or include_full_deck:
+            return None
+        try:
+            return self.deck_digester.digest(pitch_deck_text)
+        except Exception as e:
+            print(f"Warning: Could not digest pitch deck, sending full text: {str(e)}")
+            return None
+    
+    async def _adeck_profile(self, pitch_deck_text: Optional[str], include_full_deck: bool) -> Optional[str]:
+        """Async version of _deck_profile."""
+        if not pitch_deck_text or include_full_deck:
+            return None
+        try:
+            return await self.deck_digester.adigest(pitch_deck_text)
+        except Exception as e:
+            print(f"Warning: Could not digest pitch deck, sending full text: {str(e)}")
+            return None
+    
+    def generate_recommendation(self, query: str, max_results: int = None,
+                                pitch_deck_text: Optional[str] = None,
+                                include_full_deck: Optional[bool] = None) -> str:
+        """
+        Generate investor recommendation using vector search + Claude.
         
-        user_prompt_parts.append(f"\nUser Query: {query}")
-        user_prompt_parts.append(f"\nRelevant Investors:\n{context}")
-        user_prompt_parts.append("""
-Please provide:
-1. A brief analysis of the pitch deck (if provided) and user's requirements
-2. Recommended investors ranked by relevance
-3. Explanation of why each investor is a good match based on the pitch deck and requirements
-4. Key details about each recommended investor
-5. For EACH recommended investor, you MUST include the contact information from the "CONTACT INFORMATION (from Contact Files)" section:
-   - Contact person's Name
-   - Email address  
-   - Background/Role information
-   Format this contact information clearly and prominently. If contact information is not available for an investor, state that clearly.""")
+        Args:
+            query: User query
+            max_results: Maximum number of investors to send to Claude (None = uses config default)
+            pitch_deck_text: Pitch deck to analyze for this request (None = the deck set via set_pitch_deck)
+            include_full_deck: Send the raw deck text instead of its digested profile
+                (None = config.SEND_FULL_PITCH_DECK)
+            
+        Returns:
+            Recommendation response from Claude
+        """
+        if pitch_deck_text is None:
+            pitch_deck_text = self.current_pitch_deck
+        if include_full_deck is None:
+            include_full_deck = config.SEND_FULL_PITCH_DECK
+        
+        investors, query_embedding = self._retrieve(query, max_results, pitch_deck_text)
+        if not investors:
+            metrics.RECOMMENDATIONS.inc("no_investors")
+            return NO_INVESTORS_MESSAGE
+        
+        cache_key = self._cache_key(query, investors, pitch_deck_text, include_full_deck)
+        cached_response = self.response_cache.get(cache_key, query_embedding)
+        if cached_response is not None:
+            print("✓ Returning cached recommendation.\n")
+            metrics.RECOMMENDATIONS.inc("cache_hit")
+            return cached_response
         
-        user_prompt = "\n".join(user_prompt_parts)
+        with metrics.time_stage("deck_digest"):
+            deck_profile = self._deck_profile(pitch_deck_text, include_full_deck)
+        with metrics.time_stage("prompt_assembly"):
+            system_blocks, user_blocks = self._build_prompts(query, investors, pitch_deck_text, deck_profile)
 
         # Call Claude API
         try:
-            message = self.anthropic_client.messages.create(
-                model=config.ANTHROPIC_MODEL,
-                max_tokens=2000,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            start_time = time.perf_counter()
+            message = self.anthropic_client.messages.create(**self._request(system_blocks, user_blocks))
+            elapsed = time.perf_counter() - start_time
+            metrics.observe_stage("llm_total", elapsed)
+            self._log_usage(message)
+            
+            response_text = self._extract_text(message)
+            self.response_cache.put(cache_key, response_text, elapsed, query_embedding)
+            metrics.RECOMMENDATIONS.inc("claude")
+            return response_text
+        
+        except Exception as e:
+            metrics.RECOMMENDATIONS.inc("error")
+            return f"Error generating recommendation: {str(e)}"
+    
+    async def _aretrieve(self, query: str, max_results: int = None,
+                         pitch_deck_text: Optional[str] = None) -> Tuple[List[Dict], Optional[List[float]]]:
+        """Run the blocking embedding and vector search in the default thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._retrieve, query, max_results, pitch_deck_text)
+    
+    async def agenerate_recommendation(self, query: str, max_results: int = None,
+                                       pitch_deck_text: Optional[str] = None,
+                                       include_full_deck: Optional[bool] = None) -> str:
+        """
+        Async version of generate_recommendation for use inside an event loop.
+        
+        The blocking Chroma embedding/query runs in the default thread pool and
+        Claude is called through the async client, so the loop stays free to
+        serve other requests meanwhile.
+        
+        Args:
+            query: User query
+            max_results: Maximum number of investors to send to Claude (None = uses config default)
+            pitch_deck_text: Pitch deck to analyze for this request (None = the deck set via set_pitch_deck)
+            include_full_deck: Send the raw deck text instead of its digested profile
+                (None = config.SEND_FULL_PITCH_DECK)
             
-            # Extract response text
-            response_text = ""
-            for content_block in message.content:
-                if content_block.type == "text":
-                    response_text += content_block.text
+        Returns:
+            Recommendation response from Claude
+        """
+        if pitch_deck_text is None:
+            pitch_deck_text = self.current_pitch_deck
+        if include_full_deck is None:
+            include_full_deck = config.SEND_FULL_PITCH_DECK
+        
+        investors, query_embedding = await self._aretrieve(query, max_results, pitch_deck_text)
+        return await self._acomplete(query, investors, query_embedding, pitch_deck_text, include_full_deck)
+    
+    async def _acomplete(self, query: str, investors: List[Dict], query_embedding: Optional[List[float]],
+                         pitch_deck_text: Optional[str], include_full_deck: bool) -> str:
+        """Answer a query from its retrieved investors: response cache, then Claude via the async client."""
+        if not investors:
+            metrics.RECOMMENDATIONS.inc("no_investors")
+            return NO_INVESTORS_MESSAGE
+        
+        cache_key = self._cache_key(query, investors, pitch_deck_text, include_full_deck)
+        cached_response = self.response_cache.get(cache_key, query_embedding)
+        if cached_response is not None:
+            print("✓ Returning cached recommendation.\n")
+            metrics.RECOMMENDATIONS.inc("cache_hit")
+            return cached_response
+        
+        with metrics.time_stage("deck_digest"):
+            deck_profile = await self._adeck_profile(pitch_deck_text, include_full_deck)
+        with metrics.time_stage("prompt_assembly"):
+            system_blocks, user_blocks = self._build_prompts(query, investors, pitch_deck_text, deck_profile)
+        
+        try:
+            start_time = time.perf_counter()
+            message = await self.async_anthropic_client.messages.create(**self._request(system_blocks, user_blocks))
+            elapsed = time.perf_counter() - start_time
+            metrics.observe_stage("llm_total", elapsed)
+            self._log_usage(message)
             
+            response_text = self._extract_text(message)
+            self.response_cache.put(cache_key, response_text, elapsed, query_embedding)
+            metrics.RECOMMENDATIONS.inc("claude")
             return response_text
         
         except Exception as e:
+            metrics.RECOMMENDATIONS.inc("error")
             return f"Error generating recommendation: {str(e)}"
-
+    
+    async def astream_recommendation(self, query: str, max_results: int = None,
+                                     pitch_deck_text: Optional[str] = None,
+                                     include_full_deck: Optional[bool] = None) -> AsyncIterator[str]:
+        """
+        Stream the recommendation as text deltas as Claude produces them.
+        
+        Args:
+            query: User query
+            max_results: Maximum number of investors to send to Claude (None = uses config default)
+            pitch_deck_text: Pitch deck to analyze for this request (None = the deck set via set_pitch_deck)
+            include_full_deck: Send the raw deck text instead of its digested profile
+                (None = config.SEND_FULL_PITCH_DECK)
+            
+        Yields:
+            Chunks of recommendation text
+            
+        Raises:
+            Exception: If the Claude streaming call fails
+        """
+        if pitch_deck_text is None:
+            pitch_deck_text = self.current_pitch_deck
+        if include_full_deck is None:
+            include_full_deck = config.SEND_FULL_PITCH_DECK
+        
+        investors, query_embedding = await self._aretrieve(query, max_results, pitch_deck_text)
+        if not investors:
+            metrics.RECOMMENDATIONS.inc("no_investors")
+            yield NO_INVESTORS_MESSAGE
+            return
+        
+        cache_key = self._cache_key(query, investors, pitch_deck_text, include_full_deck)
+        cached_response = self.response_cache.get(cache_key, query_embedding)
+        if cached_response is not None:
+            metrics.RECOMMENDATIONS.inc("cache_hit")
+            yield cached_response
+            return
+        
+        with metrics.time_stage("deck_digest"):
+            deck_profile = await self._adeck_profile(pitch_deck_text, include_full_deck)
+        with metrics.time_stage("prompt_assembly"):
+            system_blocks, user_blocks = self._build_prompts(query, investors, pitch_deck_text, deck_profile)
+        
+        start_time = time.perf_counter()
+        chunks = []
+        try:
+            async with self.async_anthropic_client.messages.stream(**self._request(system_blocks, user_blocks)) as stream:
+                async for text in stream.text_stream:
+                    if not chunks:
+                        metrics.observe_stage("llm_time_to_first_token", time.perf_counter() - start_time)
+                    chunks.append(text)
+                    yield text
+                self._log_usage(await stream.get_final_message())
+        except Exception:
+            metrics.RECOMMENDATIONS.inc("error")
+            raise
+        elapsed = time.perf_counter() - start_time
+        metrics.observe_stage("llm_total", elapsed)
+        metrics.RECOMMENDATIONS.inc("claude")
+        
+        # Only completed streams are cached
+        self.response_cache.put(cache_key, "".join(chunks), elapsed, query_embedding)
+    
+    async def abatch_recommend(self, decks: List[Tuple[str, str]], query: Optional[str] = None,
+                               max_results: int = None, include_full_deck: Optional[bool] = None,
+                               concurrency: int = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recommend investors for many pitch decks, yielding each result as it completes.
+        
+        Decks are digested and sent to Claude with bounded concurrency. The searches
+        for all decks run as one batch: one embedding call and one Chroma query
+        (see InvestorVectorStore.batch_search).
+        
+        Args:
+            decks: (name, extracted text) per pitch deck
+            query: Question asked about every deck (None = config.BATCH_DEFAULT_QUERY)
+            max_results: Maximum number of investors to send to Claude per deck (None = uses config default)
+            include_full_deck: Send the raw deck text instead of its digested profile
+                (None = config.SEND_FULL_PITCH_DECK)
+            concurrency: Maximum Claude calls in flight (None = config.BATCH_CONCURRENCY)
+            
+        Yields:
+            Dictionaries with the deck's index, name, response and elapsed seconds
+        """
+        query = query or config.BATCH_DEFAULT_QUERY
+        if max_results is None:
+            max_results = config.MAX_INVESTORS_TO_CLAUDE
+        if include_full_deck is None:
+            include_full_deck = config.SEND_FULL_PITCH_DECK
+        semaphore = asyncio.Semaphore(concurrency or config.BATCH_CONCURRENCY)
+        
+        # The same query fits every deck, so each deck's own profile is what tells the searches apart
+        async def deck_profile(pitch_deck_text: str) -> Optional[str]:
+            async with semaphore:
+                with metrics.time_stage("deck_digest"):
+                    return await self._adeck_profile(pitch_deck_text, False)
+        
+        profiles = await asyncio.gather(*(deck_profile(text) for _, text in decks))
+        search_texts = [f"{query}\n{profile or text[:config.BATCH_SEARCH_DECK_CHARS]}"
+                        for (_, text), profile in zip(decks, profiles)]
+        wheres = [self._where_filter(query, text) for _, text in decks]
+        
+        print(f"\nSearching investor database for {len(decks)} pitch decks using {self.retrieval_mode} search...")
+        loop = asyncio.get_running_loop()
+        candidates_per_deck = await loop.run_in_executor(
+            None, self.vector_store.batch_search, search_texts, self._candidate_count(max_results), wheres,
+            self.retrieval_mode
+        )
+        investors_per_deck = await loop.run_in_executor(None, lambda: [
+            self._rerank(query, candidates, max_results, text)
+            for candidates, (_, text) in zip(candidates_per_deck, decks)
+        ])
+        
+        async def complete(index: int) -> Dict[str, Any]:
+            name, pitch_deck_text = decks[index]
+            async with semaphore:
+                start_time = time.perf_counter()
+                response = await self._acomplete(query, investors_per_deck[index], None, pitch_deck_text,
+                                                 include_full_deck)
+            return {"index": index, "deck": name, "response": response,
+                    "seconds": time.perf_counter() - start_time}
+        
+        tasks = [asyncio.ensure_future(complete(i)) for i in range(len(decks))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding calls if the consumer goes away (e.g. a client disconnects)
+            for task in tasks:
+                task.cancel()
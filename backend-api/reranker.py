@@ -0,0 +1,216 @@
+"""Second retrieval stage: rerank a wide candidate set before it reaches Claude.
+The index returns RERANK_CANDIDATES investors; a linear scorer over structured fit
+features (stage, geography, investor type, check size, focus overlap) and the
+retrieval rank, optionally with a cross-encoder relevance score, picks the few
+that are sent to Claude.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
+import numpy as np
+import config
+from bm25_index import tokenize
+from investor_filters import UNBOUNDED_CHECK_USD, QueryConstraints, parse_query_constraints, profile_filter_fields
+
+# Feature columns, in the order of the weight vector
+FEATURES = ("retrieval", "relevance", "stage", "geography", "investor_type", "check_size", "focus")
+
+# Profile fields whose words are matched against the query for the focus feature
+FOCUS_FIELDS = ("Investor Focus Area", "Industry Focus", "Investment Thesis")
+
+# Fit feature values: the profile matches, says nothing, or contradicts the constraint
+MATCH, UNKNOWN, MISMATCH = 1.0, 0.5, 0.0
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_thread_pool_lock = threading.Lock()
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    """Shared thread pool for cross-encoder batches, started on first use."""
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=config.RERANK_WORKERS, thread_name_prefix="rerank")
+        return _thread_pool
+
+
+def _flag_fit(fields: Dict, prefix: str, wanted: List[str], also_match: tuple = ()) -> float:
+    """Fit of one flag dimension (stage_*, geo_*, type_*) against the wanted values."""
+    if any(fields.get(f"{prefix}_{value}") for value in wanted) or any(fields.get(key) for key in also_match):
+        return MATCH
+    if fields.get(f"{prefix}_unknown", True):
+        return UNKNOWN
+    return MISMATCH
+
+
+def _check_size_fit(fields: Dict, constraints: QueryConstraints) -> float:
+    """Fit of the investor's check size range against the requested check or round size."""
+    low = fields.get("check_min_usd", 0.0)
+    high = fields.get("check_max_usd", UNBOUNDED_CHECK_USD)
+    if low <= 0 and high >= UNBOUNDED_CHECK_USD:
+        return UNKNOWN
+    if constraints.check_size_usd is not None:
+        amount = constraints.check_size_usd
+        if low <= amount <= high:
+            return MATCH
+        tolerance = config.CHECK_SIZE_TOLERANCE
+        if low <= amount * tolerance and high >= amount / tolerance:
+            return UNKNOWN
+        return MISMATCH
+    # Round size: the investor must be able to write a check that fits inside the round
+    return MATCH if low <= constraints.raise_size_usd else MISMATCH
+
+
+def fit_features(fields: Dict, constraints: QueryConstraints) -> List[float]:
+    """
+    Structured fit features of one investor for a query's constraints.
+
+    Dimensions the query does not constrain score 0 for every candidate, so they
+    do not change the order.
+
+    Args:
+        fields: The investor's normalized filter fields (see investor_filters.profile_filter_fields)
+        constraints: Constraints parsed from the query and pitch deck
+
+    Returns:
+        Stage, geography, investor type and check size fit
+    """
+    stage = _flag_fit(fields, "stage", constraints.stages) if constraints.stages else 0.0
+    geography = (_flag_fit(fields, "geo", constraints.regions, also_match=("geo_global",))
+                 if constraints.regions else 0.0)
+    investor_type = (_flag_fit(fields, "type", constraints.investor_types)
+                     if constraints.investor_types else 0.0)
+    check_size = 0.0
+    if constraints.check_size_usd is not None or constraints.raise_size_usd is not None:
+        check_size = _check_size_fit(fields, constraints)
+    return [stage, geography, investor_type, check_size]
+
+
+class CrossEncoderScorer:
+    """Query/profile relevance from a sentence-transformers cross-encoder, scored in batches."""
+
+    def __init__(self, model_name: str = None):
+        """
+        Load the cross-encoder.
+
+        Args:
+            model_name: Hugging Face model id (None = config.RERANK_CROSS_ENCODER_MODEL)
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        from sentence_transformers import CrossEncoder
+        self.model = CrossEncoder(model_name or config.RERANK_CROSS_ENCODER_MODEL, device="cpu")
+
+    def score(self, query: str, documents: List[str]) -> np.ndarray:
+        """
+        Relevance of each document to the query, in [0, 1].
+
+        Batches of config.RERANK_BATCH_SIZE pairs are scored concurrently in the
+        shared thread pool (the model releases the GIL while it runs).
+        """
+        batch_size = config.RERANK_BATCH_SIZE
+        pairs = [(query, document) for document in documents]
+        batches = [pairs[i:i + batch_size] for i in range(0, len(pairs), batch_size)]
+        pool = _get_thread_pool()
+        futures = [pool.submit(self.model.predict, batch, batch_size=batch_size) for batch in batches]
+        logits = np.concatenate([np.asarray(future.result(), dtype=np.float32).reshape(-1) for future in futures])
+        return 1.0 / (1.0 + np.exp(-logits))
+
+
+class Reranker:
+    """Reorders retrieved investors by a weighted sum of fit features."""
+
+    def __init__(self, document_text: Callable[[Mapping], str], weights: Optional[Dict[str, float]] = None,
+                 use_cross_encoder: bool = None):
+        """
+        Initialize the reranker.
+
+        Args:
+            document_text: Text of a profile shown to the cross-encoder (e.g. its search summary)
+            weights: Weight per feature name in FEATURES (None = config.RERANK_WEIGHTS)
+            use_cross_encoder: Add a cross-encoder relevance score (None = config.RERANKER == "cross-encoder")
+        """
+        self.document_text = document_text
+        weights = weights or config.RERANK_WEIGHTS
+        self.weights = np.asarray([weights.get(feature, 0.0) for feature in FEATURES], dtype=np.float32)
+        if use_cross_encoder is None:
+            use_cross_encoder = config.RERANKER == "cross-encoder"
+        self.use_cross_encoder = use_cross_encoder
+        self._cross_encoder: Optional[CrossEncoderScorer] = None
+        self._cross_encoder_lock = threading.Lock()
+        # Per investor id: the profile text they were parsed from, its filter fields and focus tokens
+        self._parsed: Dict[str, Tuple[str, Dict, Set[str]]] = {}
+
+    def _get_cross_encoder(self) -> Optional[CrossEncoderScorer]:
+        """The cross-encoder, loaded on first use (None if it is off or cannot be loaded)."""
+        if not self.use_cross_encoder:
+            return None
+        with self._cross_encoder_lock:
+            if self._cross_encoder is None and self.use_cross_encoder:
+                try:
+                    self._cross_encoder = CrossEncoderScorer()
+                except Exception as e:
+                    print(f"Warning: Could not load cross-encoder ({e}); reranking on fit features only.")
+                    self.use_cross_encoder = False
+            return self._cross_encoder
+
+    def _parse(self, investor: Mapping) -> Tuple[Dict, Set[str]]:
+        """Filter fields and focus tokens of a profile, re-parsed only when it changed (e.g. after a sync)."""
+        cached = self._parsed.get(investor['id'])
+        if cached is not None and cached[0] == investor['text']:
+            return cached[1], cached[2]
+        metadata = investor['metadata']
+        fields = profile_filter_fields(metadata)
+        focus_tokens = set(tokenize(" ".join(str(metadata.get(field) or "") for field in FOCUS_FIELDS)))
+        self._parsed[investor['id']] = (investor['text'], fields, focus_tokens)
+        return fields, focus_tokens
+
+    def features(self, query: str, investors: List[Mapping], pitch_deck_text: Optional[str] = None) -> np.ndarray:
+        """
+        Feature matrix for the candidates, one row per investor and one column per FEATURES entry.
+
+        Args:
+            query: User query
+            investors: Candidates in retrieval order
+            pitch_deck_text: Pitch deck, used to fill in stage/raise constraints the query leaves out
+
+        Returns:
+            float32 array of shape (len(investors), len(FEATURES))
+        """
+        constraints = parse_query_constraints(query, pitch_deck_text)
+        query_tokens = set(tokenize(query))
+        matrix = np.zeros((len(investors), len(FEATURES)), dtype=np.float32)
+        if not investors:
+            return matrix
+
+        matrix[:, 0] = 1.0 - np.arange(len(investors), dtype=np.float32) / len(investors)
+        cross_encoder = self._get_cross_encoder()
+        if cross_encoder is not None:
+            matrix[:, 1] = cross_encoder.score(query, [self.document_text(investor) for investor in investors])
+        for row, investor in enumerate(investors):
+            fields, focus_tokens = self._parse(investor)
+            matrix[row, 2:6] = fit_features(fields, constraints)
+            if query_tokens:
+                matrix[row, 6] = len(query_tokens & focus_tokens) / len(query_tokens)
+        return matrix
+
+    def rerank(self, query: str, investors: List[Mapping], n_results: int,
+               pitch_deck_text: Optional[str] = None) -> List[Mapping]:
+        """
+        The best n_results candidates by weighted feature score.
+
+        Args:
+            query: User query
+            investors: Candidates in retrieval order
+            n_results: Number of investors to keep
+            pitch_deck_text: Pitch deck, used to fill in stage/raise constraints the query leaves out
+
+        Returns:
+            Investors in reranked order (ties keep their retrieval order)
+        """
+        if len(investors) <= 1:
+            return list(investors[:n_results])
+        scores = self.features(query, investors, pitch_deck_text) @ self.weights
+        order = np.argsort(-scores, kind="stable")[:n_results]
+        return [investors[i] for i in order]
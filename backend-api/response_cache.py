@@ -0,0 +1,174 @@
+"""Cache of Claude recommendations in front of the Anthropic call.
+Entries are keyed on the normalized query, a hash of the pitch deck and the ordered
+investor IDs retrieved for the query, so a hit is only served when Claude would
+have seen exactly the same investors and deck.
+"""
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import config
+
+CacheKey = Tuple[str, str, Tuple[str, ...]]
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and drop surrounding punctuation."""
+    return re.sub(r"\s+", " ", query.lower()).strip(" \t\n?!.,;:")
+
+
+def hash_pitch_deck(pitch_deck_text: Optional[str]) -> str:
+    """Fingerprint of the pitch deck text ('' when there is no deck)."""
+    if not pitch_deck_text:
+        return ""
+    return hashlib.sha256(pitch_deck_text.encode('utf-8')).hexdigest()
+
+
+def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class _CacheEntry:
+    __slots__ = ("response", "created_at", "latency_seconds", "query_embedding")
+
+    def __init__(self, response: str, latency_seconds: float, query_embedding: Optional[List[float]]):
+        self.response = response
+        self.created_at = time.monotonic()
+        self.latency_seconds = latency_seconds
+        self.query_embedding = query_embedding
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of recommendations with TTL and optional paraphrase matching."""
+
+    def __init__(self, max_entries: int = None, ttl_seconds: int = None,
+                 similarity_threshold: Optional[float] = None,
+                 embed_query: Optional[Callable[[str], List[float]]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached responses (least recently used evicted first)
+            ttl_seconds: Seconds a response stays valid
+            similarity_threshold: Cosine similarity above which a paraphrased query
+                (same deck and retrieved investors) counts as a hit; None disables it
+            embed_query: Function embedding a query string, required for paraphrase matching
+        """
+        self.max_entries = max_entries if max_entries is not None else config.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.RESPONSE_CACHE_TTL_SECONDS
+        self.similarity_threshold = similarity_threshold
+        self.embed_query = embed_query if similarity_threshold is not None else None
+
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+        self._saved_seconds = 0.0
+
+    @staticmethod
+    def make_key(query: str, pitch_deck_text: Optional[str], investor_ids: Sequence[str],
+                 variant: str = "") -> CacheKey:
+        """
+        Build the cache key for a query, deck and ordered retrieved investor IDs.
+
+        Args:
+            query: User query
+            pitch_deck_text: Pitch deck text (None = no deck)
+            investor_ids: Retrieved investor IDs in rank order
+            variant: Distinguishes different prompts built from the same deck
+        """
+        deck_key = hash_pitch_deck(pitch_deck_text)
+        if variant:
+            deck_key = f"{deck_key}:{variant}"
+        return normalize_query(query), deck_key, tuple(investor_ids)
+
+    def get(self, key: CacheKey, query_embedding: Optional[List[float]] = None) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from make_key
+            query_embedding: Embedding of the query, enables paraphrase matching
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            semantic = False
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                entry = None
+            if entry is None and query_embedding is not None and self.similarity_threshold is not None:
+                key, entry = self._find_similar(key, query_embedding)
+                semantic = entry is not None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            if semantic:
+                self._semantic_hits += 1
+            self._saved_seconds += entry.latency_seconds
+            return entry.response
+
+    def put(self, key: CacheKey, response: str, latency_seconds: float = 0.0,
+            query_embedding: Optional[List[float]] = None):
+        """
+        Store a response.
+
+        Args:
+            key: Key from make_key
+            response: Claude's response text
+            latency_seconds: How long generating it took (reported as saved on hits)
+            query_embedding: Embedding of the query, for paraphrase matching
+        """
+        with self._lock:
+            self._entries[key] = _CacheEntry(response, latency_seconds, query_embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached responses (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters, hit rate and total Claude latency saved."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "semantic_hits": self._semantic_hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "saved_seconds": round(self._saved_seconds, 3),
+            }
+
+    def _expired(self, entry: _CacheEntry) -> bool:
+        return time.monotonic() - entry.created_at > self.ttl_seconds
+
+    def _find_similar(self, key: CacheKey, query_embedding: List[float]) -> Tuple[CacheKey, Optional[_CacheEntry]]:
+        """Most similar live entry for the same deck and retrieved investors (caller holds the lock)."""
+        _, deck_hash, investor_ids = key
+        best_key, best_entry, best_similarity = key, None, self.similarity_threshold
+        for other_key, entry in list(self._entries.items()):
+            if other_key[1] != deck_hash or other_key[2] != investor_ids or entry.query_embedding is None:
+                continue
+            if self._expired(entry):
+                del self._entries[other_key]
+                continue
+            similarity = _cosine_similarity(query_embedding, entry.query_embedding)
+            if similarity >= best_similarity:
+                best_key, best_entry, best_similarity = other_key, entry, similarity
+        return best_key, best_entry
@@ -1,10 +1,29 @@
-"""Save query results to file."""
+"""Save query results to file.
+
+Results go to an append-only JSON Lines log: each query appends one line instead
+of rewriting the whole history. The active log is rotated into dated segments
+(query_results.2025-01-31.0.jsonl, ...) by size and by day.
+"""
+import atexit
 import json
 import os
+import queue
 import re
-from datetime import datetime
-from typing import Optional, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 import config
+import metrics
+
+try:
+    import fcntl  # serializes rotation across processes sharing the log
+except ImportError:  # Windows
+    fcntl = None
+
+# Serializes writers within this process (flock only excludes other processes)
+_write_lock = threading.Lock()
 
 
 def sanitize_filename(text: str, max_length: int = 50) -> str:
@@ -30,14 +49,20 @@ def sanitize_filename(text: str, max_length: int = 50) -> str:
     return sanitized or "query"
 
 
-def create_markdown_filename(query: str, timestamp: datetime, markdown_dir: Optional[str] = None) -> str:
+def create_markdown_filename(query: str, timestamp: datetime, markdown_dir: Optional[str] = None,
+                             create_dir: bool = True, pitch_deck_name: Optional[str] = None) -> str:
     """
-    Create a markdown filename based on query and timestamp.
+    Create a markdown filename based on query, pitch deck and timestamp.
+    
+    The timestamp goes down to the microsecond and the deck name is included, so
+    results saved in the same second (e.g. a batch run) get their own files.
     
     Args:
         query: The user's query
         timestamp: Timestamp of the query
         markdown_dir: Directory to save markdown files (defaults to config)
+        create_dir: Create the directory if it doesn't exist
+        pitch_deck_name: Name of the pitch deck used (if any)
         
     Returns:
         Full path to the markdown file
@@ -46,21 +71,30 @@ def create_markdown_filename(query: str, timestamp: datetime, markdown_dir: Opti
         markdown_dir = config.MARKDOWN_RESULTS_DIR
     
     # Create directory if it doesn't exist
-    if markdown_dir and not os.path.exists(markdown_dir):
+    if create_dir and markdown_dir and not os.path.exists(markdown_dir):
         os.makedirs(markdown_dir, exist_ok=True)
     
-    # Format timestamp for filename (YYYY-MM-DD_HH-MM-SS)
-    timestamp_str = timestamp.strftime("%Y-%m-%d_%H-%M-%S")
+    # Format timestamp for filename (YYYY-MM-DD_HH-MM-SS-ffffff)
+    timestamp_str = timestamp.strftime("%Y-%m-%d_%H-%M-%S-%f")
     
     # Sanitize query for filename
     query_sanitized = sanitize_filename(query, max_length=40)
     
-    # Create filename: YYYY-MM-DD_HH-MM-SS_query-text.md
-    filename = f"{timestamp_str}_{query_sanitized}.md"
+    # Create filename: YYYY-MM-DD_HH-MM-SS-ffffff_query-text[_deck-name].md
+    filename = f"{timestamp_str}_{query_sanitized}"
+    if pitch_deck_name:
+        filename += f"_{sanitize_filename(os.path.splitext(pitch_deck_name)[0], max_length=30)}"
+    filename += ".md"
     
     return os.path.join(markdown_dir, filename) if markdown_dir else filename
 
 
+def _legacy_markdown_filename(query: str, timestamp: datetime, markdown_dir: str) -> str:
+    """Markdown path used before deck names and microseconds were added (YYYY-MM-DD_HH-MM-SS_query-text.md)."""
+    filename = f"{timestamp.strftime('%Y-%m-%d_%H-%M-%S')}_{sanitize_filename(query, max_length=40)}.md"
+    return os.path.join(markdown_dir, filename) if markdown_dir else filename
+
+
 def format_markdown(query: str, response: str, pitch_deck_name: Optional[str] = None, timestamp: Optional[datetime] = None) -> str:
     """
     Format query result as markdown.
@@ -106,96 +140,415 @@ def format_markdown(query: str, response: str, pitch_deck_name: Optional[str] =
     return "\n".join(markdown_parts)
 
 
-def save_query_result(
-    query: str,
-    response: str,
-    pitch_deck_name: Optional[str] = None,
-    results_file: Optional[str] = None
-) -> Tuple[str, str]:
+def _log_paths(results_file: Optional[str] = None) -> Tuple[str, str]:
     """
-    Save a query result to both JSON and markdown files.
+    Active JSON Lines log and legacy JSON array file for a results path.
     
     Args:
-        query: The user's query
-        response: The AI-generated response
-        pitch_deck_name: Name of the pitch deck used (if any)
-        results_file: Path to JSON results file (defaults to config)
+        results_file: Path to results file, with or without the .jsonl extension (defaults to config)
         
     Returns:
-        Tuple of (json_file_path, markdown_file_path)
+        Tuple of (active log path, legacy JSON path)
     """
     if results_file is None:
         results_file = config.RESULTS_FILE_PATH
+    stem = os.path.splitext(results_file)[0]
+    return stem + ".jsonl", stem + ".json"
+
+
+def _segment_paths(log_file: str) -> List[str]:
+    """Rotated segments of a log, oldest first."""
+    directory, name = os.path.split(log_file)
+    stem = re.escape(os.path.splitext(name)[0])
+    pattern = re.compile(rf"^{stem}\.(\d{{4}}-\d{{2}}-\d{{2}})\.(\d+)\.jsonl$")
+    
+    segments = []
+    for entry in os.listdir(directory or "."):
+        match = pattern.match(entry)
+        if match:
+            segments.append((match.group(1), int(match.group(2)), os.path.join(directory, entry)))
+    return [path for _, _, path in sorted(segments)]
+
+
+def _next_segment_path(log_file: str, segment_date: date) -> str:
+    """First unused segment name for a date."""
+    stem = os.path.splitext(log_file)[0]
+    index = 0
+    while os.path.exists(f"{stem}.{segment_date.isoformat()}.{index}.jsonl"):
+        index += 1
+    return f"{stem}.{segment_date.isoformat()}.{index}.jsonl"
+
+
+@contextmanager
+def _locked(log_file: str):
+    """Hold the log's write lock, across threads and (where supported) processes."""
+    with _write_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(log_file + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_lines(path: str, entries: List[Dict]):
+    """Append entries with a single O_APPEND write, so concurrent writers never interleave."""
+    data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _rotate_if_needed(log_file: str, incoming_bytes: int, now: datetime):
+    """Move the active log to a segment when it is full or was last written on an earlier day."""
+    try:
+        stat = os.stat(log_file)
+    except FileNotFoundError:
+        return
+    if stat.st_size == 0:
+        return
+    
+    last_written = datetime.fromtimestamp(stat.st_mtime).date()
+    too_big = stat.st_size + incoming_bytes > config.RESULTS_ROTATE_MAX_BYTES
+    new_day = config.RESULTS_ROTATE_DAILY and last_written < now.date()
+    if too_big or new_day:
+        os.replace(log_file, _next_segment_path(log_file, last_written))
+
+
+def migrate_legacy_results(results_file: Optional[str] = None) -> int:
+    """
+    One-shot migration of a legacy JSON array results file into the JSON Lines log.
     
-    timestamp = datetime.now()
+    The entries become the oldest segment and the JSON file is renamed to
+    *.json.migrated, so running this again is a no-op.
     
-    # Create results directory if it doesn't exist
-    results_dir = os.path.dirname(results_file)
-    if results_dir and not os.path.exists(results_dir):
-        os.makedirs(results_dir, exist_ok=True)
+    Args:
+        results_file: Path to results file (defaults to config)
+        
+    Returns:
+        Number of results migrated
+    """
+    log_file, legacy_file = _log_paths(results_file)
+    if not os.path.exists(legacy_file):
+        return 0
+    
+    log_dir = os.path.dirname(log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    with _locked(log_file):
+        if not os.path.exists(legacy_file):
+            return 0  # another writer migrated it meanwhile
+        return _migrate_locked(log_file, legacy_file)
+
+
+def _migrate_locked(log_file: str, legacy_file: str) -> int:
+    try:
+        with open(legacy_file, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        # Same as before: a corrupted or empty file holds no results
+        results = []
+    if not isinstance(results, list):
+        results = []
     
-    # Load existing results if file exists
-    results = []
-    if os.path.exists(results_file):
+    if results:
         try:
-            with open(results_file, 'r', encoding='utf-8') as f:
-                results = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # If file is corrupted or empty, start fresh
-            results = []
-    
-    # Create new result entry
-    result_entry = {
+            segment_date = datetime.fromisoformat(results[-1]["timestamp"]).date()
+        except (KeyError, TypeError, ValueError):
+            segment_date = datetime.fromtimestamp(os.path.getmtime(legacy_file)).date()
+        # Written to a temp file first so a crash never leaves a half-migrated segment
+        segment = _next_segment_path(log_file, segment_date)
+        _write_lines(segment + ".tmp", results)
+        os.replace(segment + ".tmp", segment)
+    
+    os.replace(legacy_file, legacy_file + ".migrated")
+    print(f"✓ Migrated {len(results)} saved results from {legacy_file} to {log_file}")
+    return len(results)
+
+
+def _new_entry(query: str, response: str, pitch_deck_name: Optional[str], timestamp: datetime) -> Dict:
+    # The markdown file name is recorded so convert_json_to_markdown finds it even if the naming changes
+    markdown_file = create_markdown_filename(query, timestamp, markdown_dir="", create_dir=False,
+                                             pitch_deck_name=pitch_deck_name)
+    return {
         "timestamp": timestamp.isoformat(),
         "query": query,
         "response": response,
-        "pitch_deck": pitch_deck_name
+        "pitch_deck": pitch_deck_name,
+        "markdown_file": markdown_file
     }
+
+
+def _append_results(entries: List[Dict], results_file: Optional[str] = None) -> str:
+    """
+    Append result entries to the JSON Lines log in one write.
     
-    # Append new result
-    results.append(result_entry)
+    Args:
+        entries: Result dictionaries
+        results_file: Path to results log (defaults to config)
+        
+    Returns:
+        Path of the active log
+    """
+    log_file, legacy_file = _log_paths(results_file)
     
-    # Save updated JSON results
+    # Create results directory if it doesn't exist
+    results_dir = os.path.dirname(log_file)
+    if results_dir and not os.path.exists(results_dir):
+        os.makedirs(results_dir, exist_ok=True)
+    
+    # Earlier results are never read or rewritten
     try:
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with _locked(log_file):
+            if os.path.exists(legacy_file):
+                _migrate_locked(log_file, legacy_file)
+            batch_bytes = sum(len(json.dumps(entry, ensure_ascii=False).encode("utf-8")) + 1 for entry in entries)
+            _rotate_if_needed(log_file, batch_bytes, datetime.fromisoformat(entries[-1]["timestamp"]))
+            _write_lines(log_file, entries)
     except IOError as e:
-        raise IOError(f"Error saving results to {results_file}: {str(e)}")
-    
-    # Save markdown file
-    markdown_content = format_markdown(query, response, pitch_deck_name, timestamp)
-    markdown_file = create_markdown_filename(query, timestamp)
+        raise IOError(f"Error saving results to {log_file}: {str(e)}")
+    return log_file
+
+
+def _write_markdown(entry: Dict, markdown_file: Optional[str] = None) -> str:
+    """Render a result entry to its markdown file and return the path."""
+    timestamp = datetime.fromisoformat(entry["timestamp"])
+    markdown_content = format_markdown(entry["query"], entry["response"], entry["pitch_deck"], timestamp)
+    if markdown_file is None:
+        markdown_file = os.path.join(config.MARKDOWN_RESULTS_DIR, entry["markdown_file"])
+    markdown_dir = os.path.dirname(markdown_file)
+    if markdown_dir and not os.path.exists(markdown_dir):
+        os.makedirs(markdown_dir, exist_ok=True)
     
     try:
         with open(markdown_file, 'w', encoding='utf-8') as f:
             f.write(markdown_content)
     except IOError as e:
         raise IOError(f"Error saving markdown to {markdown_file}: {str(e)}")
-    
-    return results_file, markdown_file
+    return markdown_file
 
 
-def load_query_results(results_file: Optional[str] = None) -> list:
+@metrics.time_stage("result_persistence")
+def save_query_result(
+    query: str,
+    response: str,
+    pitch_deck_name: Optional[str] = None,
+    results_file: Optional[str] = None
+) -> Tuple[str, str]:
     """
-    Load all saved query results.
+    Save a query result to both the JSON Lines log and a markdown file, synchronously.
+    Request handlers should use ResultsWriter.submit instead.
     
     Args:
-        results_file: Path to results file (defaults to config)
+        query: The user's query
+        response: The AI-generated response
+        pitch_deck_name: Name of the pitch deck used (if any)
+        results_file: Path to results log (defaults to config)
         
     Returns:
-        List of result dictionaries
+        Tuple of (json_file_path, markdown_file_path)
     """
-    if results_file is None:
-        results_file = config.RESULTS_FILE_PATH
+    entry = _new_entry(query, response, pitch_deck_name, datetime.now())
+    log_file = _append_results([entry], results_file)
+    markdown_file = _write_markdown(entry)
+    return log_file, markdown_file
+
+
+class ResultsWriter:
+    """
+    Background thread that persists query results in batches.
     
-    if not os.path.exists(results_file):
-        return []
+    submit() only enqueues the result, so request latency includes no disk I/O.
+    The worker appends each batch to the JSON Lines log in one write and renders
+    the markdown files; close() (also registered with atexit) drains the queue.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, results_file: Optional[str] = None, batch_size: int = None,
+                 flush_interval: float = None):
+        """
+        Start the writer thread.
+        
+        Args:
+            results_file: Path to results log (None = config.RESULTS_FILE_PATH at write time)
+            batch_size: Maximum results per write (None = uses config default)
+            flush_interval: Seconds to wait for a batch to fill (None = uses config default)
+        """
+        self.results_file = results_file
+        self.batch_size = batch_size or config.RESULTS_WRITER_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.RESULTS_WRITER_FLUSH_INTERVAL
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, query: str, response: str, pitch_deck_name: Optional[str] = None) -> str:
+        """
+        Queue a query result for saving.
+        
+        Args:
+            query: The user's query
+            response: The AI-generated response
+            pitch_deck_name: Name of the pitch deck used (if any)
+            
+        Returns:
+            Path the markdown file will be written to
+        """
+        if self._closed:
+            raise RuntimeError("ResultsWriter is closed")
+        entry = _new_entry(query, response, pitch_deck_name, datetime.now())
+        markdown_file = os.path.join(config.MARKDOWN_RESULTS_DIR, entry["markdown_file"])
+        self._queue.put((entry, markdown_file))
+        return markdown_file
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything submitted so far is on disk.
+        
+        Args:
+            timeout: Seconds to wait (None = no limit)
+            
+        Returns:
+            True if the queue was flushed within the timeout (after close(), once the thread has exited)
+        """
+        done = threading.Event()
+        with self._close_lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put(done)  # ahead of close()'s stop marker, so the thread always reaches it
+        if closed:
+            # Nothing new can be queued and close() drains the rest, so wait for the thread instead
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = None):
+        """Write any queued results and stop the thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join(timeout)
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Collect whatever arrives within the flush interval, up to a full batch
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            pending = []
+            for item in batch:
+                if isinstance(item, tuple):
+                    pending.append(item)
+                    continue
+                self._write(pending)
+                pending = []
+                if item is self._STOP:
+                    return
+                item.set()  # flush() marker: everything before it is written
+            self._write(pending)
+    
+    def _write(self, pending: List[Tuple[Dict, str]]):
+        if not pending:
+            return
+        with metrics.time_stage("result_persistence"):
+            try:
+                _append_results([entry for entry, _ in pending], self.results_file)
+            except Exception as e:
+                print(f"Warning: Could not save {len(pending)} results: {str(e)}")
+            for entry, markdown_file in pending:
+                try:
+                    _write_markdown(entry, markdown_file)
+                except Exception as e:
+                    print(f"Warning: Could not save result: {str(e)}")
+
+
+_results_writer: Optional[ResultsWriter] = None
+_results_writer_lock = threading.Lock()
+
+
+def get_results_writer() -> ResultsWriter:
+    """Process-wide background ResultsWriter, started on first use."""
+    global _results_writer
+    if _results_writer is None:
+        with _results_writer_lock:
+            if _results_writer is None:
+                _results_writer = ResultsWriter()
+    return _results_writer
+
+
+def close_results_writer():
+    """Drain and stop the process-wide ResultsWriter, if it was started."""
+    if _results_writer is not None:
+        _results_writer.close()
+
+
+def _read_lines(f) -> Iterator[Dict]:
+    for line in f:
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            # Torn line from a crash mid-write; the rest of the log is intact
+            continue
+
+
+def load_query_results(results_file: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Iterate over all saved query results, oldest first, one line at a time.
+    
+    The log is snapshotted when iteration starts: rotation while iterating neither
+    skips nor repeats results, and results saved meanwhile are not included.
+    
+    Args:
+        results_file: Path to results log (defaults to config)
+        
+    Yields:
+        Result dictionaries
+    """
+    log_file, legacy_file = _log_paths(results_file)
+    if os.path.exists(legacy_file):
+        migrate_legacy_results(results_file)
+    
+    log_dir = os.path.dirname(log_file)
+    if log_dir and not os.path.isdir(log_dir):
+        return
+    
+    # Rotation renames the active log into a new segment, so list the segments and open the
+    # active log together under the write lock. Rotated segments never change afterwards,
+    # and the open handle keeps reading the listed active log even if it is rotated meanwhile.
+    with _locked(log_file):
+        segments = _segment_paths(log_file)
+        try:
+            active = open(log_file, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            active = None
     
     try:
-        with open(results_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
+        for path in segments:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield from _read_lines(f)
+        if active is not None:
+            yield from _read_lines(active)
+    finally:
+        if active is not None:
+            active.close()
 
 
 def get_results_count(results_file: Optional[str] = None) -> int:
@@ -203,13 +556,12 @@ def get_results_count(results_file: Optional[str] = None) -> int:
     Get the number of saved query results.
     
     Args:
-        results_file: Path to results file (defaults to config)
+        results_file: Path to results log (defaults to config)
         
     Returns:
         Number of saved results
     """
-    results = load_query_results(results_file)
-    return len(results)
+    return sum(1 for _ in load_query_results(results_file))
 
 
 def convert_json_to_markdown(results_file: Optional[str] = None) -> int:
@@ -217,16 +569,19 @@ def convert_json_to_markdown(results_file: Optional[str] = None) -> int:
     Convert all existing JSON results to individual markdown files.
     Useful for migrating existing results.
     
+    Results that already have a markdown file are skipped: the file name recorded
+    in the entry, or for older entries the current or the pre-deck-name format.
+    
     Args:
-        results_file: Path to JSON results file (defaults to config)
+        results_file: Path to results log (defaults to config)
         
     Returns:
         Number of markdown files created
     """
-    results = load_query_results(results_file)
     count = 0
+    markdown_dir = config.MARKDOWN_RESULTS_DIR
     
-    for result in results:
+    for result in load_query_results(results_file):
         try:
             timestamp = datetime.fromisoformat(result["timestamp"])
             query = result["query"]
@@ -235,10 +590,18 @@ def convert_json_to_markdown(results_file: Optional[str] = None) -> int:
             
             # Format and save markdown
             markdown_content = format_markdown(query, response, pitch_deck, timestamp)
-            markdown_file = create_markdown_filename(query, timestamp)
+            if result.get("markdown_file"):
+                names = [os.path.join(markdown_dir, result["markdown_file"])]
+            else:
+                names = [create_markdown_filename(query, timestamp, markdown_dir, create_dir=False,
+                                                  pitch_deck_name=pitch_deck),
+                         _legacy_markdown_filename(query, timestamp, markdown_dir)]
+            markdown_file = names[0]
             
             # Only create if file doesn't already exist
-            if not os.path.exists(markdown_file):
+            if not any(os.path.exists(name) for name in names):
+                if markdown_dir:
+                    os.makedirs(markdown_dir, exist_ok=True)
                 with open(markdown_file, 'w', encoding='utf-8') as f:
                     f.write(markdown_content)
                 count += 1
@@ -0,0 +1,123 @@
+"""Per-session pitch deck storage for the API.
+Each uploaded deck gets its own id so concurrent chats never share deck state.
+The store keeps the deck's text and its uploaded filename.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+import config
+
+
+class InMemorySessionStore:
+    """Thread-safe LRU of pitch deck texts and names with a time-to-live."""
+
+    def __init__(self, max_sessions: int = None, ttl_seconds: int = None):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions: Maximum number of decks kept (least recently used evicted first)
+            ttl_seconds: Seconds after the last access before a deck expires
+        """
+        self.max_sessions = max_sessions if max_sessions is not None else config.SESSION_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.SESSION_TTL_SECONDS
+        self._entries: "OrderedDict[str, Tuple[float, str, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Return (deck text, deck name) for a session, or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            last_access, text, name = entry
+            now = time.monotonic()
+            if now - last_access > self.ttl_seconds:
+                del self._entries[session_id]
+                return None
+            self._entries[session_id] = (now, text, name)
+            self._entries.move_to_end(session_id)
+            return text, name
+
+    def set(self, session_id: str, pitch_deck_text: str, pitch_deck_name: Optional[str] = None):
+        """Store the deck text and its filename for a session."""
+        with self._lock:
+            self._entries[session_id] = (time.monotonic(), pitch_deck_text, pitch_deck_name)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+
+    def delete(self, session_id: str):
+        """Forget a session."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+
+class SQLiteSessionStore:
+    """Pitch deck texts and names in SQLite, shared across worker processes."""
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Seconds after the last access before a deck expires
+        """
+        self.db_path = db_path or config.SESSION_DB_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.SESSION_TTL_SECONDS
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, pitch_deck_text TEXT NOT NULL, last_access REAL NOT NULL, "
+                "pitch_deck_name TEXT)"
+            )
+            # Databases created before deck names were stored
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if "pitch_deck_name" not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN pitch_deck_name TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, session_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Return (deck text, deck name) for a session, or None if unknown or expired."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE last_access < ?", (now - self.ttl_seconds,))
+            row = conn.execute(
+                "SELECT pitch_deck_text, pitch_deck_name FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id))
+            return row[0], row[1]
+
+    def set(self, session_id: str, pitch_deck_text: str, pitch_deck_name: Optional[str] = None):
+        """Store the deck text and its filename for a session."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, pitch_deck_text, last_access, pitch_deck_name) "
+                "VALUES (?, ?, ?, ?)",
+                (session_id, pitch_deck_text, time.time(), pitch_deck_name)
+            )
+
+    def delete(self, session_id: str):
+        """Forget a session."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+
+def create_session_store():
+    """Create the session store selected by config.SESSION_STORE_BACKEND ('memory' or 'sqlite')."""
+    if config.SESSION_STORE_BACKEND == "sqlite":
+        return SQLiteSessionStore()
+    return InMemorySessionStore()
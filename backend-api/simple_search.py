@@ -1,16 +1,18 @@
 """Simple keyword-based search for investors."""
 from typing import List, Dict
 import config
-from data_loader import get_investor_data, search_investors
+from data_loader import get_investor_data
+from keyword_index import KeywordIndex
 
 
 class SimpleInvestorSearch:
     """Simple text-based investor search without embeddings."""
     
     def __init__(self):
-        """Initialize with investor data."""
+        """Initialize with investor data and build the keyword index once."""
         print("Loading investor data...")
         self.profiles = get_investor_data()
+        self.index = KeywordIndex(self.profiles)
         print(f"Loaded {len(self.profiles)} investors.\n")
     
     def search(self, query: str, max_results: int = None) -> List[Dict[str, any]]:
@@ -24,5 +26,5 @@ class SimpleInvestorSearch:
         Returns:
             List of matching investor profiles
         """
-        return search_investors(self.profiles, query, max_results)
+        return self.index.search(query, max_results)
 
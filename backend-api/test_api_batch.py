@@ -0,0 +1,65 @@
+"""API tests for /api/batch (run with pytest). The RAG pipeline is replaced by a stub, so no model or API key is used."""
+import json
+import os
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")  # config requires a key; no request is ever sent
+
+import PyPDF2
+import pytest
+from fastapi.testclient import TestClient
+
+import api.main as api_main
+import config
+import results_saver
+
+
+class StubPipeline:
+    """Answers every deck without searching or calling Claude."""
+
+    async def abatch_recommend(self, decks, query=None, max_results=None, concurrency=None):
+        for index, (name, _) in enumerate(decks):
+            yield {"index": index, "deck": name, "response": f"Investors for {name}", "elapsed_s": 0.0}
+
+
+def _write_pdf(path):
+    writer = PyPDF2.PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    folder = tmp_path / "decks"
+    folder.mkdir()
+    for name in ("alpha.pdf", "beta.pdf"):
+        _write_pdf(folder / name)
+    monkeypatch.setattr(config, "PITCH_DECKS_FOLDER", str(folder))
+    monkeypatch.setattr(config, "PDF_TEXT_CACHE_DIR", str(tmp_path / "pdf_text"))
+    monkeypatch.setattr(config, "PDF_EXTRACT_WORKERS", 1)
+    monkeypatch.setattr(config, "RESULTS_FILE_PATH", str(tmp_path / "results" / "query_results.jsonl"))
+    monkeypatch.setattr(config, "MARKDOWN_RESULTS_DIR", str(tmp_path / "results" / "markdown"))
+    monkeypatch.setattr(api_main, "rag_pipeline", StubPipeline())
+    yield TestClient(api_main.app)
+    results_saver.close_results_writer()
+
+
+def _events(response):
+    return [(block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+            for block in response.text.strip().split("\n\n")]
+
+
+def test_batch_from_pitch_decks_folder(client):
+    response = client.post("/api/batch", data={"use_pitch_decks_folder": "true"})
+    assert response.status_code == 200
+    events = _events(response)
+    assert sorted(data["deck"] for event, data in events if event == "deck") == ["alpha.pdf", "beta.pdf"]
+    assert events[-1] == ("done", {"completed": 2, "skipped": []})
+
+
+def test_batch_rejects_too_many_decks_before_reading_them(client, monkeypatch):
+    monkeypatch.setattr(config, "BATCH_MAX_DECKS", 1)
+    monkeypatch.setattr(api_main, "extract_texts_from_pdf_data",
+                        lambda *_: pytest.fail("decks were read before the count check"))
+    response = client.post("/api/batch", data={"use_pitch_decks_folder": "true"})
+    assert response.status_code == 400
@@ -0,0 +1,41 @@
+"""Regression tests for contact sheet loading in data_loader (run with pytest)."""
+import os
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")  # config requires a key; no request is ever sent
+
+import pandas as pd
+import pytest
+
+import config
+from data_loader import load_contact_data
+
+
+@pytest.fixture(autouse=True)
+def excel_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "EXCEL_CACHE_DIR", str(tmp_path / "excel_cache"))
+
+
+def test_text_only_contact_sheets_keep_their_contacts(tmp_path):
+    # All-text sheets get string-dtype columns, whose notna() mask is read-only under copy-on-write
+    contacts_file = tmp_path / "Investor DATA - Contacts (DFD).xlsx"
+    pd.DataFrame({
+        "First Name": ["Julie", "Sam", "Priya"],
+        "Last Name": ["Wolf", "Chen", "Patel"],
+        "Email": ["julie@alpha.vc", "sam@alpha.vc", "priya@north.vc"],
+        "Company": ["Alpha Capital", "Alpha Capital", "North Ventures"],
+        "City": ["New York", " ", "London"],
+    }).to_excel(contacts_file, index=False)
+    notes_file = tmp_path / "Investor DATA - Pitchbook Contacts.xlsx"
+    pd.DataFrame({
+        "Account Name": ["River Partners", "Summit Fund"],
+        "Notes": ["Met Tom Berg at demo day, tom@river.vc", "Warm intro through a portfolio founder"],
+    }).to_excel(notes_file, index=False)
+
+    contacts_by_firm = load_contact_data(str(contacts_file), str(notes_file))
+
+    assert {firm: len(contacts) for firm, contacts in contacts_by_firm.items()} == {
+        "alpha capital": 2, "north ventures": 1, "river partners": 1, "summit fund": 1,
+    }
+    julie, sam = contacts_by_firm["alpha capital"]
+    assert julie["email"] == "julie@alpha.vc" and julie["City"] == "New York"
+    assert "City" not in sam  # blank cells are dropped
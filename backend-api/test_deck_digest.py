@@ -0,0 +1,48 @@
+"""Regression tests for the deck profile caches in deck_digest (run with pytest)."""
+import asyncio
+import os
+from types import SimpleNamespace
+
+from deck_digest import DeckDigester
+
+
+class FakeAsyncMessages:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        deck = kwargs["messages"][0]["content"].rsplit("\n", 1)[-1]
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=f"Company: {deck}")])
+
+
+def make_digester(cache_dir, max_profiles=2):
+    messages = FakeAsyncMessages()
+    digester = DeckDigester(None, SimpleNamespace(messages=messages), cache_dir=str(cache_dir),
+                            max_profiles=max_profiles)
+    return digester, messages
+
+
+def test_adigest_persists_and_reloads_profiles(tmp_path):
+    digester, messages = make_digester(tmp_path)
+    assert asyncio.run(digester.adigest("deck one")) == "Company: deck one"
+    assert len(os.listdir(tmp_path)) == 1
+
+    fresh, fresh_messages = make_digester(tmp_path)
+    assert asyncio.run(fresh.adigest("deck one")) == "Company: deck one"
+    assert fresh_messages.calls == 0
+
+
+def test_memory_keeps_only_the_most_recent_profiles(tmp_path):
+    digester, messages = make_digester(tmp_path, max_profiles=2)
+
+    async def digest_all():
+        for deck in ("deck one", "deck two", "deck one", "deck three"):
+            await digester.adigest(deck)
+
+    asyncio.run(digest_all())
+    assert messages.calls == 3
+    assert len(digester._profiles) == 2
+    # "deck two" was least recently used; it comes back from disk without another Claude call
+    assert digester.get_cached("deck two") == "Company: deck two"
+    assert messages.calls == 3
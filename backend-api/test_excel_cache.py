@@ -0,0 +1,36 @@
+"""Regression tests for the parsed spreadsheet cache in excel_cache (run with pytest)."""
+import os
+import pickle
+
+import pandas as pd
+
+from excel_cache import read_excel_cached
+
+
+def write_sheet(tmp_path):
+    path = tmp_path / "investors.xlsx"
+    pd.DataFrame({"Account Name": ["Acme Capital", "North Ventures"]}).to_excel(path, index=False)
+    return str(path)
+
+
+def test_cached_frame_is_reused(tmp_path):
+    cache_dir = tmp_path / "cache"
+    path = write_sheet(tmp_path)
+    first = read_excel_cached(path, str(cache_dir))
+    assert [name for name in os.listdir(cache_dir) if name.endswith(".pkl")]
+    pd.testing.assert_frame_equal(read_excel_cached(path, str(cache_dir)), first)
+
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    path = write_sheet(tmp_path)
+
+    def fail_to_pickle(self, tmp_path, *args, **kwargs):
+        with open(tmp_path, "wb") as f:
+            f.write(b"partial")
+        raise pickle.PicklingError("cannot pickle")
+
+    monkeypatch.setattr(pd.DataFrame, "to_pickle", fail_to_pickle)
+    df = read_excel_cached(path, str(cache_dir))
+    assert list(df["Account Name"]) == ["Acme Capital", "North Ventures"]
+    assert os.listdir(cache_dir) == []
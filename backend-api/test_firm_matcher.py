@@ -0,0 +1,44 @@
+"""Regression tests for fuzzy firm-name matching in firm_matcher (run with pytest)."""
+from firm_matcher import FirmNameIndex, canonical_firm_name
+
+CONTACT_FIRMS = [
+    "founders fund", "first capital", "acme", "sequoia capital", "andreessen horowitz",
+    "general catalyst", "greycroft partners", "khosla ventures", "union square ventures", "blue harbor",
+]
+
+
+def test_canonical_name_strips_article_punctuation_and_suffixes():
+    assert canonical_firm_name("The Blue Harbor Capital Partners, LLC") == "blue harbor"
+    assert canonical_firm_name("Capital") == "capital"
+
+
+def test_suffix_variants_and_typos_match():
+    index = FirmNameIndex(CONTACT_FIRMS)
+    assert index.match("General Catalyst Partners") == "general catalyst"
+    assert index.match("Greycroft") == "greycroft partners"
+    assert index.match("The Blue Harbor, LLC") == "blue harbor"
+    assert index.match("Andreesen Horowitz") == "andreessen horowitz"
+    assert index.match("blue harbour") == "blue harbor"
+    assert index.match("BlueHarbor") == "blue harbor"
+
+
+def test_containment_of_two_distinctive_words_matches():
+    index = FirmNameIndex(CONTACT_FIRMS)
+    assert index.match("Union Square") == "union square ventures"
+    assert index.match("Union Square Ventures Growth") == "union square ventures"
+
+
+def test_shared_first_word_is_not_a_match():
+    index = FirmNameIndex(CONTACT_FIRMS)
+    assert index.match("Founders Factory") is None
+    assert index.match("First Round Capital") is None
+    assert index.match("Khosla Impact") is None
+    assert index.match("Acme Growth") is None
+    assert index.match("Sequoia Capital China") is None
+
+
+def test_near_miss_prefers_the_right_firm_when_both_exist():
+    index = FirmNameIndex(CONTACT_FIRMS + ["founders factory", "first round capital"])
+    assert index.match("Founders Factory") == "founders factory"
+    assert index.match("First Round") == "first round capital"
+    assert index.match("Founders Fund LP") == "founders fund"
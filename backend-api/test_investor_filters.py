@@ -0,0 +1,53 @@
+"""Regression tests for check/raise size parsing and where filters in investor_filters (run with pytest)."""
+from investor_filters import (UNBOUNDED_CHECK_USD, build_where_filter, matches_where, parse_amounts,
+                              parse_check_range, parse_query_constraints)
+
+
+def test_business_model_tokens_are_not_amounts():
+    assert parse_amounts("B2B") == []
+    assert parse_amounts("B2C and B2B2C marketplaces") == []
+    constraints = parse_query_constraints("B2B fintech seed investors")
+    assert constraints.check_size_usd is None
+    assert constraints.raise_size_usd is None
+    assert build_where_filter(constraints) == {"$or": [{"stage_seed": True}, {"stage_unknown": True}]}
+
+
+def test_metrics_are_not_check_sizes():
+    for query in ("Series A SaaS with 10 m ARR", "Climate investors for a $5B market", "Fintech with $2M revenue"):
+        constraints = parse_query_constraints(query)
+        assert constraints.check_size_usd is None, query
+        assert constraints.raise_size_usd is None, query
+
+
+def test_amounts_next_to_check_wording():
+    assert parse_query_constraints("Seed investors writing $500K checks").check_size_usd == 500_000
+    assert parse_query_constraints("angels with $250k tickets in Europe").check_size_usd == 250_000
+
+
+def test_amounts_next_to_raise_wording():
+    constraints = parse_query_constraints("We are raising a $2M seed round")
+    assert constraints.raise_size_usd == 2_000_000
+    assert constraints.check_size_usd is None
+
+
+def test_deck_raise_size_skips_other_amounts():
+    deck = "Acme - B2B payments\nWe grew to $1.2M ARR in 2023.\nWe are raising $3M to expand."
+    assert parse_query_constraints("Which investors fit?", deck).raise_size_usd == 3_000_000
+
+
+def test_profile_check_ranges_still_parse():
+    assert parse_check_range("$500K-$1M") == (500_000, 1_000_000)
+    assert parse_check_range("$10M+") == (10_000_000, UNBOUNDED_CHECK_USD)
+    assert parse_check_range("US$2M") == (2_000_000, 2_000_000)
+
+
+def test_matches_where_applies_built_filters():
+    where = build_where_filter(parse_query_constraints("Seed investors writing $500K checks"))
+    seed_fund = {"stage_seed": True, "stage_unknown": False, "check_min_usd": 250_000.0, "check_max_usd": 1_000_000.0}
+    growth_fund = {"stage_seed": False, "stage_unknown": False, "check_min_usd": 250_000.0, "check_max_usd": 1_000_000.0}
+    big_checks = dict(seed_fund, check_min_usd=5_000_000.0, check_max_usd=20_000_000.0)
+    assert matches_where(seed_fund, where)
+    assert not matches_where(growth_fund, where)
+    assert not matches_where(big_checks, where)
+    assert not matches_where({}, where)
+    assert matches_where({}, None)
@@ -0,0 +1,38 @@
+"""Regression tests for prompt cache breakpoints in InvestorRAGPipeline._build_prompts (run with pytest)."""
+import pytest
+
+import config
+from rag_pipeline import InvestorRAGPipeline, SYSTEM_PROMPT
+
+INVESTORS = [{"metadata": {"Account Name": "Acme Capital", "Stage": "Seed"}}]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(config, "PROMPT_CACHING_ENABLED", True)
+    # Prompt building needs no clients or vector store
+    return InvestorRAGPipeline.__new__(InvestorRAGPipeline)
+
+
+def cached_blocks(system_blocks, user_blocks):
+    return [block["text"] for block in system_blocks + user_blocks if "cache_control" in block]
+
+
+def test_query_without_deck_has_no_breakpoint(pipeline):
+    # The system prompt alone is under the minimum Anthropic caches
+    assert len(SYSTEM_PROMPT) / config.PROMPT_CHARS_PER_TOKEN < config.PROMPT_CACHE_MIN_TOKENS
+    assert cached_blocks(*pipeline._build_prompts("seed fintech", INVESTORS)) == []
+
+
+def test_long_deck_prefix_is_cached(pipeline):
+    deck = "Acme builds payments infrastructure for clinics. " * 200
+    system_blocks, user_blocks = pipeline._build_prompts("seed fintech", INVESTORS, pitch_deck_text=deck)
+    assert cached_blocks(system_blocks, user_blocks) == [user_blocks[0]["text"]]
+    assert deck in user_blocks[0]["text"]
+    assert "seed fintech" not in user_blocks[0]["text"]
+
+
+def test_short_deck_profile_is_not_marked(pipeline):
+    prompts = pipeline._build_prompts("seed fintech", INVESTORS, pitch_deck_text="full deck",
+                                      deck_profile="Company: Acme\nStage: Seed")
+    assert cached_blocks(*prompts) == []
@@ -0,0 +1,65 @@
+"""Regression tests for the query results log and markdown files in results_saver (run with pytest)."""
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+import config
+import results_saver
+
+
+@pytest.fixture
+def results_paths(tmp_path, monkeypatch):
+    markdown_dir = tmp_path / "markdown"
+    monkeypatch.setattr(config, "MARKDOWN_RESULTS_DIR", str(markdown_dir))
+    return str(tmp_path / "query_results.jsonl"), markdown_dir
+
+
+def test_convert_skips_results_saved_with_the_current_names(results_paths):
+    results_file, markdown_dir = results_paths
+    results_saver.save_query_result("Seed fintech investors", "answer", "Acme Deck.pdf", results_file)
+    results_saver.save_query_result("Seed fintech investors", "answer", None, results_file)
+
+    assert results_saver.convert_json_to_markdown(results_file) == 0
+    assert len(os.listdir(markdown_dir)) == 2
+
+
+def test_convert_skips_markdown_written_with_the_legacy_name(results_paths):
+    results_file, markdown_dir = results_paths
+    timestamp = datetime(2025, 1, 31, 9, 30, 15, 123456)
+    entry = {"timestamp": timestamp.isoformat(), "query": "Climate funds in Europe",
+             "response": "answer", "pitch_deck": "Deck.pdf"}
+    with open(results_file, "w", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    markdown_dir.mkdir()
+    (markdown_dir / "2025-01-31_09-30-15_Climate-funds-in-Europe.md").write_text("saved earlier")
+
+    assert results_saver.convert_json_to_markdown(results_file) == 0
+    assert os.listdir(markdown_dir) == ["2025-01-31_09-30-15_Climate-funds-in-Europe.md"]
+
+
+def test_convert_writes_missing_markdown_once(results_paths):
+    results_file, markdown_dir = results_paths
+    results_saver.save_query_result("Seed fintech investors", "answer", "Acme Deck.pdf", results_file)
+    for name in os.listdir(markdown_dir):
+        os.remove(markdown_dir / name)
+
+    assert results_saver.convert_json_to_markdown(results_file) == 1
+    assert results_saver.convert_json_to_markdown(results_file) == 0
+
+
+def test_rotation_while_iterating_neither_skips_nor_repeats(results_paths, monkeypatch):
+    results_file, _ = results_paths
+    monkeypatch.setattr(config, "RESULTS_ROTATE_MAX_BYTES", 600)
+    for i in range(4):
+        results_saver.save_query_result(f"query {i}", "x" * 200, None, results_file)
+
+    results = results_saver.load_query_results(results_file)
+    seen = [next(results)["query"]]
+    # Fills the active log past the limit, so it is rotated into a new segment
+    results_saver.save_query_result("query 4", "x" * 200, None, results_file)
+    seen += [result["query"] for result in results]
+
+    assert seen == [f"query {i}" for i in range(4)]
+    assert [r["query"] for r in results_saver.load_query_results(results_file)] == [f"query {i}" for i in range(5)]
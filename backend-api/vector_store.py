@@ -7,20 +7,44 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
+import hashlib
 import json
+import math
+import threading
+import numpy as np
+import config
+import metrics
+from bm25_index import BM25Index, reciprocal_rank_fusion
 from data_loader import get_investor_data
+from embeddings import CachedEmbeddingFunction, open_collection
+from investor_filters import FILTER_VERSION, matches_where, profile_filter_fields
+from profile_store import InvestorRecord, ProfileStore
+
+# Scalar profile fields kept in Chroma metadata for filtering; full profiles live in the ProfileStore
+FILTERABLE_FIELDS = ['Account Name', 'Investor Type', 'Fund Type', 'Stage',
+                     'Investor Focus Area', 'Check Size', 'Geographic Focus']
+# Blobs older databases stored in Chroma metadata (cleared on migration)
+LEGACY_METADATA_KEYS = ['full_text', 'json_data']
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, so dot products are cosine similarities."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
 
 
 class InvestorVectorStore:
     """Vector database for investor search using embeddings."""
     
-    def __init__(self, persist_directory: str = "vector_db"):
+    def __init__(self, persist_directory: str = "vector_db", sync: bool = False):
         """
         Initialize vector store. Creates embeddings if not exists.
         
         Args:
             persist_directory: Directory to store the vector database
+            sync: If True, re-read the Excel data and apply only the changed
+                investors to an existing collection (see sync()).
         """
         # Create directory if it doesn't exist
         os.makedirs(persist_directory, exist_ok=True)
@@ -29,14 +53,16 @@ class InvestorVectorStore:
             path=persist_directory,
             settings=Settings(anonymized_telemetry=False)
         )
-        self.collection = self.client.get_or_create_collection(
-            name="investors",
-            metadata={"hnsw:space": "cosine"}
-        )
-        self._ensure_data_loaded()
+        # Configured embedding backend behind a disk cache; documents and queries are embedded here, not by Chroma
+        self.embedding_function = CachedEmbeddingFunction()
+        self.collection = open_collection(self.client, "investors", self.embedding_function)
+        self.profile_store = ProfileStore(os.path.join(persist_directory, "profiles.sqlite3"))
+        self._keyword_index: Optional[BM25Index] = None
+        self._keyword_index_lock = threading.Lock()
+        self._ensure_data_loaded(sync=sync)
     
-    def _ensure_data_loaded(self):
-        """Check if data is loaded, if not, load and embed."""
+    def _ensure_data_loaded(self, sync: bool = False):
+        """Check if data is loaded, if not, load and embed. Optionally sync changes."""
         count = self.collection.count()
         if count == 0:
             print("=" * 60)
@@ -45,7 +71,14 @@ class InvestorVectorStore:
             print("=" * 60)
             self._load_and_embed_investors()
         else:
-            print(f"✓ Loaded vector database with {count} investor embeddings (cached).\n")
+            if self.profile_store.count() < count:
+                self._migrate_legacy_metadata()
+            self._refresh_filter_metadata()
+            # Records without stored profile data can only be rebuilt from the Excel files
+            if sync or self.profile_store.count() < count:
+                self.sync()
+            else:
+                print(f"✓ Loaded vector database with {count} investor embeddings (cached).\n")
     
     def _load_and_embed_investors(self):
         """Load investors from Excel and create embeddings."""
@@ -53,10 +86,94 @@ class InvestorVectorStore:
         profiles = get_investor_data()
         print(f"Loaded {len(profiles)} investors. Creating embeddings...")
         
-        # Create concise summaries for embeddings (not full profiles)
+        ids, documents, metadatas, profile_rows = self._build_records(profiles)
+        
+        print(f"  Adding {len(profiles)} investors to vector database...")
+        self._upsert_in_batches(ids, documents, metadatas)
+        self.profile_store.upsert_many(profile_rows)
+        
+        print(f"✓ Successfully processed and embedded {len(profiles)} investors!")
+        print("  Future queries will use cached embeddings (no re-processing needed).\n")
+    
+    def sync(self) -> Dict[str, int]:
+        """
+        Bring the collection in line with the current Excel data.
+        
+        Only investors whose content hash changed (or that are new) are
+        re-embedded, and investors no longer present in the data are deleted,
+        so a daily data drop costs a few seconds instead of a full rebuild.
+        
+        Returns:
+            Dictionary with 'added', 'updated', 'deleted' and 'unchanged' counts
+        """
+        print("Syncing vector database with investor data from Excel files...")
+        profiles = get_investor_data()
+        ids, documents, metadatas, profile_rows = self._build_records(profiles)
+        stored_hashes = self.profile_store.hashes()
+        
+        # Existing hashes (records embedded before hashing was introduced have none)
+        existing = self.collection.get(include=["metadatas"])
+        existing_hashes = {
+            investor_id: (metadata or {}).get("content_hash")
+            for investor_id, metadata in zip(existing['ids'], existing['metadatas'])
+        }
+        
+        changed_ids, changed_documents, changed_metadatas = [], [], []
+        changed_profile_rows = []
+        added = updated = 0
+        for investor_id, document, metadata, profile_row in zip(ids, documents, metadatas, profile_rows):
+            if stored_hashes.get(investor_id) != metadata["content_hash"]:
+                changed_profile_rows.append(profile_row)
+            if investor_id not in existing_hashes:
+                added += 1
+            elif existing_hashes[investor_id] != metadata["content_hash"]:
+                updated += 1
+            else:
+                continue
+            changed_ids.append(investor_id)
+            changed_documents.append(document)
+            changed_metadatas.append(metadata)
+        
+        current_ids = set(ids)
+        removed_ids = [investor_id for investor_id in existing_hashes if investor_id not in current_ids]
+        removed_profile_ids = [investor_id for investor_id in stored_hashes if investor_id not in current_ids]
+        
+        if changed_ids:
+            print(f"  Embedding {len(changed_ids)} new/changed investors...")
+            self._upsert_in_batches(changed_ids, changed_documents, changed_metadatas)
+        if changed_profile_rows:
+            self.profile_store.upsert_many(changed_profile_rows)
+        if removed_ids:
+            print(f"  Removing {len(removed_ids)} investors no longer in the data...")
+            batch_size = 100
+            for i in range(0, len(removed_ids), batch_size):
+                self.collection.delete(ids=removed_ids[i:i + batch_size])
+        if removed_profile_ids:
+            self.profile_store.delete_many(removed_profile_ids)
+        if changed_profile_rows or removed_profile_ids:
+            self._keyword_index = None  # rebuilt from the updated profiles on next use
+        
+        stats = {
+            "added": added,
+            "updated": updated,
+            "deleted": len(removed_ids),
+            "unchanged": len(ids) - len(changed_ids),
+        }
+        print(f"✓ Sync complete: {stats['added']} added, {stats['updated']} updated, "
+              f"{stats['deleted']} deleted, {stats['unchanged']} unchanged.\n")
+        return stats
+    
+    def _build_records(self, profiles: List[Dict]) -> Tuple[List[str], List[str], List[Dict], List[Tuple]]:
+        """
+        Build Chroma ids, documents and compact metadatas, plus ProfileStore rows, for profiles.
+        
+        Returns:
+            Tuple of (ids, documents, metadatas, profile rows as (id, text, json_data, content_hash))
+        """
         documents = []
         metadatas = []
         ids = []
+        profile_rows = []
         
         for i, profile in enumerate(profiles):
             if (i + 1) % 100 == 0:
@@ -66,30 +183,104 @@ class InvestorVectorStore:
             summary = self._create_concise_summary(profile)
             documents.append(summary)
             
-            # Store full data in metadata (for retrieval)
-            metadatas.append({
-                "full_text": profile['text'],
-                "investor_id": profile['id'],
-                "json_data": json.dumps(profile['metadata'], default=str)  # default=str handles any non-serializable types
-            })
+            json_data = json.dumps(profile['metadata'], default=str)  # default=str handles any non-serializable types
+            content_hash = self._compute_content_hash(summary, json_data)
+            
+            # Chroma only gets filterable scalars; the full profile goes to the ProfileStore
+            metadata = self._filterable_metadata(profile['metadata'])
+            metadata["investor_id"] = profile['id']
+            metadata["content_hash"] = content_hash
+            metadatas.append(metadata)
             ids.append(profile['id'])
+            profile_rows.append((profile['id'], profile['text'], json_data, content_hash))
         
-        print(f"  Adding {len(profiles)} investors to vector database...")
+        return ids, documents, metadatas, profile_rows
+    
+    @staticmethod
+    def _filterable_metadata(profile_metadata: Dict) -> Dict:
+        """
+        Scalar fields to store in Chroma for a profile.
+        
+        Absent fields (and legacy blob keys) are set to None, which makes Chroma's
+        upsert remove them from records that previously had them. Normalized
+        stage/geography/type/check size fields are added for `where` filtering.
+        """
+        metadata = {key: None for key in LEGACY_METADATA_KEYS}
+        for field in FILTERABLE_FIELDS:
+            value = profile_metadata.get(field)
+            if isinstance(value, (bool, int, float)) or (isinstance(value, str) and value.strip()):
+                metadata[field] = value
+            else:
+                metadata[field] = None
+        metadata.update(profile_filter_fields(profile_metadata))
+        return metadata
+    
+    def _refresh_filter_metadata(self):
+        """Recompute normalized filter fields for records built with an older FILTER_VERSION."""
+        existing = self.collection.get(include=["metadatas"])
+        stale_ids = [
+            investor_id for investor_id, metadata in zip(existing['ids'], existing['metadatas'])
+            if (metadata or {}).get("filter_version") != FILTER_VERSION
+        ]
+        if not stale_ids:
+            return
         
-        # Add to collection in batches (ChromaDB auto-generates embeddings)
+        print(f"Updating search filter fields for {len(stale_ids)} investors...")
+        records = self.profile_store.get_many(stale_ids)
+        update_ids = [investor_id for investor_id in stale_ids if investor_id in records]
+        update_metadatas = [self._filterable_metadata(records[investor_id].metadata) for investor_id in update_ids]
         batch_size = 100
+        for i in range(0, len(update_ids), batch_size):
+            self.collection.update(ids=update_ids[i:i + batch_size],
+                                   metadatas=update_metadatas[i:i + batch_size])
+    
+    def _migrate_legacy_metadata(self):
+        """Move full profiles out of Chroma metadata (older databases) into the ProfileStore."""
+        print("Moving investor profiles out of the vector database metadata...")
+        existing = self.collection.get(include=["metadatas"])
+        stored_ids = set(self.profile_store.hashes())
+        
+        profile_rows = []
+        update_ids, update_metadatas = [], []
+        for investor_id, metadata in zip(existing['ids'], existing['metadatas']):
+            metadata = metadata or {}
+            if investor_id in stored_ids or 'json_data' not in metadata:
+                continue
+            profile_rows.append((investor_id, metadata.get('full_text', ''), metadata['json_data'],
+                                 metadata.get('content_hash', '')))
+            compact = self._filterable_metadata(json.loads(metadata['json_data']))
+            update_ids.append(investor_id)
+            update_metadatas.append(compact)
+        
+        if profile_rows:
+            self.profile_store.upsert_many(profile_rows)
+            batch_size = 100
+            for i in range(0, len(update_ids), batch_size):
+                self.collection.update(ids=update_ids[i:i + batch_size],
+                                       metadatas=update_metadatas[i:i + batch_size])
+            print(f"  Moved {len(profile_rows)} profiles.")
+    
+    @staticmethod
+    def _compute_content_hash(summary: str, json_data: str) -> str:
+        """Hash the embedded summary and stored data so changes can be detected."""
+        digest = hashlib.sha256()
+        digest.update(summary.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(json_data.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _upsert_in_batches(self, ids: List[str], documents: List[str], metadatas: List[Dict], batch_size: int = 100):
+        """Embed and upsert records in batches (unchanged summaries come from the embedding cache)."""
         for i in range(0, len(documents), batch_size):
             batch_end = min(i + batch_size, len(documents))
-            self.collection.add(
+            self.collection.upsert(
                 documents=documents[i:batch_end],
+                embeddings=self.embedding_function(documents[i:batch_end]),
                 metadatas=metadatas[i:batch_end],
                 ids=ids[i:batch_end]
             )
             if batch_end < len(documents):
                 print(f"  Processed batch {i//batch_size + 1}...")
-        
-        print(f"✓ Successfully processed and embedded {len(profiles)} investors!")
-        print("  Future queries will use cached embeddings (no re-processing needed).\n")
     
     def _create_concise_summary(self, profile: Dict) -> str:
         """Create a concise summary of investor for embedding/search."""
@@ -127,52 +318,264 @@ class InvestorVectorStore:
         
         return " | ".join(parts)
     
-    def search(self, query: str, n_results: int = 10) -> List[Dict]:
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query string with the collection's embedding function."""
+        return [float(x) for x in self.embedding_function([query])[0]]
+    
+    def search(self, query: str, n_results: int = 10, query_embedding: Optional[List[float]] = None,
+               where: Optional[Dict] = None, deck_embeddings: Optional[List[List[float]]] = None) -> List[Dict]:
         """
         Semantic search for investors.
         
         Args:
             query: Search query
             n_results: Number of results to return
+            query_embedding: Precomputed embedding of the query (skips re-embedding it)
+            where: Chroma metadata filter applied inside the index (see investor_filters.build_where_filter)
+            deck_embeddings: Pitch deck chunk embeddings; investors are then ranked on
+                the query and the deck together (see _multi_vector_ids)
+            
+        Returns:
+            List of investor profiles with full data
+        """
+        return self._load_profiles(self._vector_ids(query, n_results, query_embedding, where, deck_embeddings))
+    
+    def keyword_search(self, query: str, n_results: int = 10, where: Optional[Dict] = None) -> List[Dict]:
+        """
+        BM25 keyword search for investors (exact firm, portfolio company and term matches).
+        
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            where: Chroma metadata filter restricting the candidates
+            
+        Returns:
+            List of investor profiles with full data
+        """
+        return self._load_profiles(self._keyword_ids(query, n_results, where))
+    
+    def hybrid_search(self, query: str, n_results: int = 10, query_embedding: Optional[List[float]] = None,
+                      where: Optional[Dict] = None, deck_embeddings: Optional[List[List[float]]] = None) -> List[Dict]:
+        """
+        Vector and BM25 search fused with reciprocal rank fusion.
+        
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            query_embedding: Precomputed embedding of the query (skips re-embedding it)
+            where: Chroma metadata filter applied to both retrievers
+            deck_embeddings: Pitch deck chunk embeddings for the vector retriever (see search)
             
         Returns:
             List of investor profiles with full data
         """
+        candidate_count = n_results * config.HYBRID_CANDIDATE_MULTIPLIER
+        vector_ids = self._vector_ids(query, candidate_count, query_embedding, where, deck_embeddings)
+        keyword_ids = self._keyword_ids(query, candidate_count, where)
+        fused = reciprocal_rank_fusion([vector_ids, keyword_ids], k=config.RRF_K)
+        return self._load_profiles([investor_id for investor_id, _ in fused[:n_results]])
+    
+    def batch_search(self, queries: List[str], n_results: int = 10, wheres: Optional[List[Optional[Dict]]] = None,
+                     mode: str = "hybrid") -> List[List[Dict]]:
+        """
+        Search for many queries at once.
+        
+        All queries are embedded in one call and sent to Chroma in one unfiltered
+        query; each query's filter is then applied to its candidates in memory (parsed
+        raise sizes make nearly every deck's filter unique). Only queries whose filter
+        leaves too few of the shared candidates get a filtered query of their own. The
+        profiles for every result come from one store lookup.
+        
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+            wheres: Chroma metadata filter per query (None = unfiltered)
+            mode: "hybrid", "vector" or "keyword"
+            
+        Returns:
+            List of investor profile lists, one per query
+        """
+        if wheres is None:
+            wheres = [None] * len(queries)
+        allowed = self._allowed_ids_many(wheres)
+        if mode == "keyword":
+            return self._load_profiles_many([self._keyword_ids_within(q, n_results, a)
+                                             for q, a in zip(queries, allowed)])
+        
+        candidate_count = n_results * config.HYBRID_CANDIDATE_MULTIPLIER if mode == "hybrid" else n_results
+        with metrics.time_stage("embedding"):
+            embeddings = [[float(x) for x in embedding] for embedding in self.embedding_function(queries)]
+        
+        # Filtered queries draw from the widest candidate set one query may fetch
+        shared_count = config.ANN_MAX_RESULTS if any(wheres) else candidate_count
+        vector_ranked: List[List[str]] = []
+        requery = []
+        for i, (investor_ids, allowed_ids) in enumerate(zip(self._vector_ids_many(embeddings, shared_count, None),
+                                                            allowed)):
+            if allowed_ids is not None:
+                investor_ids = [investor_id for investor_id in investor_ids if investor_id in allowed_ids]
+                if len(investor_ids) < min(n_results, len(allowed_ids)):
+                    requery.append(i)
+            vector_ranked.append(investor_ids[:candidate_count])
+        for i in requery:
+            vector_ranked[i] = self._vector_ids_many([embeddings[i]], candidate_count, wheres[i])[0]
+        
+        if mode == "vector":
+            return self._load_profiles_many(vector_ranked)
+        ranked_ids = []
+        for query, allowed_ids, vector_ids in zip(queries, allowed, vector_ranked):
+            keyword_ids = self._keyword_ids_within(query, candidate_count, allowed_ids)
+            fused = reciprocal_rank_fusion([vector_ids, keyword_ids], k=config.RRF_K)
+            ranked_ids.append([investor_id for investor_id, _ in fused[:n_results]])
+        return self._load_profiles_many(ranked_ids)
+    
+    def _allowed_ids_many(self, wheres: List[Optional[Dict]]) -> List[Optional[Set[str]]]:
+        """
+        Investor ids passing each filter, from one read of the stored metadata.
+        
+        None means unfiltered: no filter, or a filter nothing passes (the same
+        fallback as the vector search).
+        """
+        if not any(wheres):
+            return [None] * len(wheres)
+        stored = self.collection.get(include=["metadatas"])
+        allowed_by_filter: Dict[str, Optional[Set[str]]] = {}
+        allowed = []
+        for where in wheres:
+            if not where:
+                allowed.append(None)
+                continue
+            key = json.dumps(where, sort_keys=True)
+            if key not in allowed_by_filter:
+                allowed_by_filter[key] = {
+                    investor_id for investor_id, metadata in zip(stored['ids'], stored['metadatas'])
+                    if matches_where(metadata or {}, where)
+                } or None
+            allowed.append(allowed_by_filter[key])
+        return allowed
+    
+    def _vector_ids(self, query: str, n_results: int, query_embedding: Optional[List[float]],
+                    where: Optional[Dict], deck_embeddings: Optional[List[List[float]]] = None) -> List[str]:
+        """Investor ids ranked by embedding similarity."""
+        if query_embedding is None:
+            with metrics.time_stage("embedding"):
+                query_embedding = self.embed_query(query)
+        if deck_embeddings:
+            return self._multi_vector_ids(query_embedding, deck_embeddings, n_results, where)
+        return self._vector_ids_many([query_embedding], n_results, where)[0]
+    
+    def _multi_vector_ids(self, query_embedding: List[float], deck_embeddings: List[List[float]],
+                          n_results: int, where: Optional[Dict]) -> List[str]:
+        """
+        Investor ids ranked on the query and the pitch deck together.
+        
+        Candidates come from one budget of n_results * DECK_CANDIDATE_MULTIPLIER
+        neighbours: the query vector gets n_results of it and the deck chunks share
+        the rest, so longer decks do not widen the search. Each candidate scores
+        (1 - DECK_RETRIEVAL_WEIGHT) * sim(query) + DECK_RETRIEVAL_WEIGHT * max over chunks sim(chunk),
+        with cosine similarities computed exactly from the stored embeddings.
+        """
+        budget = n_results * config.DECK_CANDIDATE_MULTIPLIER
+        per_chunk = max(1, math.ceil((budget - n_results) / len(deck_embeddings)))
+        candidate_lists = self._vector_ids_many([query_embedding], n_results, where)
+        candidate_lists += self._vector_ids_many(deck_embeddings, per_chunk, where)
+        candidate_ids = list(dict.fromkeys(i for ids in candidate_lists for i in ids))
+        if not candidate_ids:
+            return []
+        
+        with metrics.time_stage("multi_vector_scoring"):
+            stored = self.collection.get(ids=candidate_ids, include=["embeddings"])
+            investors = _normalize_rows(np.asarray(stored['embeddings'], dtype=np.float32))
+            query = _normalize_rows(np.asarray([query_embedding], dtype=np.float32))[0]
+            chunks = _normalize_rows(np.asarray(deck_embeddings, dtype=np.float32))
+            
+            weight = config.DECK_RETRIEVAL_WEIGHT
+            scores = (1 - weight) * (investors @ query) + weight * (investors @ chunks.T).max(axis=1)
+            order = np.argsort(-scores, kind="stable")[:n_results]
+            return [stored['ids'][i] for i in order]
+    
+    def _vector_ids_many(self, query_embeddings: List[List[float]], n_results: int,
+                         where: Optional[Dict]) -> List[List[str]]:
+        """
+        Investor ids ranked by embedding similarity, for several embeddings in one Chroma query.
+        
+        At most ANN_MAX_RESULTS neighbours are requested per embedding. Only a
+        collection smaller than that is returned whole (a full scan, cheap at that size).
+        """
         total_count = self.collection.count()
         if total_count == 0:
-            return []
+            return [[] for _ in query_embeddings]
         
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=min(n_results, total_count)
-        )
+        query_args = {
+            "n_results": min(n_results, config.ANN_MAX_RESULTS, total_count),
+            "include": ["distances"],  # profiles come from the profile store
+        }
         
-        # Reconstruct full investor profiles
-        investors = []
-        if results['ids'] and len(results['ids'][0]) > 0:
-            for i, investor_id in enumerate(results['ids'][0]):
-                metadata = results['metadatas'][0][i]
-                try:
-                    investors.append({
-                        'id': investor_id,
-                        'text': metadata['full_text'],
-                        'metadata': json.loads(metadata['json_data'])
-                    })
-                except Exception as e:
-                    print(f"Warning: Error loading investor {investor_id}: {str(e)}")
+        with metrics.time_stage("ann_query"):
+            if not where:
+                return self.collection.query(query_embeddings=query_embeddings, **query_args)['ids']
+            
+            ranked = self.collection.query(query_embeddings=query_embeddings, where=where, **query_args)['ids']
+            empty = [i for i, investor_ids in enumerate(ranked) if not investor_ids]
+            if empty:
+                # Over-constrained query: better to show near matches than nothing
+                print("No investors match the query's constraints; searching without filters.")
+                unfiltered = self.collection.query(query_embeddings=[query_embeddings[i] for i in empty],
+                                                   **query_args)['ids']
+                for i, investor_ids in zip(empty, unfiltered):
+                    ranked[i] = investor_ids
+            return ranked
+    
+    def _keyword_ids(self, query: str, n_results: int, where: Optional[Dict]) -> List[str]:
+        """Investor ids ranked by BM25 score."""
+        allowed_ids: Optional[Set[str]] = None
+        if where:
+            allowed_ids = set(self.collection.get(where=where, include=[])['ids'])
+            if not allowed_ids:
+                allowed_ids = None  # same fallback as the vector search
+        return self._keyword_ids_within(query, n_results, allowed_ids)
+    
+    def _keyword_ids_within(self, query: str, n_results: int, allowed_ids: Optional[Set[str]]) -> List[str]:
+        """Investor ids ranked by BM25 score, among allowed_ids (None = all)."""
+        index = self.keyword_index()
+        with metrics.time_stage("keyword_search"):
+            return [investor_id for investor_id, _ in index.search(query, n_results, allowed_ids)]
+    
+    def keyword_index(self) -> BM25Index:
+        """BM25 index over the stored profiles, built on first use."""
+        index = self._keyword_index
+        if index is None:
+            with self._keyword_index_lock:
+                index = self._keyword_index
+                if index is None:
+                    index = BM25Index(self.profile_store.all_records())
+                    self._keyword_index = index
+        return index
+    
+    def _load_profiles(self, investor_ids: List[str]) -> List[Dict]:
+        """Join ranked ids against the profile store, keeping their order."""
+        return self._load_profiles_many([investor_ids])[0]
+    
+    def _load_profiles_many(self, ranked_ids: List[List[str]]) -> List[List[Dict]]:
+        """Join several ranked id lists against the profile store in one lookup."""
+        with metrics.time_stage("profile_load"):
+            records = self.profile_store.get_many(list(dict.fromkeys(i for ids in ranked_ids for i in ids)))
+        results = []
+        for investor_ids in ranked_ids:
+            investors = []
+            for investor_id in investor_ids:
+                record = records.get(investor_id)
+                if record is None:
+                    print(f"Warning: No stored profile for investor {investor_id}")
                     continue
-        
-        return investors
+                investors.append(record)
+            results.append(investors)
+        return results
     
-    def get_full_profile(self, investor_id: str) -> Dict:
+    def get_full_profile(self, investor_id: str) -> Optional[InvestorRecord]:
         """Get full investor profile by ID."""
-        results = self.collection.get(ids=[investor_id])
-        if results['metadatas']:
-            metadata = results['metadatas'][0]
-            return {
-                'id': investor_id,
-                'text': metadata['full_text'],
-                'metadata': json.loads(metadata['json_data'])
-            }
-        return None
+        return self.profile_store.get(investor_id)
 
+if __name__ == "__main__":
+    # Apply the latest Excel data to the existing vector database incrementally
+    InvestorVectorStore(sync=True)
@@ -4,10 +4,10 @@ import { useState, KeyboardEvent, useRef, useEffect } from 'react'
 import { Send, Loader2 } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { useChatStore } from '@/lib/store'
-import { cn } from '@/lib/utils'
+import { cn, readServerSentEvents } from '@/lib/utils'
 
 export default function ChatInput() {
-  const { isLoading, addMessage, setLoading, setError, currentPitchDeck } = useChatStore()
+  const { isLoading, addMessage, appendToMessage, setLoading, setError, currentPitchDeck } = useChatStore()
   const [input, setInput] = useState('')
   const textareaRef = useRef<HTMLTextAreaElement>(null)
 
@@ -41,15 +41,51 @@ export default function ChatInput() {
     }
 
     try {
+      const requestBody = JSON.stringify({
+        query: userMessage.content,
+        pitchDeckText: currentPitchDeck?.textContent || null,
+        deckId: currentPitchDeck?.id || null,
+      })
+
+      // Stream the answer so text appears as soon as Claude starts generating
+      const streamResponse = await fetch('/api/chat/stream', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: requestBody,
+      })
+
+      if (streamResponse.ok && streamResponse.body) {
+        const assistantMessageId = (Date.now() + 1).toString()
+        let started = false
+
+        for await (const { event, data } of readServerSentEvents(streamResponse.body)) {
+          if (event === 'delta') {
+            if (!started) {
+              addMessage({
+                id: assistantMessageId,
+                role: 'assistant' as const,
+                content: '',
+                timestamp: new Date(),
+              })
+              started = true
+            }
+            appendToMessage(assistantMessageId, data.text)
+          } else if (event === 'error') {
+            throw new Error(data.detail || 'Failed to get response')
+          }
+        }
+        return
+      }
+
+      // Streaming unavailable - fall back to the single-response endpoint
       const response = await fetch('/api/chat', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({
-          query: userMessage.content,
-          pitchDeckText: currentPitchDeck?.textContent || null,
-        }),
+        body: requestBody,
       })
 
       if (!response.ok) {
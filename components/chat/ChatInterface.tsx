@@ -10,6 +10,9 @@ import { AlertCircle, Sparkles } from 'lucide-react'
 export default function ChatInterface() {
   const { messages, isLoading, error, currentPitchDeck } = useChatStore()
   const messagesEndRef = useRef<HTMLDivElement>(null)
+  // Hide the typing indicator once a streamed answer starts arriving
+  const isWaitingForFirstToken =
+    isLoading && messages[messages.length - 1]?.role !== 'assistant'
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' })
@@ -148,7 +151,7 @@ export default function ChatInterface() {
                 <ChatMessage key={message.id} message={message} />
               ))}
 
-              {isLoading && (
+              {isWaitingForFirstToken && (
                 <div className="group w-full py-6">
                   <div className="flex gap-4">
                     <div className="flex h-8 w-8 shrink-0 items-center justify-center">
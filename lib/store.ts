@@ -8,6 +8,7 @@ interface ChatStore {
   error: string | null;
   
   addMessage: (message: ChatMessage) => void;
+  appendToMessage: (id: string, text: string) => void;
   setLoading: (loading: boolean) => void;
   setError: (error: string | null) => void;
   setPitchDeck: (deck: PitchDeck | null) => void;
@@ -25,6 +26,13 @@ export const useChatStore = create<ChatStore>((set) => ({
       messages: [...state.messages, message],
     })),
   
+  appendToMessage: (id, text) =>
+    set((state) => ({
+      messages: state.messages.map((message) =>
+        message.id === id ? { ...message, content: message.content + text } : message
+      ),
+    })),
+  
   setLoading: (loading) =>
     set({ isLoading: loading }),
   
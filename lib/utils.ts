@@ -34,3 +34,45 @@ export function validatePDF(file: File): { valid: boolean; error?: string } {
   return { valid: true }
 }
 
+export interface ServerSentEvent {
+  event: string
+  data: any
+}
+
+// Parse a text/event-stream response body, yielding events as they arrive
+export async function* readServerSentEvents(
+  body: ReadableStream<Uint8Array>
+): AsyncGenerator<ServerSentEvent> {
+  const reader = body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+
+    let boundary = buffer.indexOf('\n\n')
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      boundary = buffer.indexOf('\n\n')
+
+      let event = 'message'
+      const dataLines: string[] = []
+      for (const line of rawEvent.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart())
+      }
+      if (dataLines.length === 0) continue
+
+      let data: any = dataLines.join('\n')
+      try {
+        data = JSON.parse(data)
+      } catch {
+        // Non-JSON payloads are passed through as text
+      }
+      yield { event, data }
+    }
+  }
+}